@@ -6,8 +6,15 @@ Twitter, LinkedIn ve diğer platformların publisher'larını bir arada tutar.
 """
 
 import logging
+import time
 from src.post_publisher import PostPublisher
 from src.linkedin_publisher import LinkedInPublisher
+from src.circuit_breaker import CircuitBreaker
+from src.capability_cache import capability_cache
+from src.tracing import tracer
+from src.media import MediaUploadError, media_uploader, validate_media
+from src.accounts import DEFAULT_ACCOUNT, default_daily_limit, load_accounts, normalize_account
+from src.rate_limiter import SlidingWindowLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -16,22 +23,36 @@ class SocialMediaAPI:
     """
     Tüm sosyal medya platformlarının API'lerini yöneten merkezi sınıf.
     Factory pattern kullanarak platform bazlı işlemler yapar.
+    
+    Publisher, devre kesici ve kota (platform, hesap) çifti bazında tutulur;
+    hesap verilmeyen çağrılar varsayılan hesabı kullanır.
     """
     
     SUPPORTED_PLATFORMS = ['Twitter', 'LinkedIn']
     
-    def __init__(self, enable_twitter=True, enable_linkedin=False):
+    # Devre kesici ayarları
+    BREAKER_FAILURE_THRESHOLD = 3  # Ardışık geçici hata sayısı
+    BREAKER_RECOVERY_TIMEOUT = 120  # Açık kalma süresi (saniye)
+    
+    # Ön hazırlık: aynı platformu bu süreden sık ısıtma (get_me/userinfo kotası)
+    WARM_MIN_INTERVAL = 30  # Saniye
+    
+    def __init__(self, enable_twitter=True, enable_linkedin=False, accounts=None):
         """
         Args:
             enable_twitter (bool): Twitter API'yi aktifleştir
             enable_linkedin (bool): LinkedIn API'yi aktifleştir
+            accounts (list): Ek hesaplar (Account listesi; verilmezse ACCOUNTS ortam değişkeni)
         """
-        self.publishers = {}
+        self.publishers = {}  # (platform, hesap) -> publisher
+        self.breakers = {}
+        self.limiters = {}
+        self.last_errors = {}  # (platform, hesap) -> son başarısız gönderimin hatası
         
         # Twitter'ı başlat
         if enable_twitter:
             try:
-                self.publishers['Twitter'] = PostPublisher()
+                self.register_publisher('Twitter', PostPublisher())
                 logger.info("✅ Twitter API entegrasyonu başarılı")
             except Exception as e:
                 logger.error(f"❌ Twitter API hatası: {e}")
@@ -39,14 +60,173 @@ class SocialMediaAPI:
         # LinkedIn'i başlat
         if enable_linkedin:
             try:
-                self.publishers['LinkedIn'] = LinkedInPublisher()
+                self.register_publisher('LinkedIn', LinkedInPublisher())
                 logger.info("✅ LinkedIn API entegrasyonu başarılı")
             except Exception as e:
                 logger.error(f"❌ LinkedIn API hatası: {e}")
         
-        logger.info(f"🔌 API Entegrasyonu tamamlandı. Aktif platformlar: {list(self.publishers.keys())}")
+        # Ek hesaplar (yalnızca etkin platformlar için)
+        enabled = {'Twitter': enable_twitter, 'LinkedIn': enable_linkedin}
+        if enable_twitter or enable_linkedin:
+            self.register_accounts(a for a in (load_accounts() if accounts is None else accounts)
+                                   if enabled.get(a.platform))
+        
+        logger.info(f"🔌 API Entegrasyonu tamamlandı. Aktif platformlar: {self.get_available_platforms()}")
+    
+    @classmethod
+    def from_publishers(cls, twitter_publisher=None, linkedin_publisher=None):
+        """
+        Hazır publisher instance'larından API oluştur (yeni bağlantı açmaz)
+        
+        Args:
+            twitter_publisher: PostPublisher instance (opsiyonel)
+            linkedin_publisher: LinkedInPublisher instance (opsiyonel)
+        
+        Returns:
+            SocialMediaAPI: API instance
+        """
+        api = cls(enable_twitter=False, enable_linkedin=False)
+        if twitter_publisher is not None:
+            api.register_publisher('Twitter', twitter_publisher)
+        if linkedin_publisher is not None:
+            api.register_publisher('LinkedIn', linkedin_publisher)
+        return api
+    
+    def register_publisher(self, platform, publisher, account=None, daily_limit=None):
+        """
+        Platform/hesap için publisher, devre kesici ve günlük kota kaydet
+        
+        Args:
+            platform (str): Platform adı
+            publisher: Publisher instance
+            account (str): Hesap adı (opsiyonel, varsayılan hesap)
+            daily_limit (int): Günlük gönderim kotası (opsiyonel, platform varsayılanı)
+        """
+        key = (platform, normalize_account(account))
+        name = platform if key[1] == DEFAULT_ACCOUNT else f"{platform}/{key[1]}"
+        self.publishers[key] = publisher
+        self.breakers[key] = CircuitBreaker(
+            name,
+            failure_threshold=self.BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=self.BREAKER_RECOVERY_TIMEOUT,
+            health_probe=getattr(publisher, 'health_check', None)
+        )
+        self.limiters[key] = SlidingWindowLimiter(
+            name, default_daily_limit(platform) if daily_limit is None else daily_limit
+        )
+    
+    def register_accounts(self, accounts):
+        """
+        Ek hesaplar için ayrı publisher instance'ları oluştur (her birinin kendi
+        bağlantı havuzu, kimlik önbelleği ve kotası olur)
+        
+        Args:
+            accounts (iterable): Account listesi
+        """
+        for account in accounts:
+            try:
+                if account.platform == 'Twitter':
+                    publisher = PostPublisher(credentials=account.credentials, account=account.name)
+                elif account.platform == 'LinkedIn':
+                    publisher = LinkedInPublisher(access_token=account.credentials['LINKEDIN_ACCESS_TOKEN'],
+                                                  account=account.name)
+                else:
+                    continue
+                self.register_publisher(account.platform, publisher, account.name, account.daily_limit)
+                logger.info(f"✅ {account.platform}/{account.name} hesabı eklendi")
+            except Exception as e:
+                logger.error(f"❌ {account.platform}/{account.name} hesabı eklenemedi: {e}")
+    
+    @staticmethod
+    def _key(platform, account):
+        return platform, normalize_account(account)
+    
+    def get_publisher(self, platform, account=None):
+        """Platform/hesap publisher'ı (yoksa None)"""
+        return self.publishers.get(self._key(platform, account))
+    
+    def get_accounts(self, platform=None):
+        """
+        Kayıtlı hesaplar
+        
+        Returns:
+            list: [(platform, hesap), ...]
+        """
+        return sorted(key for key in self.publishers if platform is None or key[0] == platform)
+    
+    def acquire_quota(self, platform, account=None):
+        """
+        Hesabın günlük kotasından bir gönderim hakkı tüket
+        
+        Returns:
+            bool: Hak varsa True (kota dolduysa post ertelenmeli)
+        """
+        limiter = self.limiters.get(self._key(platform, account))
+        return limiter is None or limiter.try_acquire()
+    
+    def remaining_quota(self, platform, account=None):
+        """
+        Hesabın günlük kotasında kalan gönderim hakkı
+        
+        Returns:
+            int or None: Kalan hak (kota tanımsız veya sınırsızsa None)
+        """
+        limiter = self.limiters.get(self._key(platform, account))
+        return None if limiter is None else limiter.available()
+    
+    def _record_result(self, key, publisher, ok, counted=()):
+        """
+        Çağrı sonucunu devre kesiciye bildir (yalnızca geçici hatalar sayılır)
+        
+        Args:
+            counted (list): Tekrar deneme kapısında zaten sayılmış hatalar (aynı hata iki kez sayılmaz)
+        """
+        breaker = self.breakers[key]
+        last_error = getattr(publisher, 'last_error', None)
+        
+        if ok or not last_error:
+            breaker.record_success()
+        elif last_error.get('transient') and not any(error is last_error for error in counted):
+            breaker.record_failure()
+    
+    def _retry_gate(self, key, publisher, counted):
+        """
+        Publisher'ın her geçici hatada çağırdığı kapı: hatayı hemen devre kesiciye
+        işler; devre açıldıysa aynı post için tekrar denemeyi durdurur.
+        """
+        breaker = self.breakers[key]
+        
+        def gate():
+            counted.append(getattr(publisher, 'last_error', None))
+            breaker.record_failure()
+            return not breaker.is_open()
+        
+        return gate
+    
+    def is_circuit_open(self, platform, account=None):
+        """
+        Platform/hesap devre kesicisi açık mı? (sağlık kontrolü tetiklemez)
+        
+        Args:
+            platform (str): Platform adı
+            account (str): Hesap adı (opsiyonel)
+        
+        Returns:
+            bool: Devre açık ve bekleme süresi dolmamış mı?
+        """
+        breaker = self.breakers.get(self._key(platform, account))
+        return breaker is not None and breaker.is_open()
     
-    def post_to_platform(self, platform, content, post_id=None):
+    def get_breaker_states(self):
+        """
+        Tüm platform/hesapların devre kesici durumları
+        
+        Returns:
+            dict: {'Twitter' veya 'Twitter/hesap': {'state': str, 'failures': int, 'retry_after': float}}
+        """
+        return {breaker.name: breaker.snapshot() for breaker in self.breakers.values()}
+    
+    def post_to_platform(self, platform, content, post_id=None, media=None, account=None):
         """
         Belirtilen platforma post gönder
         
@@ -54,69 +234,180 @@ class SocialMediaAPI:
             platform (str): 'Twitter' veya 'LinkedIn'
             content (str): Gönderilecek içerik
             post_id (int): Post ID (opsiyonel, loglama için)
+            media (list): Eklenecek dosya yolları (opsiyonel)
+            account (str): Hesap adı (opsiyonel, varsayılan hesap)
         
         Returns:
             tuple: (success: bool, api_id: str or None)
+        
+        Raises:
+            CircuitOpenError: Hesabın devre kesicisi açıksa (post ertelenmeli)
         """
-        if platform not in self.publishers:
-            logger.error(f"❌ Platform desteklenmiyor: {platform}")
+        key = self._key(platform, account)
+        if key not in self.publishers:
+            logger.error(f"❌ Platform/hesap desteklenmiyor: {platform}/{key[1]}")
+            self.last_errors[key] = {"error_class": "UnsupportedPlatform", "status_code": None,
+                                     "message": f"{platform}/{key[1]} yapılandırılmamış", "transient": False}
             return False, None
         
-        publisher = self.publishers[platform]
+        publisher = self.publishers[key]
+        breaker = self.breakers[key]
+        self.last_errors.pop(key, None)
         
+        with tracer.span('breaker.allow_request', state=breaker.state) as span:
+            allowed = breaker.allow_request()
+            span.set('allowed', allowed)
+        if not allowed:
+            raise breaker.error()
+        
+        counted = []
+        retry_gate = self._retry_gate(key, publisher, counted)
         try:
-            if platform == 'Twitter':
-                result = publisher.post_to_twitter(content, post_id)
-            elif platform == 'LinkedIn':
-                result = publisher.post_to_linkedin(content, post_id)
-            else:
-                return False, None
-            
-            if result:
-                api_id = str(result) if result is not True else f"{platform[:2].upper()}-{post_id}"
-                return True, api_id
-            
-            return False, None
-            
+            with tracer.span(f'{platform.lower()}.publish'):
+                if platform == 'Twitter':
+                    result = publisher.post_to_twitter(content, post_id, media=media, retry_gate=retry_gate)
+                elif platform == 'LinkedIn':
+                    result = publisher.post_to_linkedin(content, post_id, media=media, retry_gate=retry_gate)
+                else:
+                    return False, None
         except Exception as e:
             logger.error(f"❌ {platform} post hatası: {e}")
-            return False, None
+            breaker.record_failure()
+            self.last_errors[key] = {"error_class": type(e).__name__, "status_code": None,
+                                     "message": str(e), "transient": True}
+            result = False
+        else:
+            self._record_result(key, publisher, bool(result), counted)
+        
+        if result:
+            api_id = str(result) if result is not True else f"{platform[:2].upper()}-{post_id}"
+            return True, api_id
+        
+        if key not in self.last_errors:
+            last_error = getattr(publisher, 'last_error', None)
+            self.last_errors[key] = dict(last_error) if last_error else {
+                "error_class": "Unknown", "status_code": None, "message": None, "transient": False}
+        
+        # Bu hata devreyi açtıysa post başarısız sayılmaz, ertelenir
+        if breaker.is_open():
+            raise breaker.error()
+        
+        return False, None
+    
+    def export_state(self):
+        """
+        Devre kesici ve kota durumları (kapanışta kaydedilir, açılışta geri yüklenir)
+        
+        Returns:
+            dict: {'Twitter/default': {'breaker': {...}, 'limiter': [...]}}
+        """
+        return {
+            f"{platform}/{account}": {
+                "breaker": self.breakers[(platform, account)].export_state(),
+                "limiter": self.limiters[(platform, account)].export_state()
+            }
+            for platform, account in self.publishers
+        }
+    
+    def restore_state(self, state):
+        """export_state() çıktısını kayıtlı hesaplara uygular (artık olmayan hesaplar atlanır)"""
+        for name, entry in (state or {}).items():
+            platform, _, account = name.partition('/')
+            key = self._key(platform, account)
+            if key not in self.publishers:
+                continue
+            self.breakers[key].restore_state(entry.get('breaker', {}))
+            self.limiters[key].restore_state(entry.get('limiter', []))
     
-    def get_metrics(self, platform, api_post_id):
+    def get_last_error(self, platform, account=None):
+        """
+        Platform/hesabın son başarısız gönderiminin hatası (dead-letter kaydı için)
+        
+        Returns:
+            dict or None: {'error_class', 'status_code', 'message', 'transient'}
+        """
+        return self.last_errors.get(self._key(platform, account))
+    
+    def get_metrics(self, platform, api_post_id, account=None):
         """
         Belirtilen platformdan post metriklerini çek
         
         Args:
             platform (str): 'Twitter' veya 'LinkedIn'
             api_post_id (str): API'den dönen post ID
+            account (str): Postun gönderildiği hesap (opsiyonel)
         
         Returns:
             dict or None: Metrikler {'likes': int, 'shares': int, ...}
         """
-        if platform not in self.publishers:
-            logger.warning(f"⚠️ Platform desteklenmiyor: {platform}")
+        key = self._key(platform, account)
+        if key not in self.publishers:
+            logger.warning(f"⚠️ Platform/hesap desteklenmiyor: {platform}/{key[1]}")
             return None
         
-        publisher = self.publishers[platform]
+        publisher = self.publishers[key]
+        credential = getattr(publisher, 'credential_id', None)
+        
+        # Bu hesap için metrikler kullanılamıyorsa (TTL dolana kadar) çağırma
+        if not capability_cache.is_allowed(platform, credential):
+            return None
+        
+        if not self.breakers[key].allow_request():
+            return None
         
         try:
             metrics = publisher.get_post_metrics(api_post_id)
-            return metrics
         except Exception as e:
             logger.error(f"❌ {platform} metrik hatası: {e}")
+            self.breakers[key].record_failure()
             return None
+        
+        self._record_result(key, publisher, metrics is not None)
+        self._learn_metrics_capability(platform, publisher, metrics)
+        return metrics
+    
+    def _learn_metrics_capability(self, platform, publisher, metrics):
+        """Kalıcı yetki/destek hatalarını yetenek önbelleğine yaz"""
+        credential = getattr(publisher, 'credential_id', None)
+        last_error = getattr(publisher, 'last_error', None)
+        
+        if metrics is not None:
+            capability_cache.mark_available(platform, credential)
+        elif last_error and not last_error.get('transient'):
+            capability_cache.mark_unavailable(platform, credential, last_error.get('error_class'))
+            logger.info(
+                f"🚫 {platform} metrikleri kullanılamıyor ({last_error.get('error_class')}), "
+                f"{capability_cache.ttl // 60} dk boyunca istenmeyecek"
+            )
+    
+    def metrics_available(self, platform, account=None):
+        """
+        Platform/hesap metrikleri şu an istenebilir mi? (yeniden deneme hakkı tüketmez)
+        
+        Args:
+            platform (str): Platform adı
+            account (str): Hesap adı (opsiyonel)
+        
+        Returns:
+            bool: Yetenek önbelleğinde engel yoksa True
+        """
+        publisher = self.get_publisher(platform, account)
+        if publisher is None:
+            return False
+        return not capability_cache.is_blocked(platform, getattr(publisher, 'credential_id', None))
     
-    def is_platform_available(self, platform):
+    def is_platform_available(self, platform, account=None):
         """
-        Platformun kullanılabilir olup olmadığını kontrol et
+        Platformun (ve hesabın) kullanılabilir olup olmadığını kontrol et
         
         Args:
             platform (str): Platform adı
+            account (str): Hesap adı (opsiyonel)
         
         Returns:
             bool: Platform kullanılabilir mi?
         """
-        return platform in self.publishers
+        return self._key(platform, account) in self.publishers
     
     def get_available_platforms(self):
         """
@@ -125,38 +416,85 @@ class SocialMediaAPI:
         Returns:
             list: Platform isimleri
         """
-        return list(self.publishers.keys())
+        return list(dict.fromkeys(platform for platform, _ in self.publishers))
     
-    def test_connection(self, platform):
+    def test_connection(self, platform, account=None):
         """
         Platform bağlantısını test et
         
         Args:
             platform (str): Test edilecek platform
+            account (str): Hesap adı (opsiyonel)
         
         Returns:
             bool: Bağlantı başarılı mı?
         """
-        if platform not in self.publishers:
+        publisher = self.get_publisher(platform, account)
+        if publisher is None:
             logger.error(f"❌ Platform bulunamadı: {platform}")
             return False
         
         try:
-            # Basit bir test işlemi
-            publisher = self.publishers[platform]
-            
-            if platform == 'Twitter':
-                # Twitter için get_me() çağrısı yapabiliriz
-                return True
-            elif platform == 'LinkedIn':
-                # LinkedIn için bağlantı kontrolü
-                return publisher.client is not None
-            
-            return True
+            # Publisher'ın hafif sağlık kontrolü (Twitter: get_me, LinkedIn: userinfo)
+            return publisher.health_check()
             
         except Exception as e:
             logger.error(f"❌ {platform} bağlantı testi başarısız: {e}")
             return False
+    
+    def validate_content(self, platform, content, media=None, account=None):
+        """
+        İçeriği ve medyayı platform kurallarına göre kontrol et (API çağrısı yapmaz)
+        
+        Returns:
+            str or None: Sorun açıklaması; içerik geçerliyse veya platform yoksa None
+        """
+        publisher = self.get_publisher(platform, account)
+        if publisher is None:
+            return None
+        return publisher.validate_content(content) or validate_media(platform, media)
+    
+    def prepare_media(self, platform, media, account=None):
+        """
+        Medyayı gönderimden önce yükle; kimlikler (hesap bazında) önbelleğe
+        alınır ve gönderim anında tekrar yüklenmez.
+        
+        Returns:
+            bool: Tüm medya hazır mı?
+        """
+        publisher = self.get_publisher(platform, account)
+        if publisher is None or not media or self.is_circuit_open(platform, account):
+            return False
+        try:
+            media_uploader.upload_all(platform, publisher, media)
+            return True
+        except MediaUploadError as e:
+            logger.warning(f"⚠️ {platform} medyası önceden yüklenemedi: {e}")
+            return False
+    
+    def warm_platform(self, platform, min_interval=None, account=None):
+        """
+        Gönderim öncesi kimliği yenile ve havuzdaki bağlantıyı ısıt
+        
+        Args:
+            platform (str): Platform adı
+            min_interval (float): Son ısıtmadan bu yana en az geçmesi gereken süre
+            account (str): Hesap adı (opsiyonel)
+        
+        Returns:
+            bool: Platform gönderime hazır mı? (devre açıksa veya kimlik alınamadıysa False)
+        """
+        publisher = self.get_publisher(platform, account)
+        if publisher is None or self.is_circuit_open(platform, account):
+            return False
+        
+        if min_interval is None:
+            min_interval = self.WARM_MIN_INTERVAL
+        if time.time() - publisher.identity_checked_at < min_interval:
+            return True
+        
+        with tracer.span(f'{platform.lower()}.warm'):
+            return publisher.refresh_identity() is not None
 
 
 class APIConfig:
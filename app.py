@@ -1,9 +1,30 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+import hmac
+import json
+import os
+from datetime import datetime, time
+from time import perf_counter
+from typing import List
+from fastapi import FastAPI, Request, Form, Query, Header, HTTPException, File, UploadFile
+from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from src.content_manager import ContentManager
 from src.post_publisher import PostPublisher
 from src.linkedin_publisher import LinkedInPublisher
+from src.models import PostPriority, PostStatus, parse_datetime
+from src.accounts import DEFAULT_ACCOUNT, load_accounts
+from src.dead_letter import DeadLetterQueue
+from src.series import SeriesStore, InvalidRuleError, build_rule, FREQUENCIES
+from src.exporter import iter_export
+from src.events import event_bus, EVENTS_HEARTBEAT
+from src.http_cache import make_etag, http_date, not_modified, render_cache
+from src.fingerprint import DuplicateContentError
+from src.media import store_upload
+from src.capability_cache import capability_cache
+from src.telemetry import registry
+from src.tracing import tracer
+from src.error_handler import configure_logging
+from src.profiler import profiler, ProfilerBusyError, PROFILE_DEFAULT_SECONDS, PROFILE_DEFAULT_INTERVAL_MS
+from api_integration import SocialMediaAPI
 import uvicorn
 
 app = FastAPI()
@@ -13,45 +34,426 @@ templates = Jinja2Templates(directory="templates")
 cm = ContentManager()
 twitter = PostPublisher()
 linkedin = LinkedInPublisher()
+api = SocialMediaAPI.from_publishers(twitter, linkedin)
+api.register_accounts(load_accounts())
+series_store = SeriesStore()
+dead_letter = DeadLetterQueue(cm)
+
+# /admin uç noktaları için token (tanımlı değilse uç noktalar kapalıdır)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+# Kapanışta süren HTTP yanıtları (ör. büyük dışa aktarım) için beklenecek en uzun süre (saniye)
+HTTP_SHUTDOWN_TIMEOUT = float(os.getenv('HTTP_SHUTDOWN_TIMEOUT', '5'))
+
+
+def _parse_date(value, end_of_day=False):
+    """'YYYY-MM-DD' formatındaki filtre değerini datetime'a çevirir."""
+    if not value:
+        return None
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    return datetime.combine(day, time.max if end_of_day else time.min)
+
+
+def _require_admin(token):
+    """ADMIN_TOKEN tanımlı değilse 404, token yanlışsa 403 döndürür."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Geçersiz admin token")
+
+
+def _cached_response(request, etag_parts, last_modified, render, media_type):
+    """
+    Koşullu GET: istemcinin kopyası güncelse 304 (depo ve şablona dokunulmaz),
+    aynı sürüm daha önce üretildiyse önbellekteki çıktı, yoksa render() sonucu.
+
+    ``last_modified`` yalnızca çıktı tamamen dosyalara bağlıysa verilmeli;
+    bellekteki sürümlere de bağlı çıktılar için None verilir (Last-Modified
+    gönderilmez, If-Modified-Since dikkate alınmaz, yalnızca ETag kullanılır).
+    """
+    etag = make_etag(*etag_parts)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    body = render_cache.get(etag)
+    if body is None:
+        body = render()
+        render_cache.put(etag, body)
+    return Response(body, media_type=media_type, headers=headers)
+
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    """Ana sayfa - tüm postları göster"""
-    posts = cm.get_all_posts()
-    return templates.TemplateResponse("index.html", {"request": request, "posts": posts})
+async def index(
+    request: Request,
+    date_from: str = Query(None, alias="from"),
+    date_to: str = Query(None, alias="to")
+):
+    """Ana sayfa - postları göster (tarih aralığı verilirse arşivden de okur)"""
+    accounts = sorted({account for _, account in api.get_accounts()} | {DEFAULT_ACCOUNT})
+    # Sayfa yalnızca bu sürümlere bağlı: değişmedikçe 304 veya önbellekteki çıktı
+    last_event_id = event_bus.last_id
+    version = ("index", cm.data_version(), series_store.data_version(), capability_cache.version,
+               last_event_id, accounts, date_from or "", date_to or "")
+
+    def render():
+        posts = cm.get_posts(_parse_date(date_from), _parse_date(date_to, end_of_day=True))
+        return templates.get_template("index.html").render({
+            "request": request,
+            "posts": posts,
+            "capabilities": capability_cache.snapshot(),
+            "series": series_store.get_all(),
+            "dead_letter": dead_letter.grouped(),
+            "accounts": accounts,
+            "frequencies": FREQUENCIES,
+            "last_event_id": last_event_id,
+            "date_from": date_from or "",
+            "date_to": date_to or ""
+        }).encode('utf-8')
+
+    # Sayfa bellekteki sürümlere de (yetenekler, son olay, hesaplar) bağlı; dosya
+    # zamanları bunları yansıtmadığından Last-Modified verilmez, yalnızca ETag
+    return _cached_response(request, version, None, render, "text/html; charset=utf-8")
+
+
+@app.get("/api/posts")
+async def list_posts(
+    request: Request,
+    date_from: str = Query(None, alias="from"),
+    date_to: str = Query(None, alias="to"),
+    platform: str = Query(None),
+    status: str = Query(None)
+):
+    """
+    Postları JSON olarak listele (tarih aralığı verilirse arşivden de okur).
+    ETag/Last-Modified destekler: veri değişmediyse 304 döner.
+    """
+    version = ("posts", cm.data_version(), date_from or "", date_to or "", platform or "", status or "")
+
+    def render():
+        posts = cm.get_posts(_parse_date(date_from), _parse_date(date_to, end_of_day=True), platform or None)
+        return json.dumps(
+            [post.to_dict() for post in posts if not status or post.status == status],
+            ensure_ascii=False
+        ).encode('utf-8')
+
+    return _cached_response(request, version, cm.last_modified(), render, "application/json")
+
+
+@app.get("/api/search")
+def search_posts(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=200),
+    platform: str = Query(None),
+    status: str = Query(None),
+    archive: bool = Query(True)
+):
+    """
+    Post içeriğinde tam metin arama (Türkçe duyarlı, BM25 sıralı, arşiv dahil).
+    Tüm kelimeler geçmeli; son kelime önek olarak da eşleşir.
+    """
+    started = perf_counter()
+    results = cm.search(q, limit=limit, platform=platform or None, status=status or None, include_archive=archive)
+    return {
+        "query": q,
+        "took_ms": round((perf_counter() - started) * 1000, 3),
+        "results": results
+    }
+
+
+@app.get("/api/dead-letter")
+def list_dead_letter(
+    platform: str = Query(None),
+    account: str = Query(None),
+    error_class: str = Query(None),
+    status_code: int = Query(None)
+):
+    """Başarısız postlar: hata sınıfı ve HTTP koduna göre gruplu, deneme geçmişiyle."""
+    groups = dead_letter.grouped(platform=platform or None, account=account or None,
+                                 error_class=error_class or None, status_code=status_code)
+    return {"total": sum(group["count"] for group in groups), "groups": groups}
+
+
+@app.post("/api/dead-letter/redrive")
+def redrive_dead_letter(
+    platform: str = Query(None),
+    account: str = Query(None),
+    error_class: str = Query(None),
+    status_code: int = Query(None),
+    post_ids: List[int] = Query(None)
+):
+    """
+    Filtreye uyan başarısız postları yeniden kuyruğa al. Gönderim zamanlayıcının
+    normal yolundan (öncelik, hesap kotası, devre kesici) yapılır.
+    """
+    requeued = dead_letter.redrive(post_ids=post_ids, platform=platform or None, account=account or None,
+                                   error_class=error_class or None, status_code=status_code)
+    return {"requeued": len(requeued), "post_ids": requeued}
 
 
 @app.get("/refresh-metrics")
-async def refresh_metrics():
-    """Gönderilmiş postların performans metriklerini yenile"""
-    sent_posts = [p for p in cm.get_all_posts() if p.get('status') == 'sent' and p.get('api_post_id')]
+async def refresh_metrics(redirect: bool = Query(True)):
+    """
+    Gönderilmiş postların performans metriklerini yenile
+    (redirect=false: dashboard'a yönlendirmez; değişiklikler /events ile gelir)
+    """
+    sent_posts = [p for p in cm.get_all_posts() if p.status == PostStatus.SENT and p.api_post_id]
+    updated = 0
     
     for post in sent_posts:
-        metrics = None
+        # Devre kesicisi açık veya metrik yetkisi olmayan platformlar için istek gönderme
+        if api.is_circuit_open(post.platform, post.account) or not api.metrics_available(post.platform, post.account):
+            continue
         
-        if post['platform'] == 'Twitter':
-            metrics = twitter.get_post_metrics(post['api_post_id'])
-        elif post['platform'] == 'LinkedIn':
-            metrics = linkedin.get_post_metrics(post['api_post_id'])
+        metrics = api.get_metrics(post.platform, post.api_post_id, post.account)
         
         if metrics:
-            cm.update_metrics(post['id'], metrics)
+            cm.update_metrics(post.id, metrics)
+            updated += 1
     
+    if not redirect:
+        return {"updated": updated}
     return RedirectResponse(url="/", status_code=303)
 
 
 @app.post("/schedule")
-async def schedule_post(
+def schedule_post(
     content: str = Form(...), 
     platform: str = Form(...), 
-    schedule_time: str = Form(...)
+    schedule_time: str = Form(...),
+    media: List[UploadFile] = File(None),
+    allow_duplicate: bool = Form(False),
+    account: str = Form(None),
+    priority: str = Form(None),
+    expires_at: str = Form(None)
 ):
-    """Yeni post planla"""
+    """
+    Yeni post planla (medya dosyaları parça parça data/media altına kaydedilir).
+    Bekleyen veya yakın zamanda gönderilmiş bir postla aynı/neredeyse aynı içerik,
+    'allow_duplicate' işaretlenmedikçe 409 ile reddedilir.
+    """
     # HTML datetime-local formatını (T harfi içerir) temizle
     formatted_time = schedule_time.replace("T", " ")
-    cm.add_post(content, platform, formatted_time)
+    scheduled = parse_datetime(formatted_time)
+    if scheduled is None:
+        raise HTTPException(status_code=400, detail="Geçersiz planlanan zaman")
+    deadline = parse_datetime(expires_at.replace("T", " ")) if expires_at else None
+    if expires_at and (deadline is None or deadline <= scheduled):
+        raise HTTPException(status_code=400, detail="Son geçerlilik zamanı planlanan zamandan sonra olmalı")
+    if not allow_duplicate and cm.duplicate_policy != 'off':
+        # Medya kaydedilmeden önce kontrol et; reddedilen post için dosya yazılmasın
+        matches = cm.find_duplicates(content, platform, account)
+        if matches:
+            raise HTTPException(status_code=409, detail=str(DuplicateContentError(matches)))
+    paths = [store_upload(upload.file, upload.filename) for upload in (media or []) if upload.filename]
+    try:
+        cm.add_post(content, platform, scheduled, media=paths, on_duplicate='warn' if allow_duplicate else None,
+                    account=account, priority=PostPriority.parse(priority), expires_at=deadline)
+    except DuplicateContentError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return RedirectResponse(url="/", status_code=303)
 
 
+
+def _series_rule(frequency, interval, count, until, rule):
+    """Formdaki özel RRULE'u veya sıklık alanlarından üretilen kuralı döndürür."""
+    if rule and rule.strip():
+        return rule.strip()
+    return build_rule(frequency, interval, count or None, parse_datetime(until.replace("T", " ")) if until else None)
+
+
+@app.post("/series")
+def create_series(
+    content: str = Form(...),
+    platform: str = Form(...),
+    start_time: str = Form(...),
+    frequency: str = Form("DAILY"),
+    interval: int = Form(1),
+    count: int = Form(None),
+    until: str = Form(None),
+    rule: str = Form(None),
+    media: List[UploadFile] = File(None),
+    account: str = Form(None)
+):
+    """Tekrarlayan seri oluştur (tek kayıt; postlar zamanı yaklaştıkça üretilir)"""
+    dtstart = parse_datetime(start_time.replace("T", " "))
+    if dtstart is None:
+        raise HTTPException(status_code=400, detail="Geçersiz başlangıç zamanı")
+    try:
+        series_rule = _series_rule(frequency, interval, count, until, rule)
+        paths = [store_upload(upload.file, upload.filename) for upload in (media or []) if upload.filename]
+        series_store.add_series(content, platform, series_rule, dtstart, media=paths, account=account)
+    except InvalidRuleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RedirectResponse(url="/", status_code=303)
+
+
+@app.get("/series/{series_id}/edit", response_class=HTMLResponse)
+def edit_series_form(request: Request, series_id: int):
+    """Seri düzenleme sayfası"""
+    series = series_store.get(series_id)
+    if series is None:
+        raise HTTPException(status_code=404, detail="Seri bulunamadı")
+    return templates.TemplateResponse("series.html", {
+        "request": request,
+        "series": series
+    })
+
+
+@app.post("/series/{series_id}/edit")
+def edit_series(
+    series_id: int,
+    content: str = Form(...),
+    platform: str = Form(...),
+    start_time: str = Form(...),
+    rule: str = Form(...)
+):
+    """Seriyi düzenle; henüz gönderilmemiş üretilmiş postlar da güncellenir"""
+    try:
+        series = series_store.update_series(series_id, content=content, platform=platform, rule=rule.strip(),
+                                            dtstart=start_time.replace("T", " "))
+    except InvalidRuleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if series is None:
+        raise HTTPException(status_code=404, detail="Seri bulunamadı")
+    cm.update_series_posts(series_id, content=content, platform=platform)
+    return RedirectResponse(url="/", status_code=303)
+
+
+@app.post("/series/{series_id}/cancel")
+def cancel_series(series_id: int):
+    """Seriyi iptal et; henüz gönderilmemiş üretilmiş postlar 'cancelled' olur"""
+    if not series_store.cancel_series(series_id):
+        raise HTTPException(status_code=404, detail="Seri bulunamadı")
+    cm.update_series_posts(series_id, status=PostStatus.CANCELLED)
+    return RedirectResponse(url="/", status_code=303)
+
+
+@app.get("/api/export")
+def export_posts(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    date_from: str = Query(None, alias="from"),
+    date_to: str = Query(None, alias="to"),
+    platform: str = Query(None)
+):
+    """
+    Postları ve metrikleri CSV/JSONL olarak akış halinde dışa aktar
+    (veri değişmediyse If-None-Match ile 304; çıktı önbelleğe alınmaz)
+    """
+    etag = make_etag("export", cm.data_version(), format, date_from or "", date_to or "", platform or "")
+    modified = cm.last_modified()
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if modified is not None:
+        cache_headers["Last-Modified"] = http_date(modified)
+    if not_modified(request.headers, etag, modified):
+        return Response(status_code=304, headers=cache_headers)
+    posts = cm.iter_posts(
+        _parse_date(date_from),
+        _parse_date(date_to, end_of_day=True),
+        platform or None
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        iter_export(posts, format),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="posts.{format}"', **cache_headers}
+    )
+
+
+@app.get("/events")
+async def events(
+    request: Request,
+    since: str = Query(None),
+    last_event_id: str = Header(None)
+):
+    """
+    Dashboard için canlı değişiklik akışı (Server-Sent Events).
+    Tarayıcı yeniden bağlanırken Last-Event-ID gönderir; ilk bağlantıda sayfanın
+    çizildiği andaki olay ID'si 'since' ile verilir, aradaki olaylar kaçırılmaz.
+    """
+    subscription = event_bus.subscribe(last_event_id or since)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            # Sunucu kapanırken abonelik kapanır; akış istemcinin kopmasını beklemez
+            while not subscription.closed and not await request.is_disconnected():
+                event = await subscription.get(EVENTS_HEARTBEAT)
+                if subscription.closed:
+                    break
+                yield event.encode() if event is not None else ": ping\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream; charset=utf-8",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metin formatında operasyonel metrikler"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/traces/{post_id}", response_class=HTMLResponse)
+async def post_traces(request: Request, post_id: int):
+    """Bir postun son gönderim denemelerinin span ağacını göster"""
+    return templates.TemplateResponse("trace.html", {
+        "request": request,
+        "post_id": post_id,
+        "traces": tracer.get_traces(post_id)
+    })
+
+
+@app.get("/admin/profile", response_class=PlainTextResponse)
+def admin_profile(
+    seconds: float = Query(PROFILE_DEFAULT_SECONDS, gt=0),
+    interval_ms: float = Query(PROFILE_DEFAULT_INTERVAL_MS, gt=0),
+    x_admin_token: str = Header(None)
+):
+    """Tüm thread'lerin süre sınırlı örnekleyici profili (collapsed stack)"""
+    _require_admin(x_admin_token)
+    try:
+        output = profiler.profile(seconds, interval_ms)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return PlainTextResponse(
+        output,
+        headers={"Content-Disposition": f'attachment; filename="profile_{stamp}.collapsed"'}
+    )
+
+
+class DashboardServer(uvicorn.Server):
+    """
+    Kapanış sinyalinde açık SSE akışlarını da sonlandıran uvicorn sunucusu.
+
+    uvicorn lifespan shutdown'ı ancak süren yanıtlar bittikten sonra çalıştırır;
+    /events akışı istemci kopana kadar sürdüğünden kapanış sinyal anında
+    olay yoluna iletilir.
+    """
+
+    def handle_exit(self, sig, frame):
+        super().handle_exit(sig, frame)
+        event_bus.close()
+
+
+def create_server(host="127.0.0.1", port=8000, log_level="info", timeout_graceful_shutdown=HTTP_SHUTDOWN_TIMEOUT):
+    """Dashboard sunucusunu oluşturur (server.run() ile başlatılır)."""
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level,
+                            timeout_graceful_shutdown=timeout_graceful_shutdown)
+    return DashboardServer(config)
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    configure_logging()
+    create_server().run()
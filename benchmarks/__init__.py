@@ -0,0 +1,7 @@
+"""
+benchmarks package
+==================
+Performans ölçüm scriptleri. Proje kök dizininden çalıştırın:
+
+    python -m benchmarks.bench_post_memory
+"""
@@ -0,0 +1,65 @@
+"""
+bench_post_memory.py
+====================
+Post başına bellek kullanımını ölçer: depodan okunan düz dict kayıtları ile
+__slots__ tabanlı Post/Metrics nesneleri karşılaştırılır.
+
+Kullanım:
+    python -m benchmarks.bench_post_memory --count 10000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.common import make_synthetic_records
+from src.models import Post
+
+
+def measure(build):
+    """build() ile oluşturulan yapının tuttuğu net belleği (byte) döndürür."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    data = build()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, data
+
+
+def run(count):
+    # Depodan okunmuş gibi davranması için JSON metnine çevirip geri okuyoruz
+    raw = json.dumps(make_synthetic_records(count), ensure_ascii=False)
+
+    dict_bytes, _ = measure(lambda: json.loads(raw))
+
+    # Model nesneleri: ara dict'ler dönüşümden sonra serbest kalır, yalnızca
+    # Post/Metrics nesneleri ve içerik string'leri ölçüme girer
+    model_bytes, _ = measure(lambda: [Post.from_dict(r) for r in json.loads(raw)])
+
+    return {
+        "count": count,
+        "dict_bytes_per_post": round(dict_bytes / count, 1),
+        "model_bytes_per_post": round(model_bytes / count, 1),
+        "reduction_pct": round(100 * (1 - model_bytes / dict_bytes), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post bellek benchmark'ı")
+    parser.add_argument('--count', type=int, action='append',
+                        help="Post sayısı (birden fazla verilebilir)")
+    args = parser.parse_args()
+
+    print(f"{'Post':>8} | {'dict (B/post)':>14} | {'Post (B/post)':>14} | {'Kazanç':>7}")
+    print("-" * 54)
+    for count in args.count or [1000, 10000]:
+        result = run(count)
+        print(f"{result['count']:>8} | {result['dict_bytes_per_post']:>14} | "
+              f"{result['model_bytes_per_post']:>14} | {result['reduction_pct']:>6}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+common.py
+=========
+Benchmark'lar için ortak yardımcılar: sentetik veri üretimi, zaman ölçümü
+ve gerçek API'ye gitmeyen sahte publisher'lar.
+"""
+
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+
+def make_synthetic_records(count, seed=42, pending_due=0, start=None):
+    """
+    posts.json ile aynı şekle sahip sentetik kayıtlar üretir.
+
+    Args:
+        count (int): Kayıt sayısı
+        seed (int): Tekrarlanabilirlik için rastgelelik tohumu
+        pending_due (int): Sona eklenen, zamanı gelmiş 'pending' post sayısı
+        start (datetime): İlk postun planlanma zamanı
+    """
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1, 9, 0)
+    records = []
+    for i in range(1, count + 1):
+        schedule = start + timedelta(minutes=15 * i)
+        sent = rng.random() < 0.8
+        record = {
+            "id": i,
+            "content": f"Otomatik test postu #{i} " + "x" * rng.randint(20, 200),
+            "platform": rng.choice(["Twitter", "LinkedIn"]),
+            "schedule_time": schedule.strftime("%Y-%m-%d %H:%M"),
+            "status": "sent" if sent else rng.choice(["pending", "failed"]),
+            "api_post_id": str(1900000000000000000 + i) if sent else None,
+            "created_at": (schedule - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"),
+            "metrics": {
+                "likes": rng.randint(0, 500),
+                "shares": rng.randint(0, 100),
+                "replies": rng.randint(0, 50),
+                "impressions": rng.randint(0, 20000)
+            }
+        }
+        if sent:
+            record["sent_at"] = (schedule + timedelta(seconds=5)).strftime("%Y-%m-%d %H:%M:%S")
+        elif record["status"] == "pending":
+            # Gelecekte planlanmış bekleyen post (zamanı gelmemiş)
+            record["schedule_time"] = (datetime.now() + timedelta(days=365)).strftime("%Y-%m-%d %H:%M")
+        records.append(record)
+
+    due_time = (datetime.now() - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M")
+    for i in range(count + 1, count + pending_due + 1):
+        records.append({
+            "id": i,
+            "content": f"Zamanı gelmiş post #{i}",
+            "platform": "Twitter" if i % 2 else "LinkedIn",
+            "schedule_time": due_time,
+            "status": "pending",
+            "api_post_id": None,
+            "created_at": due_time + ":00",
+            "metrics": {"likes": 0, "shares": 0, "replies": 0, "impressions": 0}
+        })
+    return records
+
+
+def seed_store(path, count, **kwargs):
+    """Sentetik kayıtları posts.json formatında diske yazar."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(make_synthetic_records(count, **kwargs), f, indent=4, ensure_ascii=False)
+    return os.path.getsize(path)
+
+
+def timed(func, repeat=5):
+    """
+    func'u repeat kez çalıştırır ve süre istatistiklerini milisaniye olarak döndürür.
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3)
+    }
+
+
+class FakeTwitterPublisher:
+    """Ağa çıkmadan anında yanıt veren Twitter publisher taklidi."""
+
+    def __init__(self, metrics_ratio=1.0, seed=7):
+        self.ids = itertools.count(1)
+        self.rng = random.Random(seed)
+        self.metrics_ratio = metrics_ratio
+        self.credential_id = 'bench-twitter'
+        self.last_error = None
+        self.identity_checked_at = 0.0
+
+    def post_to_twitter(self, content, post_id=None, media=None, retry_gate=None):
+        return str(next(self.ids))
+
+    def refresh_identity(self):
+        self.identity_checked_at = time.time()
+        return 'bench'
+
+    def validate_content(self, content):
+        return None if len(content) <= 280 else "Tweet 280 karakterden uzun!"
+
+    def get_post_metrics(self, tweet_id):
+        if self.rng.random() >= self.metrics_ratio:
+            return None
+        return {"likes": self.rng.randint(0, 100), "shares": 1, "replies": 0, "impressions": 50}
+
+    def health_check(self):
+        return True
+
+
+class FakeLinkedInPublisher:
+    """Ağa çıkmadan anında yanıt veren LinkedIn publisher taklidi."""
+
+    def __init__(self):
+        self.credential_id = 'bench-linkedin'
+        self.last_error = None
+        self.identity_checked_at = 0.0
+
+    def post_to_linkedin(self, content, post_id=None, media=None, retry_gate=None):
+        return True
+
+    def refresh_identity(self):
+        self.identity_checked_at = time.time()
+        return 'bench-person'
+
+    def validate_content(self, content):
+        return None if len(content) <= 3000 else "LinkedIn postu çok uzun!"
+
+    def get_post_metrics(self, post_id):
+        return None
+
+    def health_check(self):
+        return True
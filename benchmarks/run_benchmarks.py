@@ -0,0 +1,314 @@
+"""
+run_benchmarks.py
+=================
+ContentManager, zamanlayıcı turu, metrik güncelleme, arama, depo formatları ve
+dashboard render sürelerini sentetik verilerle (1k/10k/100k post) ölçer.
+
+Sonuçlar makine tarafından okunabilir JSON olarak yazılır; farklı commit'lerin
+sonuçları --compare ile karşılaştırılabilir. Tüm publisher'lar sahtedir,
+gerçek API'ye istek gönderilmez.
+
+Kullanım:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 --repeat 3
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/onceki.json
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.common import FakeLinkedInPublisher, FakeTwitterPublisher, make_synthetic_records, seed_store, timed
+from src.content_manager import ContentManager
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+@contextlib.contextmanager
+def quiet():
+    """ContentManager'ın print çıktılarını ölçüm sırasında bastırır."""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def _new_store(workdir, name, size, **kwargs):
+    path = os.path.join(workdir, f'{name}-{size}.json')
+    store_bytes = seed_store(path, size, **kwargs)
+    with quiet():
+        cm = ContentManager(db_path=path, archive_dir=os.path.join(workdir, f'{name}-{size}-archive'))
+    return cm, store_bytes
+
+
+def bench_content_manager(workdir, size, repeat):
+    """Temel ContentManager işlemlerinin gecikmesi."""
+    cm, store_bytes = _new_store(workdir, 'cm', size)
+    ids = itertools.cycle(range(1, size + 1))
+    new_metrics = {"likes": 5, "shares": 1, "replies": 0, "impressions": 100}
+
+    with quiet():
+        return {
+            "store_bytes": store_bytes,
+            "get_all_posts": timed(cm.get_all_posts, repeat),
+            "get_pending_posts": timed(cm.get_pending_posts, repeat),
+            "add_post": timed(lambda: cm.add_post("Benchmark postu", "Twitter", "2099-01-01 10:00"), repeat),
+            "update_metrics": timed(lambda: cm.update_metrics(next(ids), new_metrics), repeat),
+            "update_post_after_send": timed(
+                lambda: cm.update_post_after_send(next(ids), "bench-api-id", status="sent"), repeat
+            )
+        }
+
+
+def bench_tracker(workdir, size, metrics_ratio):
+    """
+    Tek bir tam PerformanceTracker._update_metrics turu, iki durumda:
+
+    - read_only: hiçbir post metrik döndürmez (yalnızca tarama, depo yazması yok)
+    - with_metrics: postların ``metrics_ratio`` kadarı metrik döndürür; her biri
+      bir depo yazmasıdır. Yazma başına süre ölçülür ve her gönderilmiş postun
+      metrik döndürdüğü gerçek tur (``projected_all_sent_ms``) buradan hesaplanır;
+      100k postta bu turu doğrudan ölçmek saatler sürer
+    """
+    from scheduler import PerformanceTracker
+    from src.models import PostStatus
+    from src.scheduler_state import SchedulerState
+
+    def run_pass(name, ratio):
+        cm, _ = _new_store(workdir, f'tracker-{name}', size)
+        state = SchedulerState(os.path.join(workdir, f'tracker_state_{name}_{size}.json'))
+        tracker = PerformanceTracker(cm, FakeTwitterPublisher(metrics_ratio=ratio), FakeLinkedInPublisher(),
+                                     state=state)
+        writes = []
+        update_metrics = cm.update_metrics
+        cm.update_metrics = lambda post_id, metrics: (writes.append(post_id), update_metrics(post_id, metrics))
+        sent = sum(1 for p in cm.get_all_posts() if p.status == PostStatus.SENT and p.api_post_id)
+        with quiet():
+            result = timed(tracker._update_metrics, repeat=1)
+        result["store_writes"] = len(writes)
+        return result, sent
+
+    read_only, sent = run_pass('read', 0.0)
+    with_metrics, _ = run_pass('write', metrics_ratio)
+    result = {"metrics_ratio": metrics_ratio, "sent_posts": sent, "read_only": read_only, "with_metrics": with_metrics}
+    writes = with_metrics["store_writes"]
+    if writes:
+        per_write = max(0.0, with_metrics["median_ms"] - read_only["median_ms"]) / writes
+        with_metrics["ms_per_write"] = round(per_write, 3)
+        result["projected_all_sent_ms"] = round(read_only["median_ms"] + per_write * sent, 3)
+    return result
+
+
+def bench_scheduler(workdir, size, due):
+    """Zamanı gelmiş 'due' adet postun tek turda gönderim hızı."""
+    from scheduler import PostScheduler
+    from src.scheduler_state import SchedulerState
+
+    cm, _ = _new_store(workdir, 'scheduler', size, pending_due=due)
+    scheduler = PostScheduler(cm, FakeTwitterPublisher(), FakeLinkedInPublisher(),
+                              state=SchedulerState(os.path.join(workdir, f'scheduler_state_{size}.json')))
+
+    with quiet():
+        started = time.perf_counter()
+        scheduler._check_and_send_posts()
+        elapsed = time.perf_counter() - started
+
+    return {
+        "due_posts": due,
+        "tick_ms": round(elapsed * 1000, 3),
+        "posts_per_sec": round(due / elapsed, 2) if elapsed else None
+    }
+
+
+def bench_search(workdir, size, repeat):
+    """Tam metin arama: ilk aramada indeks kurulumu ve sorgu gecikmeleri."""
+    cm, _ = _new_store(workdir, 'search', size)
+    with quiet():
+        build = timed(lambda: cm.search("başlangıç"), repeat=1)
+        return {
+            "build_index": build,
+            "rare_term": timed(lambda: cm.search(f"postu {size // 2}"), repeat),
+            "common_term": timed(lambda: cm.search("otomatik test"), repeat),
+            "prefix": timed(lambda: cm.search("otoma"), repeat),
+            "add_post_indexed": timed(lambda: cm.add_post("Arama benchmark postu", "Twitter", "2099-01-01 10:00",
+                                                          on_duplicate='off'), repeat)
+        }
+
+
+# Karşılaştırılan depo formatları: (format, sıkıştırma, JSON girintisi)
+STORE_FORMATS = [
+    ('json', 'none', 4),
+    ('json', 'none', 0),
+    ('json', 'gzip', 0),
+    ('json', 'zstd', 0),
+    ('msgpack', 'none', 0),
+    ('msgpack', 'gzip', 0),
+    ('msgpack', 'zstd', 0),
+]
+
+
+def bench_store_formats(workdir, size, repeat):
+    """
+    Depo formatlarının yazma (serialize) / okuma (parse) süresi ve disk boyutu.
+    'get_all_posts' ayrıştırmaya ek olarak Post nesnelerinin kurulmasını da içerir.
+    """
+    from src.serializer import StoreFormatError, StoreSerializer, load_records
+
+    records = make_synthetic_records(size)
+    results = {}
+    for fmt, compression, indent in STORE_FORMATS:
+        try:
+            serializer = StoreSerializer(fmt, compression, json_indent=indent)
+        except StoreFormatError as e:
+            results[f"{fmt}+{compression}"] = {"skipped": str(e)}
+            continue
+        name = serializer.name + ('-indent' if indent else '')
+        path = os.path.join(workdir, f'format-{name}-{size}.db')
+        data = serializer.dumps(records)
+        with open(path, 'wb') as f:
+            f.write(data)
+        with quiet():
+            cm = ContentManager(db_path=path, archive_dir=os.path.join(workdir, f'format-{size}-archive'),
+                                serializer=serializer)
+        results[name] = {
+            "bytes": len(data),
+            "serialize": timed(lambda: serializer.dumps(records), repeat),
+            "parse": timed(lambda: load_records(data), repeat),
+            "get_all_posts": timed(cm.get_all_posts, repeat)
+        }
+    return results
+
+
+def bench_render(workdir, size, repeat):
+    """Dashboard ('/') render süresi."""
+    try:
+        from fastapi.testclient import TestClient
+    except Exception as e:  # httpx yüklü değilse TestClient kullanılamaz
+        return {"skipped": f"TestClient kullanılamıyor: {e}"}
+
+    with quiet():
+        import app as app_module
+
+    cm, _ = _new_store(workdir, 'render', size)
+    original_cm = app_module.cm
+    app_module.cm = cm
+    try:
+        client = TestClient(app_module.app)
+
+        def render():
+            response = client.get('/')
+            assert response.status_code == 200
+
+        result = timed(render, repeat)
+        result["response_bytes"] = len(client.get('/').content)
+        return result
+    finally:
+        app_module.cm = original_cm
+
+
+def run(sizes, repeat, metrics_ratio, due):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='autoposting-bench-') as workdir:
+        for size in sizes:
+            print(f"⏱️  {size} post ile ölçülüyor...")
+            results[str(size)] = {
+                "content_manager": bench_content_manager(workdir, size, repeat),
+                "tracker_update_metrics": bench_tracker(workdir, size, metrics_ratio),
+                "scheduler_tick": bench_scheduler(workdir, size, due),
+                "search": bench_search(workdir, size, repeat),
+                "store_formats": bench_store_formats(workdir, size, repeat),
+                "dashboard_render": bench_render(workdir, size, repeat)
+            }
+    return results
+
+
+def _flatten(prefix, value, out):
+    """İç içe sonuçları 'boyut.grup.işlem' -> median_ms/tick_ms eşlemesine çevirir."""
+    if isinstance(value, dict):
+        if "median_ms" in value:
+            out[prefix] = value["median_ms"]
+        elif "tick_ms" in value:
+            out[prefix] = value["tick_ms"]
+        else:
+            for key, sub in value.items():
+                _flatten(f"{prefix}.{key}" if prefix else key, sub, out)
+
+
+def compare(baseline_path, current):
+    """İki sonuç dosyasını karşılaştırıp farkları yazdırır."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    old, new = {}, {}
+    _flatten('', baseline["results"], old)
+    _flatten('', current["results"], new)
+
+    print(f"\n📊 Karşılaştırma: {baseline.get('commit')} -> {current.get('commit')}")
+    print(f"{'Ölçüm':<58} {'Önce (ms)':>11} {'Sonra (ms)':>11} {'Değişim':>9}")
+    for key in sorted(set(old) & set(new)):
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        print(f"{key:<58} {old[key]:>11.3f} {new[key]:>11.3f} {change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AutoPosting benchmark paketi")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Post sayıları")
+    parser.add_argument('--repeat', type=int, default=5, help="İşlem başına tekrar sayısı")
+    parser.add_argument('--metrics-ratio', type=float, default=0.001,
+                        help="Metrik turunda metrik dönen post oranı (her biri depo yazması yapar); "
+                             "tam oran için süre projected_all_sent_ms olarak tahmin edilir")
+    parser.add_argument('--due', type=int, default=20, help="Zamanlayıcı turu için zamanı gelmiş post sayısı")
+    parser.add_argument('--output', help="Sonuç JSON dosyası (varsayılan: benchmarks/results/)")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    # Modül logları ölçümü etkilemesin
+    logging.getLogger().setLevel(logging.WARNING)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+            "metrics_ratio": args.metrics_ratio,
+            "due": args.due
+        },
+        "results": run(args.sizes, args.repeat, args.metrics_ratio, args.due)
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"bench-{stamp}-{report['commit'] or 'nogit'}.json")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Sonuçlar yazıldı: {output}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,21 @@ Tüm modülleri başlatır ve koordine eder.
 
 import threading
 import logging
-import uvicorn
+import os
+import time
 import sys
 import signal
 
 # Kendi modüllerimiz
-from app import app
-from src.content_manager import ContentManager
-from api_integration import SocialMediaAPI
-from scheduler import PostScheduler, PerformanceTracker
+from app import api, cm, create_server, series_store
+from scheduler import PostScheduler, PerformanceTracker, DRAIN_TIMEOUT
+from src.profiler import install_signal_handler
+from src.outbox import OutboxDispatcher, OUTBOX_URL
 
-# Logging yapılandırması
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+from src.error_handler import configure_logging, LOG_FILE
+
+# Logging yapılandırması (kuyruk tabanlı; dosyaya yazma arka plan thread'inde)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -38,30 +34,40 @@ class SocialMediaAutomation:
     def __init__(self):
         logger.info("🚀 Sosyal Medya Otomasyonu Başlatılıyor...")
         
-        # Servisler
-        self.content_manager = ContentManager()
-        self.api = SocialMediaAPI(enable_twitter=True, enable_linkedin=True)
+        # Servisler: dashboard ile aynı ContentManager, seri deposu ve API kullanılır;
+        # kilitleri nesne başına olduğundan ayrı nesneler aynı dosyada birbirinin
+        # yazımını ezebilir (gönderilmiş post tekrar pending'e dönebilir). Ortak API
+        # ile bağlantı havuzları, devre kesiciler ve kotalar da tek kopya kalır
+        self.content_manager = cm
+        self.api = api
         
-        # Twitter publisher'ı al (api_integration'dan)
-        self.twitter = self.api.publishers.get('Twitter')
-        self.linkedin = self.api.publishers.get('LinkedIn')
+        # Publisher'ları al (api_integration'dan)
+        self.twitter = self.api.get_publisher('Twitter')
+        self.linkedin = self.api.get_publisher('LinkedIn')
         
         # Zamanlayıcılar
         self.post_scheduler = PostScheduler(
             self.content_manager,
             self.twitter,
-            self.linkedin
+            self.linkedin,
+            api=self.api,
+            series_store=series_store
         )
         
         self.performance_tracker = PerformanceTracker(
             self.content_manager,
             self.twitter,
-            self.linkedin
+            self.linkedin,
+            api=self.api
         )
         
+        # Dış bildirimler (OUTBOX_URL tanımlıysa)
+        self.outbox_dispatcher = OutboxDispatcher(self.content_manager) if OUTBOX_URL else None
+        
         # Thread'ler
         self.scheduler_thread = None
         self.metrics_thread = None
+        self.outbox_thread = None
         self.running = False
         
         logger.info("✅ Servisler başarıyla yüklendi")
@@ -88,7 +94,17 @@ class SocialMediaAutomation:
         self.metrics_thread.start()
         logger.info("✅ Performans takipçisi başlatıldı")
         
-        # 3. Web Dashboard
+        # 3. Outbox Dağıtıcısı Thread
+        if self.outbox_dispatcher:
+            self.outbox_thread = threading.Thread(
+                target=self.outbox_dispatcher.start,
+                daemon=True,
+                name="OutboxDispatcher"
+            )
+            self.outbox_thread.start()
+            logger.info("✅ Outbox dağıtıcısı başlatıldı")
+        
+        # 4. Web Dashboard
         self._start_web_server()
     
     def _start_web_server(self):
@@ -100,46 +116,70 @@ class SocialMediaAutomation:
         print("="*70)
         print(f"📊 Dashboard: http://127.0.0.1:8000")
         print(f"📋 Aktif Platformlar: {', '.join(self.api.get_available_platforms())}")
+        print(f"👥 Hesaplar: {', '.join(f'{p}/{a}' for p, a in self.api.get_accounts())}")
         print(f"💾 Veri Dosyası: {self.content_manager.db_path}")
-        print(f"📝 Log Dosyası: logs/app.log")
+        print(f"📝 Log Dosyası: {LOG_FILE}")
         print("="*70)
         print("💡 Durdurmak için: Ctrl+C")
         print("="*70 + "\n")
         
-        # FastAPI/Uvicorn başlat
-        uvicorn.run(
-            app,
-            host="127.0.0.1",
-            port=8000,
-            log_level="info"
-        )
+        # FastAPI/Uvicorn başlat (kapanış sinyali açık /events akışlarını da kapatır)
+        create_server(host="127.0.0.1", port=8000, log_level="info").run()
     
-    def stop(self):
-        """Tüm servisleri durdur"""
-        logger.info("🛑 Servisler durduruluyor...")
+    def stop(self, timeout=DRAIN_TIMEOUT):
+        """
+        Tüm servisleri durdur: yeni iş alınmaz, süren gönderimler ve kayıtlar
+        ``timeout`` saniyeye kadar beklenir, zamanlayıcı durumu kaydedilir
+        """
+        if not self.running:
+            return
+        logger.info("🛑 Servisler durduruluyor (en fazla %s sn beklenecek)...", timeout)
         
         self.running = False
-        
-        if self.post_scheduler:
-            self.post_scheduler.stop()
-        
-        if self.performance_tracker:
-            self.performance_tracker.stop()
-        
-        logger.info("✅ Tüm servisler durduruldu")
+        deadline = time.monotonic() + timeout
+        
+        # Önce ikisine de dur sinyali ver, sonra süren turları bekle
+        self.post_scheduler.stop()
+        self.performance_tracker.stop()
+        drained = self.post_scheduler.drain(deadline - time.monotonic())
+        drained = self.performance_tracker.drain(deadline - time.monotonic()) and drained
+        drained = self.content_manager.wait_idle(deadline - time.monotonic()) and drained
+        # Son gönderimlerin olayları kayıtlı; süren batch beklenir, kalanlar açılışta gönderilir
+        if self.outbox_dispatcher:
+            drained = self.outbox_dispatcher.drain(deadline - time.monotonic()) and drained
+        
+        if drained:
+            logger.info("✅ Tüm servisler durduruldu")
+        else:
+            logger.warning("⏱️ Kapanış süresi doldu; bazı işlemler yarıda kaldı")
 
 
 def signal_handler(sig, frame):
-    """Ctrl+C ile güvenli kapatma"""
+    """
+    SIGINT/SIGTERM ile güvenli kapatma: ana thread'de SystemExit fırlatılır,
+    main() içindeki finally servisleri drain eder. Kapanış sürerken gelen
+    ikinci sinyal beklemeden çıkar.
+    """
+    if getattr(signal_handler, 'received', False):
+        print("\n⚠️ İkinci kapatma sinyali, beklemeden çıkılıyor")
+        os._exit(1)
+    signal_handler.received = True
     print("\n\n⚠️ Kapatma sinyali alındı...")
     sys.exit(0)
 
 
 def main():
     """Ana fonksiyon"""
-    # Ctrl+C handler
+    # Ctrl+C ve kill/deploy (SIGTERM) handler'ı; uvicorn çalışırken sinyalleri
+    # kendisi yakalar, sunucuyu kapattıktan sonra bu handler'a iletir
     signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    # kill -USR1 <pid> ile profil al (logs/profile_*.collapsed)
+    if install_signal_handler():
+        logger.info("🔥 Profil sinyali hazır (SIGUSR1)")
     
+    app_instance = None
     try:
         # Uygulamayı başlat
         app_instance = SocialMediaAutomation()
@@ -154,6 +194,8 @@ def main():
     
     finally:
         logger.info("👋 Uygulama kapatılıyor...")
+        if app_instance is not None:
+            app_instance.stop()
 
 
 if __name__ == "__main__":
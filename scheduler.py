@@ -5,136 +5,351 @@ Sosyal medya postlarını zamanında gönderen arka plan zamanlayıcısı.
 Belirli aralıklarla bekleyen postları kontrol eder ve platforma göre gönderir.
 """
 
+import contextvars
+import os
+import threading
 import time
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from api_integration import SocialMediaAPI
+from src.accounts import normalize_account
+from src.circuit_breaker import CircuitOpenError
+from src.models import Post, PostStatus
+from src.scheduler_state import STALE_CLAIM_ERROR, interrupted_publish_error, scheduler_state
+from src.series import SeriesStore
+from src.staging import PreflightStager
+from src.tracing import tracer
+from src.telemetry import (
+    DUE_POSTS, METRICS_REFRESH, PUBLISH_TOTAL, SCHEDULE_LAG, TRACKER_PASS
+)
 
 logger = logging.getLogger(__name__)
 
+# Farklı hesapların postlarını aynı anda gönderen thread sayısı
+PUBLISH_WORKERS = int(os.getenv('PUBLISH_WORKERS', '8'))
+# Kapanışta süren gönderimlerin ve yazmaların bitmesi için beklenecek en uzun süre (saniye)
+DRAIN_TIMEOUT = float(os.getenv('DRAIN_TIMEOUT', '30'))
+
 
 class PostScheduler:
     """
     Postların zamanında gönderilmesini sağlayan zamanlayıcı sınıfı.
     """
     
-    def __init__(self, content_manager, twitter_publisher, linkedin_publisher=None):
+    def __init__(self, content_manager, twitter_publisher, linkedin_publisher=None, api=None,
+                 series_store=None, state=None):
         """
         Args:
             content_manager: ContentManager instance
             twitter_publisher: PostPublisher instance (Twitter)
             linkedin_publisher: LinkedInPublisher instance (opsiyonel)
+            api: SocialMediaAPI instance (opsiyonel, verilmezse publisher'lardan oluşturulur)
+            series_store: SeriesStore instance (opsiyonel, verilmezse data/series.json)
+            state: SchedulerState instance (opsiyonel, verilmezse data/scheduler_state.json)
         """
         self.cm = content_manager
         self.twitter = twitter_publisher
         self.linkedin = linkedin_publisher
+        self.api = api or SocialMediaAPI.from_publishers(twitter_publisher, linkedin_publisher)
+        self.state = state or scheduler_state
         self.running = False
         self.check_interval = 30  # Saniye cinsinden kontrol aralığı
+        # stop() beklemeyi hemen keser ve yeni iş alınmasını durdurur; tur kilidi drain() için süren turu gösterir
+        self._stopping = threading.Event()
+        self._pass_lock = threading.Lock()
+        
+        # Gönderim öncesi hazırlık (içerik kontrolü, kimlik, bağlantı ısıtma)
+        self.stager = PreflightStager(self.api)
+        
+        # Tekrarlayan seriler: tekrar zamanı hazırlık penceresine girince posta dönüşür
+        self.series = series_store or SeriesStore()
         
         logger.info("⏰ PostScheduler başlatıldı")
     
     def start(self):
         """Zamanlayıcıyı başlat"""
         self.running = True
-        logger.info("✅ Zamanlayıcı çalışmaya başladı (Her %d saniyede kontrol)", self.check_interval)
-        
-        while self.running:
+        with self._pass_lock:
             try:
-                self._check_and_send_posts()
+                self._resume()
             except Exception as e:
-                logger.error(f"⚠️ Zamanlayıcı hatası: {e}")
+                logger.error(f"⚠️ Zamanlayıcı durumu geri yüklenemedi: {e}")
+        logger.info("✅ Zamanlayıcı çalışmaya başladı (Her %d saniyede kontrol)", self.check_interval)
+        
+        while not self._stopping.is_set():
+            with self._pass_lock:
+                if self._stopping.is_set():
+                    break
+                try:
+                    self._check_and_send_posts()
+                except Exception as e:
+                    logger.error(f"⚠️ Zamanlayıcı hatası: {e}")
             
-            # Belirlenen süre kadar bekle
-            time.sleep(self.check_interval)
+            # Bir sonraki kontrole veya hazırlanmış postun tam zamanına kadar bekle (stop() keser)
+            self._stopping.wait(self._sleep_seconds())
     
     def stop(self):
-        """Zamanlayıcıyı durdur"""
+        """Zamanlayıcıyı durdur (yeni post sahiplenilmez; süren gönderim tamamlanır)"""
         self.running = False
-        logger.info("🛑 Zamanlayıcı durduruldu")
+        if not self._stopping.is_set():
+            self._stopping.set()
+            logger.info("🛑 Zamanlayıcı durduruldu")
     
-    def _check_and_send_posts(self):
-        """Bekleyen postları kontrol et ve gönder"""
-        pending_posts = self.cm.get_pending_posts()
-        
-        if not pending_posts:
-            return
-        
-        logger.info(f"📋 {len(pending_posts)} adet gönderilmeyi bekleyen post bulundu")
+    def drain(self, timeout=DRAIN_TIMEOUT):
+        """
+        Zamanlayıcıyı durdurur, süren turun bitmesini en fazla ``timeout`` saniye
+        bekler ve devre/kota durumunu kaydeder.
         
-        for post in pending_posts:
-            if not isinstance(post, dict):
-                logger.warning(f"⚠️ Hatalı veri tipi: {post}")
-                continue
-            
-            self._send_post(post)
+        Returns:
+            bool: Süren gönderimler süre dolmadan bitti mi?
+        """
+        self.stop()
+        drained = self._pass_lock.acquire(timeout=max(0.0, timeout))
+        try:
+            self.save_state()
+        except Exception as e:
+            logger.error(f"⚠️ Zamanlayıcı durumu kaydedilemedi: {e}")
+        finally:
+            if drained:
+                self._pass_lock.release()
+        if not drained:
+            logger.warning("⏱️ Süren gönderimler %s sn içinde bitmedi; yarıda kalanlar açılışta "
+                           "dead-letter kuyruğuna alınacak: %s", timeout, self.state.claims())
+        return drained
+    
+    def save_state(self):
+        """Devre kesici ve kota durumlarını durum dosyasına yazar"""
+        self.state.update(api=self.api.export_state())
     
-    def _send_post(self, post):
+    def _resume(self):
         """
-        Tek bir postu platforma göre gönder
-        
-        Args:
-            post (dict): Gönderilecek post verisi
+        Önceki sürecin durumunu yükler: devre/kota pencereleri geri gelir, sonucu
+        yazılmamış gönderimler tekrar gönderilmez, dead-letter kuyruğuna alınır
         """
-        logger.info(f"🚀 Post gönderiliyor: {post['content'][:50]}...")
+        self.api.restore_state(self.state.get('api'))
+        claims = self.state.claims()
+        if claims:
+            failed = self.cm.fail_posts(claims, STALE_CLAIM_ERROR)
+            self.state.clear_claims(claims)
+            if failed:
+                logger.warning("📮 Önceki süreçte gönderimi yarıda kalan postlar tekrar gönderilmeyecek, "
+                               "dead-letter kuyruğunda: %s", failed)
+    
+    def _sleep_seconds(self):
+        """Bir sonraki uyanmaya kalan süre (en fazla check_interval)"""
+        now = datetime.now()
+        wakeups = [self.stager.next_wakeup(now)]
+        # Serinin sıradaki tekrarı hazırlık penceresine girdiğinde uyan
+        series_due = self.series.next_due()
+        if series_due is not None:
+            wakeups.append(series_due - timedelta(seconds=self.stager.lead_seconds))
+        wakeups = [w for w in wakeups if w is not None]
+        if not wakeups:
+            return self.check_interval
+        return min(self.check_interval, max(0.0, (min(wakeups) - now).total_seconds()))
+    
+    def _check_and_send_posts(self):
+        """Zamanı yaklaşan postları hazırla, zamanı gelenleri gönder"""
+        now = datetime.now()
+        scan_started_at = time.time()
+        scan_started = time.perf_counter()
+        horizon = self.stager.horizon(now)
+        upcoming = self.cm.get_upcoming_posts(horizon)
         
-        success = False
-        api_id = None
+        # Pencereye giren seri tekrarlarını somut posta dönüştür
+        try:
+            upcoming.extend(self.series.materialize_due(self.cm, horizon, existing=upcoming, now=now))
+        except Exception as e:
+            logger.error(f"⚠️ Seri hatası: {e}")
         
-        # Platforma göre gönder
-        if post['platform'] == 'Twitter':
-            success, api_id = self._send_to_twitter(post)
+        pending_posts = [post for post in upcoming if post.is_due(now)]
+        pending_posts = self._expire_stale(pending_posts, now)
+        # Tarama turdaki her gönderimin trace'ine store.scan span'ı olarak eklenir
+        scan = (scan_started_at, round((time.perf_counter() - scan_started) * 1000, 3), len(upcoming))
+        DUE_POSTS.set(len(pending_posts))
         
-        elif post['platform'] == 'LinkedIn':
-            if self.linkedin:
-                success, api_id = self._send_to_linkedin(post)
-            else:
-                logger.warning("⚠️ LinkedIn publisher yapılandırılmamış")
-                return
+        # Önce zamanı gelenler gönderilir; ön hazırlık (ağ çağrıları) sonra, arka
+        # planda ve süre sınırıyla çalışır, gönderimi geciktirmez
+        if pending_posts:
+            self._dispatch(pending_posts, scan)
+        self.stager.run([post for post in upcoming if not post.is_due(now)])
+    
+    def _dispatch(self, pending_posts, scan):
+        """Zamanı gelmiş postları hesap bazında gruplayıp gönderir"""
+        logger.info(f"📋 {len(pending_posts)} adet gönderilmeyi bekleyen post bulundu")
         
-        else:
-            logger.error(f"❌ Bilinmeyen platform: {post['platform']}")
-            return
+        # Her hesabın postları kendi sırasıyla, hesaplar birbirinden bağımsız ve
+        # paralel gönderilir: bir hesabın 429 beklemesi diğerlerini yavaşlatmaz.
+        # Hesap içinde sıra öncelik > son geçerlilik > planlanan zaman; kota
+        # yetmediğinde kalan haklar önce yüksek öncelikli postlara gider
+        groups = {}
+        for post in sorted(pending_posts, key=Post.dispatch_key):
+            groups.setdefault((post.platform, normalize_account(post.account)), []).append(post)
         
-        # Gönderim sonucunu kaydet
-        if success and api_id:
-            self.cm.update_post_after_send(post['id'], api_id, status="sent")
-            logger.info(f"✅ {post['platform']} postu başarıyla gönderildi (ID: {api_id})")
+        for (platform, account), posts in groups.items():
+            remaining = self.api.remaining_quota(platform, account)
+            if remaining is not None and remaining < len(posts):
+                logger.info(f"🎯 {platform}/{account}: {len(posts)} post, kalan kota {remaining}; "
+                            f"öncelik sırasıyla gönderiliyor")
+        
+        if len(groups) == 1 or PUBLISH_WORKERS <= 1:
+            results = [self._send_account_posts(key, posts, scan) for key, posts in groups.items()]
         else:
-            self.cm.update_post_after_send(post['id'], None, status="failed")
-            logger.error(f"❌ {post['platform']} gönderimi başarısız")
+            with ThreadPoolExecutor(max_workers=min(PUBLISH_WORKERS, len(groups)),
+                                    thread_name_prefix='Publish') as pool:
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._send_account_posts, key, posts, scan)
+                    for key, posts in groups.items()
+                ]
+                results = [future.result() for future in futures]
+        
+        for (platform, account), (count, reason) in zip(groups, results):
+            if count:
+                PUBLISH_TOTAL.labels(platform, 'deferred').inc(count)
+                logger.warning(f"⏸️ {platform}/{account} {reason}: {count} post sonraki kontrole ertelendi")
     
-    def _send_to_twitter(self, post):
+    def _expire_stale(self, posts, now):
         """
-        Twitter'a post gönder
+        Son geçerlilik zamanı geçmiş postları geç göndermek yerine 'expired' yapar
         
         Returns:
-            tuple: (success: bool, api_id: str)
+            list: Gönderilmeye devam edecek postlar
         """
-        try:
-            result = self.twitter.post_to_twitter(post['content'], post['id'])
-            if result:
-                return True, str(result)
-            return False, None
-        except Exception as e:
-            logger.error(f"Twitter gönderim hatası: {e}")
-            return False, None
+        stale = [post for post in posts if post.is_expired(now)]
+        if not stale:
+            return posts
+        expired = set(self.cm.expire_posts(post.id for post in stale))
+        for post in stale:
+            if post.id in expired:
+                PUBLISH_TOTAL.labels(post.platform, PostStatus.EXPIRED).inc()
+                self.stager.discard(post.id)
+                logger.warning("⌛ Post #%s son geçerlilik zamanı (%s) geçti, gönderilmeyecek",
+                               post.id, post.expires_at_text, extra={"post_id": post.id, "platform": post.platform})
+        return [post for post in posts if post.id not in expired]
     
-    def _send_to_linkedin(self, post):
+    def _send_account_posts(self, key, posts, scan):
         """
-        LinkedIn'e post gönder
+        Tek bir platform/hesabın zamanı gelmiş postlarını sırayla gönder
+        
+        Devre kesicisi açılan veya günlük kotası dolan hesabın kalan postları
+        topluca ertelenir (pending kalır).
         
         Returns:
-            tuple: (success: bool, api_id: str)
+            tuple: (ertelenen post sayısı, sebep)
+        """
+        platform, account = key
+        for index, post in enumerate(posts):
+            # Kapanış başladıysa yeni post sahiplenilmez; kalanlar pending kalır
+            if self._stopping.is_set():
+                return len(posts) - index, "kapanış nedeniyle"
+            # Sonucu yazılamamış önceki gönderim: tekrar gönderilmez (kopya riski)
+            if self.state.is_claimed(post.id):
+                continue
+            # Aynı turda önceki gönderimler (ör. 429 beklemesi) sürerken süresi dolmuş olabilir
+            if not self._expire_stale([post], datetime.now()):
+                continue
+            if self.api.is_circuit_open(platform, account):
+                return len(posts) - index, "erişilemiyor"
+            if not self.api.acquire_quota(platform, account):
+                return len(posts) - index, "günlük kotası doldu"
+            # Sahiplenme diske yazılır; süreç gönderim sırasında ölürse post
+            # açılışta tekrar gönderilmez (kopya riski), dead-letter'a alınır
+            self.state.claim(post.id)
+            try:
+                self._send_post(post, scan=scan)
+            except CircuitOpenError as e:
+                # Devre gönderimden önce açıldı; post platforma gitmedi, pending kalır
+                self.state.release(post.id)
+                logger.warning(f"⏸️ {e}")
+                return len(posts) - index, "erişilemiyor"
+            except Exception as e:
+                self._fail_interrupted(post, e)
+                continue
+            self.state.release(post.id)
+            self.stager.discard(post.id)
+        return 0, None
+    
+    def _fail_interrupted(self, post, error):
+        """
+        Sahiplenilmiş gönderim beklenmedik hatayla kesildi. Hata platform
+        yanıtından sonra da (ör. sonuç kaydı) oluşmuş olabilir; post tekrar
+        gönderilmez, dead-letter kuyruğuna alınır. O da yazılamazsa sahiplenme
+        bırakılmaz: bu süreç postu atlar, sonraki açılış dead-letter'a alır.
         """
+        logger.error("⚠️ Post #%s gönderim hatası: %s", post.id, error,
+                     extra={"post_id": post.id, "platform": post.platform})
         try:
-            result = self.linkedin.post_to_linkedin(post['content'], post['id'])
-            if result:
-                # LinkedIn'den gerçek ID gelmezse timestamp kullan
-                api_id = str(result) if isinstance(result, str) else f"LI-{int(time.time())}"
-                return True, api_id
-            return False, None
+            failed = self.cm.fail_posts([post.id], interrupted_publish_error(error))
         except Exception as e:
-            logger.error(f"LinkedIn gönderim hatası: {e}")
-            return False, None
+            logger.error("❌ Post #%s dead-letter'a alınamadı, sahiplenme korunuyor: %s", post.id, e,
+                         extra={"post_id": post.id, "platform": post.platform})
+            return
+        self.state.release(post.id)
+        self.stager.discard(post.id)
+        if failed:
+            PUBLISH_TOTAL.labels(post.platform, PostStatus.FAILED).inc()
+            logger.warning("📮 Post #%s tekrar gönderilmeyecek (kopya riski), dead-letter kuyruğunda", post.id,
+                           extra={"post_id": post.id, "platform": post.platform})
+    
+    def _send_post(self, post, scan=None):
+        """
+        Tek bir postu platforma göre gönder (deneme başına bir trace açar)
+        
+        Args:
+            post (Post): Gönderilecek post
+            scan (tuple): Bu turun bekleyen post taraması (başlangıç, süre ms, taranan post)
+        
+        Raises:
+            CircuitOpenError: Platformun devre kesicisi açıksa (post pending kalır)
+        """
+        with tracer.start_trace('publish', post_id=post.id, platform=post.platform,
+                                account=normalize_account(post.account)) as span:
+            if scan is not None:
+                started_at, duration_ms, scanned = scan
+                tracer.record('store.scan', started_at, duration_ms, scanned=scanned)
+            self._publish(post, span)
+    
+    def _publish(self, post, span):
+        """_send_post gövdesi: platforma gönder ve sonucu kaydet"""
+        if post.platform not in SocialMediaAPI.SUPPORTED_PLATFORMS:
+            logger.error(f"❌ Bilinmeyen platform: {post.platform}")
+            return
+        
+        if not self.api.is_platform_available(post.platform, post.account):
+            logger.warning("⚠️ %s/%s publisher yapılandırılmamış", post.platform, normalize_account(post.account),
+                           extra={"post_id": post.id, "platform": post.platform})
+            return
+        
+        logger.info("🚀 Post gönderiliyor: %.50s...", post.content,
+                    extra={"post_id": post.id, "platform": post.platform})
+        
+        success, api_id = self.api.post_to_platform(post.platform, post.content, post.id, media=post.media,
+                                                    account=post.account)
+        
+        # Gönderim sonucunu kaydet
+        if success and api_id:
+            if post.schedule_time is not None:
+                SCHEDULE_LAG.labels(post.platform).observe(
+                    max(0.0, (datetime.now() - post.schedule_time).total_seconds())
+                )
+            PUBLISH_TOTAL.labels(post.platform, 'sent').inc()
+            span.set('result', PostStatus.SENT)
+            with tracer.span('store.update_post_after_send'):
+                self.cm.update_post_after_send(post.id, api_id, status=PostStatus.SENT)
+            logger.info("✅ %s postu başarıyla gönderildi (ID: %s)", post.platform, api_id,
+                        extra={"post_id": post.id, "platform": post.platform})
+        else:
+            error = self.api.get_last_error(post.platform, post.account) or {}
+            PUBLISH_TOTAL.labels(post.platform, 'failed').inc()
+            span.set('result', PostStatus.FAILED)
+            span.set('error_class', error.get('error_class'))
+            with tracer.span('store.update_post_after_send'):
+                self.cm.update_post_after_send(post.id, None, status=PostStatus.FAILED, error=error)
+            logger.error("❌ %s gönderimi başarısız (%s, HTTP %s) - dead-letter kuyruğunda", post.platform,
+                         error.get('error_class', 'Unknown'), error.get('status_code') or '-',
+                         extra={"post_id": post.id, "platform": post.platform})
 
 
 class PerformanceTracker:
@@ -143,19 +358,32 @@ class PerformanceTracker:
     Belirli aralıklarla metrics günceller.
     """
     
-    def __init__(self, content_manager, twitter_publisher, linkedin_publisher=None):
+    def __init__(self, content_manager, twitter_publisher, linkedin_publisher=None, api=None, state=None):
         """
         Args:
             content_manager: ContentManager instance
             twitter_publisher: PostPublisher instance
             linkedin_publisher: LinkedInPublisher instance (opsiyonel)
+            api: SocialMediaAPI instance (opsiyonel, verilmezse publisher'lardan oluşturulur)
+            state: SchedulerState instance (opsiyonel, verilmezse data/scheduler_state.json)
         """
         self.cm = content_manager
         self.twitter = twitter_publisher
         self.linkedin = linkedin_publisher
+        self.api = api or SocialMediaAPI.from_publishers(twitter_publisher, linkedin_publisher)
+        self.state = state or scheduler_state
         self.running = False
         self.check_interval = 600  # 10 dakika
         self.initial_delay = 60  # İlk başlangıçta 60 saniye bekle
+        self.archive_interval = 24 * 3600  # Eski postları günde bir arşivle
+        # Önceki sürecin tur durumu; kapanışta yarıda kalan turun kalan post ID'leri
+        # açılışta önce işlenir
+        saved = self.state.get('tracker') or {}
+        self._last_archive = saved.get('last_archive', 0)
+        self._last_pass = saved.get('last_pass', 0)
+        self._pending = saved.get('pending', [])
+        self._stopping = threading.Event()
+        self._pass_lock = threading.Lock()
         
         logger.info("📊 PerformanceTracker başlatıldı")
     
@@ -164,61 +392,148 @@ class PerformanceTracker:
         self.running = True
         logger.info(f"✅ Performans takipçisi başladı (Her {self.check_interval//60} dakikada kontrol)")
         
-        # İlk başlangıçta biraz bekle
-        time.sleep(self.initial_delay)
+        # İlk başlangıçta biraz bekle; önceki süreç turunu yakın zamanda bitirdiyse
+        # tam tur hemen tekrarlanmaz, planlanan zamanına kadar beklenir
+        self._stopping.wait(self._initial_wait())
         
-        while self.running:
-            try:
-                self._update_metrics()
-            except Exception as e:
-                logger.error(f"⚠️ Performans güncelleme hatası: {e}")
+        while not self._stopping.is_set():
+            with self._pass_lock:
+                if self._stopping.is_set():
+                    break
+                try:
+                    with TRACKER_PASS.time():
+                        self._update_metrics()
+                except Exception as e:
+                    logger.error(f"⚠️ Performans güncelleme hatası: {e}")
+                
+                try:
+                    if not self._stopping.is_set():
+                        self._archive_if_due()
+                except Exception as e:
+                    logger.error(f"⚠️ Arşivleme hatası: {e}")
             
-            time.sleep(self.check_interval)
+            self._stopping.wait(self.check_interval)
     
     def stop(self):
-        """Performans takipçisini durdur"""
+        """Performans takipçisini durdur (süren tur ilk fırsatta keser, kalan postlar kaydedilir)"""
         self.running = False
-        logger.info("🛑 Performans takipçisi durduruldu")
+        if not self._stopping.is_set():
+            self._stopping.set()
+            logger.info("🛑 Performans takipçisi durduruldu")
+    
+    def drain(self, timeout=DRAIN_TIMEOUT):
+        """
+        Takipçiyi durdurur, süren turun kesilmesini en fazla ``timeout`` saniye bekler
+        ve tur durumunu kaydeder.
+        
+        Returns:
+            bool: Süren tur süre dolmadan durdu mu?
+        """
+        self.stop()
+        drained = self._pass_lock.acquire(timeout=max(0.0, timeout))
+        try:
+            self.save_state()
+        except Exception as e:
+            logger.error(f"⚠️ Takipçi durumu kaydedilemedi: {e}")
+        finally:
+            if drained:
+                self._pass_lock.release()
+        return drained
+    
+    def save_state(self):
+        """Son tur zamanı ve yarıda kalan turun kalan postlarını durum dosyasına yazar"""
+        self.state.update(tracker={
+            "last_pass": self._last_pass,
+            "last_archive": self._last_archive,
+            "pending": list(self._pending)
+        })
+    
+    def _initial_wait(self):
+        """Açılışta ilk tura kadar beklenecek süre (önceki sürecin durumuna göre)"""
+        if self._pending:
+            logger.info(f"📊 Önceki süreçte yarıda kalan metrik turu {len(self._pending)} posttan devam edecek")
+            return self.initial_delay
+        return max(self.initial_delay, self._last_pass + self.check_interval - time.time())
     
     def _update_metrics(self):
-        """Gönderilmiş postların metriklerini güncelle"""
+        """Gönderilmiş postların metriklerini güncelle (yarıda kalan tur varsa oradan devam eder)"""
         all_posts = self.cm.get_all_posts()
+        resume = set(self._pending)
         sent_posts = [
             p for p in all_posts
-            if isinstance(p, dict)
-            and p.get('status') == 'sent'
-            and p.get('api_post_id')
+            if p.status == PostStatus.SENT and p.api_post_id and (not resume or p.id in resume)
         ]
         
         if not sent_posts:
             logger.info("📊 Güncellenecek metrik yok")
+            self._finish_pass()
             return
         
         logger.info(f"📊 {len(sent_posts)} adet post için metrikler güncelleniyor...")
         
-        for post in sent_posts:
+        skipped = 0
+        unavailable = 0
+        
+        for index, post in enumerate(sent_posts):
+            # Kapanış başladıysa kalan postlar kaydedilir, sonraki süreç devam eder
+            if self._stopping.is_set():
+                self._pending = [p.id for p in sent_posts[index:]]
+                logger.info(f"🛑 Metrik turu kesildi, {len(self._pending)} post sonraki açılışa kaldı")
+                return
+            
+            # Devre kesicisi açık platform için istek gönderme
+            if self.api.is_circuit_open(post.platform, post.account):
+                skipped += 1
+                METRICS_REFRESH.labels(post.platform, 'skipped').inc()
+                continue
+            
+            # Bu hesapta metrik okuma yetkisi yoksa (önbellekte) çağırma
+            if not self.api.metrics_available(post.platform, post.account):
+                unavailable += 1
+                METRICS_REFRESH.labels(post.platform, 'skipped').inc()
+                continue
+            
             try:
-                metrics = None
-                
-                if post['platform'] == 'Twitter':
-                    metrics = self.twitter.get_post_metrics(post['api_post_id'])
-                elif post['platform'] == 'LinkedIn' and self.linkedin:
-                    metrics = self.linkedin.get_post_metrics(post['api_post_id'])
+                metrics = self.api.get_metrics(post.platform, post.api_post_id, post.account)
+                METRICS_REFRESH.labels(post.platform, 'updated' if metrics else 'empty').inc()
                 
                 if metrics:
-                    self.cm.update_metrics(post['id'], metrics)
+                    self.cm.update_metrics(post.id, metrics)
                     logger.info(
-                        f"✅ Post #{post['id']}: "
+                        f"✅ Post #{post.id}: "
                         f"❤️ {metrics.get('likes', 0)} | "
                         f"🔁 {metrics.get('shares', 0)}"
                     )
                 else:
-                    logger.debug(f"⚠️ Post #{post['id']} için metrik alınamadı")
+                    logger.debug("⚠️ Post #%s için metrik alınamadı", post.id,
+                                 extra={"post_id": post.id, "platform": post.platform})
                     
             except Exception as e:
-                logger.error(f"⚠️ Post #{post['id']} metrik hatası: {e}")
+                METRICS_REFRESH.labels(post.platform, 'error').inc()
+                logger.error("⚠️ Post #%s metrik hatası: %s", post.id, e,
+                             extra={"post_id": post.id, "platform": post.platform})
         
+        if skipped:
+            logger.warning(f"⏸️ Devre kesici açık: {skipped} post için metrik güncellemesi atlandı")
+        if unavailable:
+            logger.info(f"🚫 Metrik erişimi olmayan hesaplar: {unavailable} post atlandı")
+        
+        self._finish_pass()
         logger.info("✅ Metrik güncelleme tamamlandı")
+    
+    def _finish_pass(self):
+        self._pending = []
+        self._last_pass = time.time()
+    
+    def _archive_if_due(self):
+        """Eski sent/failed postları belirli aralıklarla arşive taşı"""
+        if time.time() - self._last_archive < self.archive_interval:
+            return
+        
+        archived = self.cm.archive_old_posts()
+        self._last_archive = time.time()
+        if archived:
+            logger.info(f"🗄️ {archived} adet eski post arşive taşındı")
 
 
 # Test
@@ -237,7 +552,6 @@ if __name__ == "__main__":
     print("📋 Bekleyen postlar:", len(cm.get_pending_posts()))
     print("⏰ Zamanlayıcı test modu (10 saniye çalışacak)...")
     
-    import threading
     thread = threading.Thread(target=scheduler.start, daemon=True)
     thread.start()
     
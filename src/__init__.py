@@ -8,10 +8,15 @@ from .content_manager import ContentManager
 from .post_publisher import PostPublisher
 from .linkedin_publisher import LinkedInPublisher
 from .error_handler import error_handler
+from .models import Post, Metrics, PostStatus, Platform
 
 __all__ = [
     'ContentManager',
     'PostPublisher',
     'LinkedInPublisher',
-    'error_handler'
+    'error_handler',
+    'Post',
+    'Metrics',
+    'PostStatus',
+    'Platform'
 ]
@@ -0,0 +1,99 @@
+"""
+accounts.py
+===========
+Çoklu hesap için kimlik bilgisi kaydı.
+
+Varsayılan hesap (``default``) bugünkü gibi önek almayan ortam
+değişkenlerini kullanır. Ek hesaplar ``ACCOUNTS`` ile listelenir ve kimlik
+bilgileri hesap adı önekli değişkenlerden okunur:
+
+    ACCOUNTS=marka_a,marka_b
+    MARKA_A_TWITTER_API_KEY=...        MARKA_A_LINKEDIN_ACCESS_TOKEN=...
+    MARKA_A_TWITTER_API_SECRET=...     MARKA_A_TWITTER_DAILY_LIMIT=100
+    MARKA_A_TWITTER_ACCESS_TOKEN=...
+    MARKA_A_TWITTER_ACCESS_SECRET=...
+
+Bir hesap yalnızca kimlik bilgisi tanımlı olan platformlar için kaydedilir.
+Günlük kota verilmezse platformun varsayılanı (``TWITTER_DAILY_LIMIT`` /
+``LINKEDIN_DAILY_LIMIT``) kullanılır.
+"""
+
+import os
+import re
+
+from dotenv import load_dotenv
+
+DEFAULT_ACCOUNT = 'default'
+
+# Platform -> publisher'ın beklediği kimlik bilgisi değişkenleri
+CREDENTIAL_KEYS = {
+    'Twitter': ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN', 'TWITTER_ACCESS_SECRET'),
+    'LinkedIn': ('LINKEDIN_ACCESS_TOKEN',)
+}
+
+# Hesap başına varsayılan günlük gönderim kotası (TWITTER_DAILY_LIMIT vb. ile değişir)
+DEFAULT_DAILY_LIMITS = {'Twitter': 50, 'LinkedIn': 25}
+
+_NAME_RE = re.compile(r'^[a-z0-9_]+$')
+
+
+class Account:
+    """Bir platformdaki tek bir hesap."""
+
+    __slots__ = ('name', 'platform', 'credentials', 'daily_limit')
+
+    def __init__(self, name, platform, credentials, daily_limit=None):
+        self.name = name
+        self.platform = platform
+        self.credentials = credentials  # {'TWITTER_API_KEY': ..., ...}
+        self.daily_limit = default_daily_limit(platform) if daily_limit is None else daily_limit
+
+    @property
+    def key(self):
+        return self.platform, self.name
+
+    def __repr__(self):
+        return f"Account({self.platform}/{self.name})"
+
+
+def default_daily_limit(platform):
+    """Platformun hesap başına günlük kotası (.env'den, yoksa varsayılan)."""
+    value = os.getenv(f"{platform.upper()}_DAILY_LIMIT")
+    return int(value) if value else DEFAULT_DAILY_LIMITS.get(platform)
+
+
+def normalize_account(name):
+    """Boş/None hesap adını varsayılan hesaba çevirir."""
+    name = (name or '').strip().lower()
+    return name or DEFAULT_ACCOUNT
+
+
+def load_accounts(environ=None):
+    """
+    ACCOUNTS ortam değişkenindeki ek hesapları okur (varsayılan hesap hariç).
+
+    Returns:
+        list[Account]: Kimlik bilgisi tam olan (hesap, platform) çiftleri
+    """
+    if environ is None:
+        load_dotenv()
+        environ = os.environ
+    accounts = []
+    for raw in environ.get('ACCOUNTS', '').split(','):
+        name = normalize_account(raw)
+        if name == DEFAULT_ACCOUNT:
+            continue
+        if not _NAME_RE.match(name):
+            print(f"⚠️ Geçersiz hesap adı atlandı: {raw!r}")
+            continue
+        prefix = name.upper() + '_'
+        for platform, keys in CREDENTIAL_KEYS.items():
+            credentials = {key: environ.get(prefix + key) for key in keys}
+            if not any(credentials.values()):
+                continue
+            if not all(credentials.values()):
+                print(f"⚠️ {name} hesabının {platform} kimlik bilgileri eksik, hesap atlandı")
+                continue
+            limit = environ.get(f"{prefix}{platform.upper()}_DAILY_LIMIT")
+            accounts.append(Account(name, platform, credentials, int(limit) if limit else None))
+    return accounts
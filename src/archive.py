@@ -0,0 +1,166 @@
+"""
+archive.py
+==========
+Tamamlanmış (sent/failed) eski postlar için soğuk depolama.
+
+Postlar planlanma ayına göre aylık, gzip sıkıştırılmış ve sadece ekleme
+yapılan JSONL partition dosyalarına yazılır:
+
+    data/archive/posts-2026-01.jsonl.gz
+
+Partition'lar yalnızca sorgunun tarih aralığı onlara denk geldiğinde açılır.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+from src.atomic_file import atomic_write_json
+from src.models import Post
+
+
+def month_key(value):
+    """datetime'ı 'YYYY-MM' partition anahtarına çevirir."""
+    return value.strftime("%Y-%m")
+
+
+def _month_bounds(key):
+    """'YYYY-MM' anahtarının [başlangıç, sonraki ay başlangıcı) aralığı."""
+    year, month = (int(part) for part in key.split('-'))
+    start = datetime(year, month, 1)
+    end = datetime(year + (month == 12), month % 12 + 1, 1)
+    return start, end
+
+
+class PostArchive:
+    """Aylık gzip JSONL partition'larını yöneten sınıf."""
+
+    FILE_PREFIX = "posts-"
+    FILE_SUFFIX = ".jsonl.gz"
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, 'index.json')
+        self._index = None
+
+    # ------------------------------------------------------------------
+    # İndeks (partition listesi ve en büyük post ID'si)
+    # ------------------------------------------------------------------
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {"max_id": 0, "partitions": {}}
+        return self._index
+
+    def _save_index(self):
+        # Arşivleme ile dışa aktarım/arama okuyucuları aynı anda çalışabilir;
+        # benzersiz geçici dosya yazımların birbirini ezmesini önler
+        atomic_write_json(self.index_path, self._index)
+
+    def signature(self):
+        """İndeks dosyasının (mtime, boyut) imzası; arşive her eklemede değişir."""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        """Bellekteki indeksi bırakır (başka bir instance arşive yazdıysa)."""
+        self._index = None
+
+    @property
+    def max_id(self):
+        """Arşivdeki en büyük post ID'si (yeni ID üretimi için)."""
+        return self._load_index().get("max_id", 0)
+
+    def partition_keys(self):
+        """Mevcut partition anahtarları (eskiden yeniye)."""
+        return sorted(self._load_index().get("partitions", {}))
+
+    def partition_path(self, key):
+        return os.path.join(self.archive_dir, f"{self.FILE_PREFIX}{key}{self.FILE_SUFFIX}")
+
+    @staticmethod
+    def partition_key_for(post):
+        """Postun ait olduğu aylık partition."""
+        when = post.schedule_time or post.created_at or datetime.now()
+        return month_key(when)
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+    def append(self, posts):
+        """
+        Postları ait oldukları aylık partition'lara ekler.
+
+        Her çağrı partition dosyasına yeni bir gzip üyesi ekler; mevcut
+        veri hiçbir zaman yeniden yazılmaz.
+        """
+        if not posts:
+            return 0
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        index = self._load_index()
+
+        groups = {}
+        for post in posts:
+            groups.setdefault(self.partition_key_for(post), []).append(post)
+
+        for key, group in groups.items():
+            with gzip.open(self.partition_path(key), 'at', encoding='utf-8') as f:
+                for post in group:
+                    f.write(json.dumps(post.to_dict(), ensure_ascii=False))
+                    f.write('\n')
+            index["partitions"][key] = index["partitions"].get(key, 0) + len(group)
+
+        index["max_id"] = max([index.get("max_id", 0)] + [p.id for p in posts if p.id])
+        self._save_index()
+        return len(posts)
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def keys_for_range(self, start=None, end=None):
+        """[start, end] aralığıyla kesişen partition anahtarları."""
+        keys = []
+        for key in self.partition_keys():
+            month_start, month_end = _month_bounds(key)
+            if start is not None and month_end <= start:
+                continue
+            if end is not None and month_start > end:
+                continue
+            keys.append(key)
+        return keys
+
+    def iter_posts(self, start=None, end=None, platform=None):
+        """
+        Aralıkla kesişen partition'ları sırayla açarak postları tek tek döndürür.
+
+        Arşivleme yarıda kesilip tekrarlandıysa aynı post iki kez yazılmış
+        olabilir; aynı ID'ler partition içinde bir kez döndürülür.
+        """
+        for key in self.keys_for_range(start, end):
+            path = self.partition_path(key)
+            if not os.path.exists(path):
+                continue
+            seen = set()
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    post = Post.from_dict(json.loads(line))
+                    if post.id in seen:
+                        continue
+                    seen.add(post.id)
+                    if platform and post.platform != platform:
+                        continue
+                    if start is not None and (post.schedule_time is None or post.schedule_time < start):
+                        continue
+                    if end is not None and (post.schedule_time is None or post.schedule_time > end):
+                        continue
+                    yield post
@@ -0,0 +1,53 @@
+"""
+atomic_file.py
+==============
+Dosyaları yarım bırakmadan değiştirmek için ortak yazma yardımcıları.
+
+İçerik aynı dizinde benzersiz adlı bir geçici dosyaya yazılır, diske
+işlenir (fsync) ve ``os.replace`` ile hedefin yerine konur:
+
+- Yazım yarıda kesilirse (kill, elektrik) hedef dosya eski haliyle kalır
+- Aynı dosyaya eşzamanlı yazan thread/süreçlerin geçici dosyaları
+  çakışmaz; son ``os.replace`` kazanır, hiçbir yazım ENOENT ile düşmez
+"""
+
+import json
+import os
+import tempfile
+
+
+def atomic_write(path, data, default_mode=0o644):
+    """
+    Byte içeriği ``path``'e atomik olarak yazar (dizin yoksa oluşturulur).
+
+    mkstemp dosyayı 0600 ile açtığından mevcut dosyanın izinleri korunur,
+    yeni dosya ``default_mode`` ile oluşturulur.
+
+    Raises:
+        OSError: Yazılamazsa (geçici dosya silinir, hedef değişmez)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = default_mode
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_json(path, value, indent=4, ensure_ascii=True):
+    """JSON'a çevrilebilir değeri ``path``'e atomik olarak yazar."""
+    atomic_write(path, json.dumps(value, indent=indent, ensure_ascii=ensure_ascii).encode('utf-8'))
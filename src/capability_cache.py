@@ -0,0 +1,101 @@
+"""
+capability_cache.py
+===================
+Platform/kimlik bilgisi bazında "bu özellik kullanılamıyor" önbelleği.
+
+Örneğin Twitter Free tier'da metrik okuma her seferinde 403 döner. İlk
+reddedilen çağrıdan sonra bu bilgi TTL süresince saklanır ve çağrılar hiç
+yapılmaz; süre dolunca tek bir çağrı ile yeniden denenir (re-probe).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+from src.models import DATETIME_FORMAT
+
+# Kullanılamayan bir özelliğin yeniden denenme aralığı (saniye)
+CAPABILITY_TTL = int(os.getenv('METRICS_CAPABILITY_TTL', str(6 * 3600)))
+
+METRICS = 'metrics'
+
+
+def credential_fingerprint(*secrets):
+    """Kimlik bilgisini açığa çıkarmadan ayırt etmek için kısa özet üretir."""
+    joined = '|'.join(secret or '' for secret in secrets)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()[:12]
+
+
+class CapabilityCache:
+    """Kullanılamayan yetenekleri TTL ile hatırlayan önbellek."""
+
+    def __init__(self, ttl=CAPABILITY_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Dashboard çıktısı önbelleği için: görünen durum her değiştiğinde artar
+        self.version = 0
+
+    def is_allowed(self, platform, credential, capability=METRICS):
+        """
+        Çağrı yapılabilir mi?
+
+        Kayıt yoksa True döner. TTL dolmuşsa yalnızca ilk çağırana yeniden
+        deneme hakkı verilir; sonuç gelene kadar diğerleri beklemeye devam eder.
+        """
+        key = (capability, platform, credential)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return True
+            now = time.time()
+            if now < entry['until']:
+                return False
+            entry['until'] = now + self.ttl
+            entry['probes'] += 1
+            self.version += 1
+            return True
+
+    def is_blocked(self, platform, credential, capability=METRICS):
+        """TTL'i dolmamış bir engel var mı? (yeniden deneme hakkı tüketmez)"""
+        with self._lock:
+            entry = self._entries.get((capability, platform, credential))
+            return entry is not None and time.time() < entry['until']
+
+    def mark_unavailable(self, platform, credential, reason, capability=METRICS):
+        key = (capability, platform, credential)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {'since': time.time(), 'probes': 0}
+                self._entries[key] = entry
+            entry['reason'] = reason
+            entry['until'] = time.time() + self.ttl
+            self.version += 1
+
+    def mark_available(self, platform, credential, capability=METRICS):
+        with self._lock:
+            if self._entries.pop((capability, platform, credential), None) is not None:
+                self.version += 1
+
+    def snapshot(self):
+        """Dashboard için önbellek durumu."""
+        with self._lock:
+            items = sorted(self._entries.items())
+        return [
+            {
+                "capability": capability,
+                "platform": platform,
+                "credential": credential,
+                "reason": entry['reason'],
+                "since": datetime.fromtimestamp(entry['since']).strftime(DATETIME_FORMAT),
+                "next_probe": datetime.fromtimestamp(entry['until']).strftime(DATETIME_FORMAT),
+                "probes": entry['probes']
+            }
+            for (capability, platform, credential), entry in items
+        ]
+
+
+capability_cache = CapabilityCache()
@@ -0,0 +1,145 @@
+"""
+circuit_breaker.py
+==================
+Platform bazlı devre kesici (circuit breaker).
+
+Durumlar:
+    closed    -> İstekler normal akar, ardışık geçici hatalar sayılır.
+    open      -> Eşik aşıldı; istekler bekleme süresi boyunca hiç gönderilmez.
+    half_open -> Bekleme bitti; sağlık kontrolü (health probe) başarılıysa
+                 devre kapanır, değilse yeniden açılır.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken yapılan çağrılarda fırlatılır."""
+
+    def __init__(self, name, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"{name} devre kesici açık ({int(retry_after)} sn sonra tekrar denenecek)")
+
+
+class CircuitBreaker:
+    """Tek bir platform için devre kesici."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=3, recovery_timeout=120, health_probe=None):
+        """
+        Args:
+            name (str): Platform adı (loglama için)
+            failure_threshold (int): Devreyi açacak ardışık hata sayısı
+            recovery_timeout (float): Açık kalma süresi (saniye)
+            health_probe (callable): Yarı açık durumda çağrılan, bool dönen kontrol
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.health_probe = health_probe
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        return self._state
+
+    def is_open(self):
+        """Bekleme süresi dolmamış açık devre mi? (sağlık kontrolü yapmaz)"""
+        return self._state == self.OPEN and self._remaining() > 0
+
+    def _remaining(self):
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow_request(self):
+        """
+        İsteğin gönderilip gönderilemeyeceğine karar verir.
+
+        Bekleme süresi dolan açık devrede önce sağlık kontrolü çalıştırılır;
+        aynı anda yalnızca bir çağıran kontrolü yapar, diğerleri reddedilir.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN or self._remaining() > 0:
+                return False
+            self._state = self.HALF_OPEN
+
+        healthy = True
+        if self.health_probe is not None:
+            try:
+                healthy = bool(self.health_probe())
+            except Exception as e:
+                logger.warning(f"⚠️ {self.name} sağlık kontrolü hatası: {e}")
+                healthy = False
+
+        if healthy:
+            self.record_success()
+            logger.info(f"✅ {self.name} sağlık kontrolü başarılı, devre kapatıldı")
+            return True
+
+        self._trip()
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            should_trip = self._failures >= self.failure_threshold
+        if should_trip:
+            self._trip()
+
+    def _trip(self):
+        with self._lock:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        logger.warning(
+            f"🚫 {self.name} devre kesici AÇIK: {self.recovery_timeout} sn boyunca istek gönderilmeyecek"
+        )
+
+    def error(self):
+        """Mevcut durum için CircuitOpenError üretir."""
+        return CircuitOpenError(self.name, self._remaining())
+
+    def export_state(self):
+        """
+        Yeniden başlatmada korunacak durum (açık devrenin bitişi duvar saatiyle).
+        """
+        with self._lock:
+            state = {"failures": self._failures}
+            if self._state != self.CLOSED:
+                state["open_until"] = time.time() + self._remaining()
+            return state
+
+    def restore_state(self, state):
+        """export_state() çıktısını uygular; bekleme süresi kapalıyken dolduysa devre yarı açık başlar."""
+        with self._lock:
+            self._failures = int(state.get("failures", 0))
+            open_until = state.get("open_until")
+            if open_until is not None:
+                self._state = self.OPEN
+                remaining = min(self.recovery_timeout, max(0.0, open_until - time.time()))
+                self._opened_at = time.monotonic() - (self.recovery_timeout - remaining)
+
+    def snapshot(self):
+        """Durum özeti (dashboard/loglama için)."""
+        return {
+            "state": self._state,
+            "failures": self._failures,
+            "retry_after": round(self._remaining(), 1) if self._state == self.OPEN else 0
+        }
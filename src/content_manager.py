@@ -1,11 +1,70 @@
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+from functools import wraps
+
+from src.accounts import DEFAULT_ACCOUNT, normalize_account
+from src.archive import PostArchive
+from src.atomic_file import atomic_write
+from src.dead_letter import record_failure
+from src.events import POST_CREATED, POST_METRICS, POST_UPDATED, POSTS_REMOVED, event_bus
+from src.fingerprint import DuplicateContentError, FingerprintIndex
+from src.outbox import outbox as default_outbox
+from src.models import Post, PostPriority, PostStatus, format_datetime, intern_value, parse_datetime
+from src.search import SearchIndex
+from src.serializer import CorruptStoreError, StoreSerializer, iter_records, load_records
+from src.telemetry import STORE_BYTES_WRITTEN, STORE_READ, STORE_WRITE
+from src.tracing import tracer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+# Bu kadar günden eski sent/failed postlar arşive taşınır
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '30'))
+
+# Tekrarlanan içerik politikası: 'warn' (kaydet ve uyar), 'reject' (hata ver), 'off'
+DUPLICATE_POLICY = os.getenv('DUPLICATE_POLICY', 'warn')
+
+
+def _synchronized(method):
+    """
+    Oku-değiştir-yaz metodlarını instance kilidiyle sıralar; zamanlayıcı farklı
+    hesapların postlarını paralel gönderirken güncellemeler birbirini ezmez.
+
+    Kilit nesne başınadır: aynı posts.json için süreçte tek bir ContentManager
+    paylaşılmalıdır (python_script.py dashboard'ın ``app.cm`` nesnesini kullanır).
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class ContentManager:
-    def __init__(self):
+    def __init__(self, db_path=None, archive_dir=None, archive_after_days=ARCHIVE_AFTER_DAYS,
+                 duplicate_policy=DUPLICATE_POLICY, events=None, serializer=None, outbox=None):
         # Dosya yolunu proje kök dizinine göre ayarlıyoruz
-        self.db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'posts.json')
+        self.db_path = db_path or os.path.join(DATA_DIR, 'posts.json')
+        self.archive = PostArchive(archive_dir or os.path.join(os.path.dirname(self.db_path), 'archive'))
+        self.archive_after_days = archive_after_days
+        self.duplicate_policy = duplicate_policy
+        # Her kayıttan sonra dashboard'a küçük bir değişiklik olayı yayınlanır
+        self.events = events or event_bus
+        # Dış bildirimler (webhook) durum değişikliğiyle aynı yazımda postun outbox'ına eklenir
+        self.outbox = outbox or default_outbox
+        # Yazma formatı (STORE_FORMAT/STORE_COMPRESSION); okuma formatı dosyadan tanınır
+        self.serializer = serializer or StoreSerializer()
+        self._lock = threading.RLock()
+        # Bu instance'ın yazma sayacı; mtime çözünürlüğü kaba olan dosya sistemlerinde
+        # aynı saniyedeki iki yazımın aynı sürümü vermesini önler
+        self._writes = 0
+        # Parmak izi indeksi; posts.json değiştiğinde (mtime/boyut) yeniden kurulur
+        self._fingerprints = None
+        self._fingerprints_signature = None
+        # Tam metin arama indeksi; ilk aramada kurulur, kendi yazmalarımız doğrudan uygulanır
+        self._search = None
+        self._search_signature = None
         self._ensure_db_exists()
 
     def _ensure_db_exists(self):
@@ -23,95 +82,552 @@ class ContentManager:
             print(f"📄 '{self.db_path}' dosyası oluşturuldu.")
 
     def get_all_posts(self):
-        """Tüm postları listeler."""
+        """Tüm postları Post nesneleri olarak listeler."""
         try:
-            with open(self.db_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            with STORE_READ.time(), tracer.span('store.read'), open(self.db_path, 'rb') as f:
+                return [Post.from_dict(item) for item in load_records(f.read())]
+        except (json.JSONDecodeError, CorruptStoreError):
             print("⚠️ posts.json bozuk, sıfırlanıyor...")
             return []
 
-    def add_post(self, content, platform, schedule_time):
-        """Yeni bir postu 'pending' (beklemede) olarak ekler."""
+    def get_posts(self, start=None, end=None, platform=None):
+        """
+        Tarih aralığına (schedule_time) göre postları getirir.
+
+        Çalışma kümesi her zaman okunur; arşiv partition'ları yalnızca bir
+        tarih sınırı (başlangıç veya bitiş) verildiğinde ve aralık onlarla
+        kesiştiğinde açılır.
+        """
+        posts = [
+            p for p in self.get_all_posts()
+            if (platform is None or p.platform == platform)
+            and (start is None or (p.schedule_time is not None and p.schedule_time >= start))
+            and (end is None or (p.schedule_time is not None and p.schedule_time <= end))
+        ]
+        if start is not None or end is not None:
+            posts.extend(self.archive.iter_posts(start, end, platform))
+            posts.sort(key=lambda p: p.id)
+        return posts
+
+    def iter_posts(self, start=None, end=None, platform=None, include_archive=True):
+        """
+        Postları belleğe toplu yüklemeden tek tek döndürür (dışa aktarım için).
+
+        Önce aralıkla kesişen arşiv partition'ları, ardından çalışma kümesi
+        dosyası artımlı olarak okunur.
+        """
+        if include_archive:
+            yield from self.archive.iter_posts(start, end, platform)
+
+        with open(self.db_path, 'rb') as f:
+            for item in iter_records(f):
+                post = Post.from_dict(item)
+                if platform and post.platform != platform:
+                    continue
+                if start is not None and (post.schedule_time is None or post.schedule_time < start):
+                    continue
+                if end is not None and (post.schedule_time is None or post.schedule_time > end):
+                    continue
+                yield post
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.db_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def data_version(self):
+        """
+        Deponun ucuz sürüm belirteci (yalnızca stat; dosya okunmaz).
+        posts.json her yazıldığında değişir; başka süreçlerin yazmaları da
+        mtime/boyut üzerinden yakalanır.
+        """
+        signature = self._file_signature()
+        if signature is None:
+            return f"0-{self._writes}"
+        return f"{signature[0]:x}-{signature[1]:x}-{self._writes}"
+
+    def last_modified(self):
+        """posts.json'un son değişiklik zamanı (epoch saniyesi; yoksa None)."""
+        signature = self._file_signature()
+        return None if signature is None else signature[0] / 1e9
+
+    def _fingerprint_index(self, posts=None):
+        """
+        Güncel parmak izi indeksini döndürür. Dosya son kurulumdan beri
+        değişmediyse (başka bir süreç/instance yazmadıysa) mevcut indeks kullanılır.
+
+        Args:
+            posts (list): Zaten okunmuş postlar (verilirse dosya tekrar okunmaz)
+        """
+        signature = self._file_signature()
+        if self._fingerprints is None or signature != self._fingerprints_signature:
+            self._fingerprints = FingerprintIndex.build(posts if posts is not None else self.get_all_posts(),
+                                                        previous=self._fingerprints)
+            self._fingerprints_signature = signature
+        return self._fingerprints
+
+    def find_duplicates(self, content, platform, account=None, exclude=None):
+        """
+        Aynı platform/hesaptaki bekleyen veya yakın zamanda gönderilmiş postlar
+        arasında içeriğin tam/yakın kopyalarını bulur.
+
+        Returns:
+            list[DuplicateMatch]: Eşleşmeler (yoksa boş liste)
+        """
+        return self._fingerprint_index().find(content, platform, account, exclude=exclude)
+
+    def _search_state(self):
+        return self._file_signature(), self.archive.signature()
+
+    def _search_synced(self):
+        """Arama indeksi kurulmuş ve dosyalarla güncel mi? (yazmadan önce çağrılır)"""
+        return self._search is not None and self._search_signature == self._search_state()
+
+    def _search_written(self, synced, posts=(), archived=False):
+        """
+        Kendi yazdığımız değişiklikleri arama indeksine uygular. İndeks yazmadan
+        önce güncel değilse dokunulmaz; bir sonraki arama dosyalarla eşitler.
+        """
+        if not synced:
+            return
+        for post in posts:
+            self._search.add(post, archived=archived)
+        self._search_signature = self._search_state()
+
+    def _search_index(self):
+        """
+        Güncel arama indeksini döndürür. İlk çağrıda çalışma kümesi ve arşiv
+        okunur; başka bir yazıcı dosyaları değiştirdiyse yalnızca değişen kısım
+        (çalışma kümesi ve/veya arşiv) yeniden okunur ve içeriği değişen
+        postlar yeniden indekslenir.
+        """
+        state = self._search_state()
+        if self._search is not None and state == self._search_signature:
+            return self._search
+        index = self._search or SearchIndex()
+        previous = self._search_signature
+        if previous is None or state[1] != previous[1]:
+            self.archive.reload()
+            index.sync(self.archive.iter_posts(), archived=True)
+        if previous is None or state[0] != previous[0]:
+            index.sync(self.get_all_posts())
+        self._search = index
+        self._search_signature = state
+        return index
+
+    @_synchronized
+    def search(self, query, limit=20, platform=None, status=None, include_archive=True):
+        """
+        Post içeriğinde tam metin arama (arşiv dahil).
+
+        Args:
+            query (str): Aranan kelimeler (hepsi geçmeli; son kelime önek olabilir)
+            limit (int): En fazla sonuç sayısı
+            platform (str): Yalnızca bu platform (opsiyonel)
+            status (str): Yalnızca bu durum (opsiyonel)
+            include_archive (bool): Arşivlenmiş postlar da aransın mı
+
+        Returns:
+            list[dict]: BM25 puanına göre sıralı sonuçlar
+        """
+        return self._search_index().search(query, limit, platform, status, include_archive)
+
+    def _next_id(self, posts):
+        """Arşivlenmiş postları da hesaba katarak yeni post ID'si üretir."""
+        return max([self.archive.max_id] + [p.id for p in posts if p.id]) + 1
+
+    @_synchronized
+    def add_post(self, content, platform, schedule_time, media=None, series_id=None, on_duplicate=None,
+                 account=None, priority=PostPriority.NORMAL, expires_at=None):
+        """
+        Yeni bir postu 'pending' (beklemede) olarak ekler.
+        
+        Args:
+            media (list): Eklenecek medya dosyalarının yolları (opsiyonel)
+            series_id (int): Post tekrarlayan bir seriden üretildiyse serinin ID'si
+            on_duplicate (str): 'warn', 'reject' veya 'off' (verilmezse duplicate_policy)
+            account (str): Gönderilecek hesap (opsiyonel, varsayılan hesap)
+            priority (int): Gönderim önceliği (PostPriority; kota yetmediğinde yüksek olan önce gider)
+            expires_at (str): Bu zamana kadar gönderilemezse post 'expired' olur (opsiyonel)
+        
+        Raises:
+            ValueError: Planlanan zaman çözümlenemezse veya son geçerlilik zamanı
+                planlanan zamandan önceyse
+            DuplicateContentError: Politika 'reject' ise ve içerik bekleyen/yakın zamanda
+                gönderilmiş bir postla aynı veya neredeyse aynıysa
+        """
+        policy = on_duplicate or self.duplicate_policy
+        account = normalize_account(account)
+        synced = self._search_synced()
+        scheduled = parse_datetime(schedule_time)
+        if scheduled is None:
+            # None kaydedilirse post hiçbir zaman gönderilmez
+            raise ValueError(f"Geçersiz planlanan zaman: {schedule_time!r}")
+        expires_at = parse_datetime(expires_at) if expires_at else None
+        if expires_at is not None and expires_at <= scheduled:
+            raise ValueError("Son geçerlilik zamanı planlanan zamandan sonra olmalı")
         posts = self.get_all_posts()
         
-        new_post = {
-            "id": len(posts) + 1,
-            "content": content,
-            "platform": platform,  # 'Twitter' veya 'LinkedIn'
-            "schedule_time": schedule_time,  # 'YYYY-MM-DD HH:MM' formatında
-            "status": "pending",
-            "api_post_id": None,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "metrics": {
-                "likes": 0,
-                "shares": 0,  # Twitter için retweets, LinkedIn için shares
-                "replies": 0,
-                "impressions": 0
-            }
-        }
+        index = None
+        if policy != 'off':
+            index = self._fingerprint_index(posts)
+            matches = index.find(content, platform, account)
+            if matches and policy == 'reject':
+                raise DuplicateContentError(matches)
+            for match in matches:
+                print(f"⚠️ {platform}: {match}")
+        
+        new_post = Post(
+            id=self._next_id(posts),
+            content=content,
+            platform=platform,  # 'Twitter' veya 'LinkedIn'
+            schedule_time=scheduled,
+            status=PostStatus.PENDING,
+            created_at=datetime.now().replace(microsecond=0),
+            media=media,
+            series_id=series_id,
+            account=None if account == DEFAULT_ACCOUNT else account,
+            priority=priority,
+            expires_at=expires_at
+        )
         
         posts.append(new_post)
         self._save_all(posts)
-        print(f"✅ Post başarıyla kaydedildi! (ID: {new_post['id']})")
+        if index is not None:
+            # İndeksi yeniden kurmak yerine yeni postu ekle
+            index.add(new_post)
+            self._fingerprints_signature = self._file_signature()
+        self._search_written(synced, [new_post])
+        self.events.publish(POST_CREATED, new_post.to_dict())
+        print(f"✅ Post başarıyla kaydedildi! (ID: {new_post.id})")
         return new_post
 
     def get_pending_posts(self):
         """Zamanı gelmiş ve gönderilmeyi bekleyen postları getirir."""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        now = datetime.now()
         posts = self.get_all_posts()
-        pending = [p for p in posts if p['status'] == 'pending' and p['schedule_time'] <= now]
+        pending = [p for p in posts if p.is_due(now)]
         
         if pending:
             print(f"📋 {len(pending)} adet gönderilmeyi bekleyen post bulundu.")
         
         return pending
 
+    def get_upcoming_posts(self, until):
+        """
+        Planlanan zamanı 'until' anına kadar olan pending postları getirir
+        (zamanı gelmişler dahil). Zamanlayıcının ön hazırlık taraması için.
+        """
+        return [
+            p for p in self.get_all_posts()
+            if p.status == PostStatus.PENDING and p.schedule_time is not None and p.schedule_time <= until
+        ]
+
+    @_synchronized
+    def update_series_posts(self, series_id, content=None, platform=None, status=None):
+        """
+        Bir seriden üretilmiş ve henüz gönderilmemiş (pending) postları günceller.
+        Seri düzenlendiğinde veya iptal edildiğinde (status='cancelled') kullanılır.
+
+        Returns:
+            int: Güncellenen post sayısı
+        """
+        posts = self.get_all_posts()
+        updated = []
+
+        for post in posts:
+            if post.series_id != series_id or post.status != PostStatus.PENDING:
+                continue
+            if content is not None:
+                post.content = content
+            if platform is not None:
+                post.platform = intern_value(platform)
+            if status is not None:
+                post.status = intern_value(status)
+            post.last_updated = datetime.now().replace(microsecond=0)
+            updated.append(post)
+
+        if updated:
+            synced = self._search_synced()
+            self._save_all(posts)
+            self._search_written(synced, updated)
+            for post in updated:
+                self.events.publish(POST_UPDATED, {"id": post.id, "status": post.status,
+                                                   "content": post.content, "platform": post.platform})
+            updated = len(updated)
+            print(f"🔁 Seri #{series_id}: {updated} bekleyen post güncellendi.")
+        return updated
+
+    @_synchronized
     def update_metrics(self, post_id, new_metrics):
         """Belirli bir postun beğeni ve paylaşım sayılarını günceller."""
         posts = self.get_all_posts()
-        updated = False
+        updated = None
         
         for post in posts:
-            if post['id'] == post_id:
+            if post.id == post_id:
                 # Mevcut metrikleri koru, yeni gelenleri ekle/güncelle
-                post['metrics'].update(new_metrics)
-                post['last_updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                updated = True
+                before = post.metrics.to_dict()
+                post.metrics.update(new_metrics)
+                post.last_updated = datetime.now().replace(microsecond=0)
+                notify = self.outbox.record_engagement(post, before)
+                updated = post
                 print(f"📊 Post #{post_id} metrikleri güncellendi: {new_metrics}")
                 break
         
-        if updated:
+        if updated is not None:
+            synced = self._search_synced()
             self._save_all(posts)
+            self._search_written(synced)
+            self.events.publish(POST_METRICS, {"id": post_id, "metrics": updated.metrics.to_dict()})
+            if notify:
+                self.outbox.notify()
         else:
             print(f"⚠️ Post #{post_id} bulunamadı!")
 
-    def update_post_after_send(self, post_id, api_id, status="sent"):
-        """Post gönderildikten sonra durumunu ve API ID'sini günceller."""
+    @_synchronized
+    def update_post_after_send(self, post_id, api_id, status="sent", error=None):
+        """
+        Post gönderildikten sonra durumunu ve API ID'sini günceller.
+
+        Gönderim başarısızsa ``error`` (publisher'ın son hatası) postun
+        dead-letter kaydına deneme olarak eklenir.
+        """
         posts = self.get_all_posts()
-        updated = False
+        updated = None
         
         for post in posts:
-            if post['id'] == post_id:
-                post['status'] = status
-                post['api_post_id'] = api_id
-                post['sent_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                updated = True
+            if post.id == post_id:
+                post.status = intern_value(status)
+                post.api_post_id = api_id
+                post.sent_at = datetime.now().replace(microsecond=0)
+                if post.status == PostStatus.FAILED:
+                    post.failure = record_failure(post.failure, error, post.sent_at)
+                    notify = self.outbox.record_failed(post)
+                else:
+                    notify = post.status == PostStatus.SENT and self.outbox.record_sent(post)
+                updated = post
                 print(f"✅ Post #{post_id} durumu güncellendi: {status} (API ID: {api_id})")
                 break
         
-        if updated:
+        if updated is not None:
+            synced = self._search_synced()
             self._save_all(posts)
+            self._search_written(synced, [updated])
+            self.events.publish(POST_UPDATED, {"id": post_id, "status": updated.status, "api_post_id": api_id,
+                                               "sent_at": format_datetime(updated.sent_at)})
+            if notify:
+                self.outbox.notify()
         else:
             print(f"⚠️ Post #{post_id} bulunamadı!")
 
+    @_synchronized
+    def expire_posts(self, post_ids):
+        """
+        Son geçerlilik zamanı geçmiş pending postları tek yazımla 'expired' yapar.
+
+        Returns:
+            list[int]: Durumu değiştirilen post ID'leri
+        """
+        post_ids = set(post_ids)
+        posts = self.get_all_posts()
+        now = datetime.now()
+        expired = []
+
+        for post in posts:
+            if post.id in post_ids and post.is_expired(now):
+                post.status = PostStatus.EXPIRED
+                post.last_updated = now.replace(microsecond=0)
+                expired.append(post)
+
+        expired_ids = [post.id for post in expired]
+        if expired:
+            synced = self._search_synced()
+            self._save_all(posts)
+            self._search_written(synced, expired)
+            for post_id in expired_ids:
+                self.events.publish(POST_UPDATED, {"id": post_id, "status": PostStatus.EXPIRED})
+            print(f"⌛ {len(expired)} post son geçerlilik zamanı geçtiği için gönderilmeyecek: {expired_ids}")
+        return expired_ids
+
+    @_synchronized
+    def fail_posts(self, post_ids, error):
+        """
+        Hâlâ pending olan postları verilen hatayla tek yazımla 'failed' yapar
+        (ör. yarıda kalan gönderim sahiplenmeleri; dead-letter kuyruğuna düşerler).
+
+        Returns:
+            list[int]: Durumu değiştirilen post ID'leri
+        """
+        post_ids = set(post_ids)
+        posts = self.get_all_posts()
+        now = datetime.now().replace(microsecond=0)
+        failed = []
+
+        for post in posts:
+            if post.id in post_ids and post.status == PostStatus.PENDING:
+                post.status = PostStatus.FAILED
+                post.sent_at = now
+                post.failure = record_failure(post.failure, error, now)
+                self.outbox.record_failed(post)
+                failed.append(post)
+
+        failed_ids = [post.id for post in failed]
+        if failed:
+            synced = self._search_synced()
+            self._save_all(posts)
+            self._search_written(synced, failed)
+            for post_id in failed_ids:
+                self.events.publish(POST_UPDATED, {"id": post_id, "status": PostStatus.FAILED,
+                                                   "sent_at": format_datetime(now)})
+            print(f"📮 {len(failed)} post dead-letter kuyruğuna alındı: {failed_ids}")
+            self.outbox.notify()
+        return failed_ids
+
+    def get_outbox(self):
+        """
+        Teslim bekleyen outbox olayları.
+
+        Returns:
+            list[tuple]: (post_id, [olay, ...]) - olaylar kayıt sırasıyla
+        """
+        return [(post.id, list(post.outbox)) for post in self.get_all_posts() if post.outbox]
+
+    @_synchronized
+    def ack_outbox(self, delivered):
+        """
+        Teslim edilen outbox olaylarını tek yazımla postlardan siler.
+
+        Args:
+            delivered (dict): {post_id: [olay id, ...]}
+
+        Returns:
+            int: Silinen olay sayısı
+        """
+        posts = self.get_all_posts()
+        removed = 0
+        for post in posts:
+            ids = delivered.get(post.id)
+            if ids and post.outbox:
+                ids = set(ids)
+                remaining = [event for event in post.outbox if event.get("id") not in ids]
+                removed += len(post.outbox) - len(remaining)
+                post.outbox = remaining
+
+        if removed:
+            synced = self._search_synced()
+            self._save_all(posts)
+            self._search_written(synced)
+        return removed
+
+    @_synchronized
+    def redrive_posts(self, post_ids):
+        """
+        Failed postları tek yazımla yeniden 'pending' yapar (dead-letter re-drive).
+
+        Hata geçmişi korunur, yalnızca ``redrives`` sayacı artar; postlar bir
+        sonraki zamanlayıcı turunda normal gönderim yolundan geçer.
+
+        Returns:
+            list[int]: Yeniden kuyruğa alınan post ID'leri
+        """
+        post_ids = set(post_ids)
+        posts = self.get_all_posts()
+        now = datetime.now().replace(microsecond=0)
+        requeued = []
+
+        for post in posts:
+            if post.id in post_ids and post.status == PostStatus.FAILED:
+                post.status = PostStatus.PENDING
+                post.sent_at = None
+                post.api_post_id = None
+                post.last_updated = now
+                post.failure = dict(post.failure or {})
+                post.failure["redrives"] = post.failure.get("redrives", 0) + 1
+                requeued.append(post)
+
+        requeued_ids = [post.id for post in requeued]
+        if requeued:
+            synced = self._search_synced()
+            self._save_all(posts)
+            self._search_written(synced, requeued)
+            for post_id in requeued_ids:
+                self.events.publish(POST_UPDATED, {"id": post_id, "status": PostStatus.PENDING})
+            print(f"🔁 {len(requeued)} başarısız post yeniden kuyruğa alındı: {requeued_ids}")
+        return requeued_ids
+
+    @_synchronized
+    def archive_old_posts(self, max_age_days=None):
+        """
+        Belirtilen günden eski sent/failed/cancelled/expired postları aylık arşiv partition'larına
+        taşır ve çalışma kümesinden çıkarır.
+
+        Returns:
+            int: Arşivlenen post sayısı
+        """
+        max_age_days = self.archive_after_days if max_age_days is None else max_age_days
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        posts = self.get_all_posts()
+
+        finished = (PostStatus.SENT, PostStatus.FAILED, PostStatus.CANCELLED, PostStatus.EXPIRED)
+        to_archive, remaining = [], []
+        for post in posts:
+            finished_at = post.sent_at or post.schedule_time
+            # Teslim bekleyen outbox olayı olan post, olaylar gidene kadar çalışma kümesinde kalır
+            if post.status in finished and finished_at is not None and finished_at < cutoff and not post.outbox:
+                to_archive.append(post)
+            else:
+                remaining.append(post)
+
+        if not to_archive:
+            return 0
+
+        # Önce arşive yaz, sonra çalışma kümesini küçült: yarıda kesilirse
+        # post kaybolmaz, en kötü ihtimalle arşive iki kez yazılır
+        synced = self._search_synced()
+        self.archive.append(to_archive)
+        self._save_all(remaining)
+        self._search_written(synced, to_archive, archived=True)
+        self.events.publish(POSTS_REMOVED, {"ids": [post.id for post in to_archive]})
+        print(f"🗄️ {len(to_archive)} post arşive taşındı ({max_age_days} günden eski).")
+        return len(to_archive)
+
+    def wait_idle(self, timeout=None):
+        """
+        Süren yazma işleminin bitmesini bekler (kapanışta drain için).
+
+        Returns:
+            bool: Süre dolmadan kilit boşaldı mı?
+        """
+        acquired = self._lock.acquire(timeout=-1 if timeout is None else max(0.0, timeout))
+        if acquired:
+            self._lock.release()
+        return acquired
+
     def _save_all(self, posts):
-        """Verileri JSON dosyasına yazar."""
+        """
+        Post nesnelerini dict'e çevirip depo formatında (bkz. src/serializer.py) yazar.
+
+        Önce yanına benzersiz adlı geçici dosyaya yazılır, sonra ``os.replace``
+        ile yer değiştirilir (bkz. src/atomic_file.py): yazım yarıda kesilirse
+        (kill, elektrik) posts.json eski haliyle kalır, yarım dosya oluşmaz; aynı
+        dosyaya yazan başka bir süreçle geçici dosyalar çakışmaz.
+
+        Raises:
+            OSError: Yazılamazsa (çağıran işlem başarılı sayılmamalı; olay yayınlanmaz)
+        """
         try:
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(posts, f, indent=4, ensure_ascii=False)
-        except Exception as e:
+            with STORE_WRITE.time(), tracer.span('store.write') as span:
+                atomic_write(self.db_path, self.serializer.dumps([post.to_dict() for post in posts]))
+                self._writes += 1
+                size = os.path.getsize(self.db_path)
+                span.set('bytes', size)
+            STORE_BYTES_WRITTEN.inc(size)
+        except BaseException as e:
             print(f"❌ Kaydetme hatası: {e}")
+            raise
 
 
 # Test
@@ -134,7 +650,7 @@ if __name__ == "__main__":
     print("\n📋 Test 2: Tüm postlar:")
     all_posts = cm.get_all_posts()
     for post in all_posts:
-        print(f"  - ID: {post['id']}, Platform: {post['platform']}, Durum: {post['status']}")
+        print(f"  - ID: {post.id}, Platform: {post.platform}, Durum: {post.status}")
     
     # Test 3: Pending postları kontrol et
     print("\n⏰ Test 3: Bekleyen postlar:")
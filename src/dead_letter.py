@@ -0,0 +1,143 @@
+"""
+dead_letter.py
+==============
+Başarısız gönderimler için dead-letter kuyruğu.
+
+Gönderimi başarısız olan post ``failed`` durumuna geçerken hatası da postun
+``failure`` alanına yazılır (posts.json'daki kayıtla aynı yazımda):
+
+    "failure": {
+        "error_class": "Forbidden",      # Son denemenin hata sınıfı
+        "status_code": 403,               # Son HTTP yanıt kodu (yoksa null)
+        "message": "...",
+        "transient": false,
+        "redrives": 1,                    # Kaç kez yeniden kuyruğa alındı
+        "attempts": [                     # Son FAILURE_HISTORY deneme (eskiden yeniye)
+            {"at": "2026-01-22 10:00:05", "error_class": "...", "status_code": 403, "message": "..."}
+        ]
+    }
+
+Kuyruk ayrı bir dosya değil, ``failed`` postlar üzerindeki bir görünümdür:
+hatalar sınıf/kod bazında gruplanır ve seçilen küme tek yazımla yeniden
+``pending`` yapılır. Yeniden kuyruğa alınan postlar normal gönderim yolundan
+(öncelik sırası, hesap kotası, devre kesici) geçer.
+"""
+
+import os
+from datetime import datetime
+
+from src.accounts import normalize_account
+from src.models import DATETIME_FORMAT, PostStatus
+
+# Post başına saklanan deneme geçmişi uzunluğu
+FAILURE_HISTORY = int(os.getenv('FAILURE_HISTORY', '10'))
+
+UNKNOWN_ERROR = 'Unknown'
+
+
+def record_failure(failure, error, now=None):
+    """
+    Postun mevcut hata kaydına yeni bir denemeyi ekler.
+
+    Args:
+        failure (dict): Postun önceki ``failure`` alanı (yoksa None)
+        error (dict): Publisher'ın son hatası (error_class, status_code, message, transient)
+
+    Returns:
+        dict: Güncellenmiş hata kaydı
+    """
+    error = error or {}
+    attempt = {
+        "at": (now or datetime.now()).strftime(DATETIME_FORMAT),
+        "error_class": error.get('error_class') or UNKNOWN_ERROR,
+        "status_code": error.get('status_code'),
+        "message": error.get('message')
+    }
+    failure = dict(failure or {})
+    failure.update(attempt)
+    failure.pop('at', None)
+    failure["transient"] = bool(error.get('transient'))
+    failure["attempts"] = ((failure.get('attempts') or []) + [attempt])[-max(1, FAILURE_HISTORY):]
+    failure.setdefault("redrives", 0)
+    return failure
+
+
+class DeadLetterQueue:
+    """ContentManager'daki failed postlar üzerinde inceleme ve toplu yeniden gönderim."""
+
+    def __init__(self, content_manager):
+        self.cm = content_manager
+
+    @staticmethod
+    def _matches(post, platform=None, account=None, error_class=None, status_code=None):
+        failure = post.failure or {}
+        return (
+            post.status == PostStatus.FAILED
+            and (not platform or post.platform == platform)
+            and (not account or normalize_account(post.account) == normalize_account(account))
+            and (not error_class or (failure.get('error_class') or UNKNOWN_ERROR) == error_class)
+            and (status_code is None or failure.get('status_code') == status_code)
+        )
+
+    def entries(self, posts=None, **filters):
+        """
+        Filtreye uyan failed postlar (en son başarısız olan önce).
+
+        Args:
+            posts (list): Zaten okunmuş postlar (verilmezse depodan okunur)
+            **filters: platform, account, error_class, status_code
+        """
+        posts = self.cm.get_all_posts() if posts is None else posts
+        failed = [post for post in posts if self._matches(post, **filters)]
+        failed.sort(key=lambda post: (post.sent_at or post.schedule_time or datetime.min, post.id), reverse=True)
+        return failed
+
+    def grouped(self, posts=None, **filters):
+        """
+        Failed postları hata sınıfı ve HTTP koduna göre gruplar.
+
+        Returns:
+            list[dict]: En kalabalık grup önce; her grupta örnek mesaj ve postlar
+        """
+        groups = {}
+        for post in self.entries(posts, **filters):
+            failure = post.failure or {}
+            key = (failure.get('error_class') or UNKNOWN_ERROR, failure.get('status_code'))
+            group = groups.get(key)
+            if group is None:
+                groups[key] = group = {
+                    "error_class": key[0],
+                    "status_code": key[1],
+                    "message": failure.get('message'),
+                    "transient": failure.get('transient', False),
+                    "count": 0,
+                    "posts": []
+                }
+            group["count"] += 1
+            group["posts"].append({
+                "id": post.id,
+                "platform": post.platform,
+                "account": normalize_account(post.account),
+                "content": post.content,
+                "schedule_time": post.schedule_time_text,
+                "failed_at": post.sent_at.strftime(DATETIME_FORMAT) if post.sent_at else None,
+                "redrives": failure.get('redrives', 0),
+                "attempts": failure.get('attempts', [])
+            })
+        return sorted(groups.values(), key=lambda group: (-group["count"], group["error_class"]))
+
+    def redrive(self, post_ids=None, **filters):
+        """
+        Filtreye (ve verildiyse ID listesine) uyan failed postları tek yazımla
+        yeniden kuyruğa alır; gönderim zamanlayıcının normal yolundan yapılır.
+
+        Returns:
+            list[int]: Yeniden kuyruğa alınan post ID'leri
+        """
+        selected = [post.id for post in self.entries(**filters)]
+        if post_ids is not None:
+            wanted = set(post_ids)
+            selected = [post_id for post_id in selected if post_id in wanted]
+        if not selected:
+            return []
+        return self.cm.redrive_posts(selected)
@@ -1,39 +1,246 @@
+import atexit
+import copy
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import shutil
 from datetime import datetime
 import time
 from functools import wraps
 
+from src.tracing import tracer
+
+# Log ayarları (.env ile değiştirilebilir)
+LOG_FILE = os.getenv('LOG_FILE', os.path.join('logs', 'app.log'))
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(20 * 1024 * 1024)))
+LOG_ROTATE_SECONDS = int(os.getenv('LOG_ROTATE_SECONDS', '86400'))  # Günlük
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '14'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+# Gürültülü logger'lar için örnekleme: "scheduler=0.1,src.post_publisher=0.5"
+LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', '')
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# JSON kaydına alan olarak eklenen extra anahtarları
+STRUCTURED_FIELDS = ('post_id', 'platform', 'attempt', 'trace_id')
+
+
+class JsonFormatter(logging.Formatter):
+    """Her log kaydını tek satırlık JSON nesnesine çevirir."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage()
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    WARNING altındaki kayıtları logger adına göre örnekler.
+
+    Oranlar logger adı önekiyle eşleşir (en uzun önek kazanır); WARNING ve
+    üzeri kayıtlar hiçbir zaman düşürülmez.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._cache = {}
+
+    @staticmethod
+    def parse(spec):
+        """'ad=oran,ad=oran' biçimindeki ayarı sözlüğe çevirir."""
+        rates = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            name, _, rate = item.partition('=')
+            try:
+                rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+            except ValueError:
+                continue
+        return rates
+
+    def _rate_for(self, name):
+        rate = self._cache.get(name)
+        if rate is None:
+            rate, best = 1.0, -1
+            for prefix, value in self.rates.items():
+                if (name == prefix or name.startswith(prefix + '.')) and len(prefix) > best:
+                    rate, best = value, len(prefix)
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _ContextFilter(logging.Filter):
+    """Kaydı oluşturan thread'deki aktif trace kimliğini kayda ekler."""
+
+    def filter(self, record):
+        if getattr(record, 'trace_id', None) is None:
+            record.trace_id = tracer.current_trace_id()
+        return True
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Boyut veya süre sınırı aşıldığında dosyayı döndürür ve eski dosyayı gzip'ler.
+    Yedekler app.log.1.gz, app.log.2.gz ... olarak tutulur.
+    """
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, rotate_seconds=LOG_ROTATE_SECONDS,
+                 backup_count=LOG_BACKUP_COUNT):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.rotate_seconds = rotate_seconds
+        self.rollover_at = self._compute_rollover()
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress
+
+    def _compute_rollover(self):
+        if not self.rotate_seconds:
+            return None
+        try:
+            started = os.path.getmtime(self.baseFilename) if os.path.getsize(self.baseFilename) else time.time()
+        except OSError:
+            started = time.time()
+        return started + self.rotate_seconds
+
+    @staticmethod
+    def _compress(source, dest):
+        with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = time.time() + self.rotate_seconds if self.rotate_seconds else None
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa çağıranı bekletmek yerine kaydı düşürür."""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Mesaj ve traceback çağıran thread'de metne çevrilir; extra alanlar korunur
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+_listener = None
+
+
+def configure_logging(log_file=LOG_FILE, level=LOG_LEVEL, sample_rates=LOG_SAMPLE_RATES, console=True):
+    """
+    Kök logger'ı kuyruk tabanlı hale getirir (birden fazla çağrı güvenlidir).
+
+    Uygulama thread'leri kaydı yalnızca kuyruğa bırakır; dosyaya (JSON, döndürülen,
+    gzip'li) ve konsola (okunabilir format) yazma işini arka plandaki
+    QueueListener thread'i yapar.
+
+    Returns:
+        logging.handlers.QueueListener
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    file_handler = CompressingRotatingFileHandler(log_file)
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = _DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(SamplingFilter.parse(sample_rates) if isinstance(sample_rates, str)
+                                           else sample_rates))
+    queue_handler.addFilter(_ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Kuyrukta bekleyen kayıtları yazıp dinleyiciyi durdurur."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 class ErrorHandler:
     def __init__(self):
-        # Log dosyası ayarla
-        import os
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
-        
-        log_file = f"logs/scheduler_{datetime.now().strftime('%Y%m%d')}.log"
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        # Handler kurulumu configure_logging() ile uygulama girişinde yapılır
         self.logger = logging.getLogger(__name__)
-    
+
     def log_success(self, platform, post_id, content):
         """Başarılı post kaydı"""
-        self.logger.info(f"✅ SUCCESS | {platform.upper()} | Post #{post_id} | {content[:50]}")
-    
+        self.logger.info("✅ SUCCESS | %s | Post #%s | %.50s", platform.upper(), post_id, content,
+                         extra={"post_id": post_id, "platform": platform})
+
     def log_error(self, platform, post_id, error, content):
         """Hata kaydı"""
-        self.logger.error(f"❌ ERROR | {platform.upper()} | Post #{post_id} | {error} | {content[:50]}")
-    
+        self.logger.error("❌ ERROR | %s | Post #%s | %s | %.50s", platform.upper(), post_id, error, content,
+                          extra={"post_id": post_id, "platform": platform})
+
     def log_retry(self, platform, post_id, attempt):
         """Tekrar deneme kaydı"""
-        self.logger.warning(f"🔄 RETRY | {platform.upper()} | Post #{post_id} | Attempt {attempt}/3")
-    
+        self.logger.warning("🔄 RETRY | %s | Post #%s | Attempt %s/3", platform.upper(), post_id, attempt,
+                            extra={"post_id": post_id, "platform": platform, "attempt": attempt})
+
     def retry_on_failure(self, max_attempts=3, delay=30):
         """Decorator: Hata durumunda tekrar dene"""
         def decorator(func):
@@ -44,10 +251,12 @@ class ErrorHandler:
                         return func(*args, **kwargs)
                     except Exception as e:
                         if attempt < max_attempts:
-                            self.logger.warning(f"🔄 Attempt {attempt} failed: {e}. Retrying in {delay}s...")
+                            self.logger.warning(f"🔄 Attempt {attempt} failed: {e}. Retrying in {delay}s...",
+                                                extra={"attempt": attempt})
                             time.sleep(delay)
                         else:
-                            self.logger.error(f"❌ All {max_attempts} attempts failed: {e}")
+                            self.logger.error(f"❌ All {max_attempts} attempts failed: {e}",
+                                              extra={"attempt": attempt})
                             raise
                 return None
             return wrapper
@@ -0,0 +1,194 @@
+"""
+events.py
+=========
+Dashboard'a canlı değişiklik bildirimi (Server-Sent Events) için olay yolu.
+
+ContentManager her kayıttan sonra küçük bir olay yayınlar (yeni post, durum
+değişikliği, metrik güncellemesi). ``/events`` uç noktasına bağlı her tarayıcı
+bir abonelik açar; sayfa bu olaylarla ilgili satırı yerinde günceller, tüm
+sayfa yeniden çizilmez ve posts.json yeniden okunmaz.
+
+Olaylar zamanlayıcı thread'lerinden yayınlanır, abonelikler ise uvicorn'un
+event loop'unda okunur; aktarım ``call_soon_threadsafe`` ile yapılır. Son
+``EVENTS_HISTORY`` olay saklanır, böylece bağlantısı kopan tarayıcı
+``Last-Event-ID`` ile kaldığı yerden devam eder. Geride kalan (kuyruğu dolan)
+veya geçmişte tutulmayan bir noktadan dönen aboneye ``reset`` gönderilir ve
+sayfa bir kez yeniden yüklenir.
+
+Sunucu kapanırken ``close()`` tüm abonelikleri sonlandırır; uvicorn süren
+yanıtlar bitmeden kapanmadığından açık bir dashboard sekmesi kapanışı bekletmez.
+
+Olay yolu süreç içidir: dashboard ile zamanlayıcı aynı süreçte çalıştığında
+(``python_script.py``) tüm değişiklikler anında görünür.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from collections import deque
+
+from src.telemetry import registry
+
+# Yeniden bağlanan tarayıcılar için saklanan son olay sayısı
+EVENTS_HISTORY = int(os.getenv('EVENTS_HISTORY', '500'))
+# Abone başına okunmayı bekleyebilecek olay sayısı (aşılırsa 'reset')
+EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', '256'))
+# Olay yokken bağlantıyı canlı tutan yorum satırı aralığı (saniye; proxy zaman aşımları için)
+EVENTS_HEARTBEAT = float(os.getenv('EVENTS_HEARTBEAT', '15'))
+
+POST_CREATED = 'post.created'
+POST_UPDATED = 'post.updated'
+POST_METRICS = 'post.metrics'
+POSTS_REMOVED = 'posts.removed'
+RESET = 'reset'
+
+EVENTS_PUBLISHED = registry.counter(
+    'autoposting_events_published_total',
+    'Dashboard için yayınlanan canlı olaylar',
+    ('type',)
+)
+EVENT_SUBSCRIBERS = registry.gauge(
+    'autoposting_event_subscribers',
+    'Açık /events (SSE) bağlantısı sayısı'
+)
+
+
+class Event:
+    """Tek bir olay: artan ID, tür ve JSON'a çevrilebilir veri."""
+
+    __slots__ = ('id', 'type', 'data')
+
+    def __init__(self, id, type, data):
+        self.id = id
+        self.type = type
+        self.data = data
+
+    def encode(self):
+        """SSE tel formatı (id/event/data satırları)."""
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """Bir SSE bağlantısının olay kuyruğu (event loop içinde okunur)."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def push(self, event):
+        """Event loop thread'inde çalışır; kuyruk doluysa abone 'reset' alır."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(Event(event.id, RESET, {}))
+
+    def close(self):
+        """Event loop thread'inde çalışır; bekleyen get() hemen None ile döner."""
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self, timeout):
+        """Sıradaki olayı bekler; süre dolarsa veya abonelik kapandıysa None."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Thread'lerden yayınlanan olayları event loop'taki abonelere dağıtır."""
+
+    def __init__(self, history=EVENTS_HISTORY, queue_size=EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._ids = itertools.count(1)
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.closed = False
+
+    @property
+    def last_id(self):
+        """Son yayınlanan olayın ID'si (sayfa bu noktadan itibaren abone olur)."""
+        with self._lock:
+            return self._history[-1].id if self._history else 0
+
+    def publish(self, type, data):
+        """Olayı geçmişe ekler ve tüm abonelere iletir (abone yoksa yalnızca geçmiş)."""
+        with self._lock:
+            event = Event(next(self._ids), type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        EVENTS_PUBLISHED.labels(type).inc()
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # Loop kapanmış (sunucu durduruluyor); abonelik temizlenir
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """
+        Çalışan event loop içinde yeni abonelik açar.
+
+        Args:
+            last_event_id (str): Tarayıcının aldığı son olay ID'si (Last-Event-ID);
+                sonraki olaylar geçmişten tekrar gönderilir
+
+        Returns:
+            Subscription
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        if self.closed:
+            # Kapanış başladıktan sonra gelen bağlantı hemen sonlanır
+            subscription.close()
+            return subscription
+        with self._lock:
+            if last_event_id:
+                try:
+                    last_id = int(last_event_id)
+                except ValueError:
+                    last_id = 0
+                newest = self._history[-1].id if self._history else 0
+                oldest = self._history[0].id if self._history else 1
+                if last_id > newest or last_id + 1 < oldest:
+                    # Aradaki olaylar artık tutulmuyor veya ID önceki sunucu sürecine ait
+                    missed = [Event(last_id, RESET, {})]
+                else:
+                    missed = [event for event in self._history if event.id > last_id]
+                for event in missed:
+                    subscription.push(event)
+            self._subscribers.add(subscription)
+        EVENT_SUBSCRIBERS.set(len(self._subscribers))
+        return subscription
+
+    def close(self):
+        """
+        Sunucu kapanırken tüm SSE akışlarını sonlandırır (sonraki abonelikler de
+        hemen kapanır). Sinyal işleyicisinden çağrılabilir; kilit almaz.
+        """
+        self.closed = True
+        for subscription in list(self._subscribers):
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.close)
+            except RuntimeError:
+                pass
+
+    def unsubscribe(self, subscription):
+        """Bağlantı kapandığında aboneliği kaldırır."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+            count = len(self._subscribers)
+        EVENT_SUBSCRIBERS.set(count)
+
+
+# Global olay yolu
+event_bus = EventBus()
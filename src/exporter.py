@@ -0,0 +1,87 @@
+"""
+exporter.py
+===========
+Post ve metrikleri CSV / JSONL olarak akış halinde dışa aktarır.
+
+Üreteçler postları tek tek tüketir ve çıktıyı küçük parçalar halinde
+döndürür; bellek kullanımı geçmişin büyüklüğünden bağımsızdır.
+"""
+
+import csv
+import io
+import json
+
+from src.models import DATETIME_FORMAT, SCHEDULE_FORMAT, format_datetime
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+CSV_COLUMNS = [
+    'id', 'platform', 'status', 'schedule_time', 'created_at', 'sent_at',
+    'api_post_id', 'likes', 'shares', 'replies', 'impressions', 'content'
+]
+
+# Bu boyuta ulaşan tampon istemciye gönderilir
+FLUSH_BYTES = 32 * 1024
+
+
+def _csv_row(post):
+    metrics = post.metrics
+    return [
+        post.id,
+        post.platform,
+        post.status,
+        format_datetime(post.schedule_time, SCHEDULE_FORMAT),
+        format_datetime(post.created_at, DATETIME_FORMAT),
+        format_datetime(post.sent_at, DATETIME_FORMAT),
+        post.api_post_id,
+        metrics.likes,
+        metrics.shares,
+        metrics.replies,
+        metrics.impressions,
+        post.content
+    ]
+
+
+def iter_csv(posts):
+    """Postları CSV parçaları olarak döndürür; başlık satırı hemen gönderilir."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for post in posts:
+        writer.writerow(_csv_row(post))
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(posts):
+    """Postları satır başına bir JSON kaydı olacak şekilde döndürür."""
+    chunk = []
+    size = 0
+    for post in posts:
+        line = json.dumps(post.to_dict(), ensure_ascii=False) + '\n'
+        chunk.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_export(posts, export_format):
+    """Formata göre uygun üreteci döndürür."""
+    if export_format == 'jsonl':
+        return iter_jsonl(posts)
+    return iter_csv(posts)
@@ -0,0 +1,249 @@
+"""
+fingerprint.py
+==============
+Tekrarlanan (duplicate) ve neredeyse aynı içerik tespiti.
+
+Twitter aynı metni ikinci kez 403 ile reddeder; bunu gönderim anında değil,
+post planlanırken yakalamak için her içerik için iki parmak izi tutulur:
+
+- Tam özet: büyük/küçük harf ve boşluk farkları normalize edilmiş metnin SHA-1'i
+- SimHash: bağlantıları atılmış, aksanları sadeleştirilmiş metnin kelime ve
+  kelime ikililerinden üretilen 64 bitlik imza; Hamming mesafesi küçük olan
+  metinler neredeyse aynıdır
+
+SimHash, ``max_distance + 1`` banda bölünerek indekslenir. Mesafesi en fazla
+``max_distance`` olan iki imzanın en az bir bandı birebir aynı olacağından
+(güvercin yuvası), aday aramak için geçmişin tamamı değil yalnızca aynı bantlı
+birkaç post incelenir.
+
+İmzalar yalnızca bellekte tutulur; özellik özeti için Python'un (süreç başına
+tohumlanan) ``hash()`` fonksiyonu kullanılır.
+"""
+
+import hashlib
+import os
+import re
+import unicodedata
+from datetime import datetime, timedelta
+
+from src.accounts import normalize_account
+from src.models import PostStatus
+
+# Bu kadar günden yeni gönderilmiş postlar kontrol edilir (pending'ler her zaman)
+DUPLICATE_WINDOW_DAYS = int(os.getenv('DUPLICATE_WINDOW_DAYS', '30'))
+# SimHash Hamming mesafesi bu değere eşit veya küçükse "neredeyse aynı" sayılır
+DUPLICATE_MAX_DISTANCE = int(os.getenv('DUPLICATE_MAX_DISTANCE', '7'))
+
+SIMHASH_BITS = 64
+_MASK64 = (1 << SIMHASH_BITS) - 1
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_SPACE_RE = re.compile(r'\s+')
+_URL_RE = re.compile(r'https?://\S+')
+
+
+class DuplicateContentError(ValueError):
+    """Planlanan içerik yakın zamanda gönderilmiş/bekleyen bir postla aynı."""
+
+    def __init__(self, matches):
+        self.matches = matches
+        super().__init__("; ".join(str(match) for match in matches))
+
+
+class DuplicateMatch:
+    """Tek bir eşleşme: hangi post, tam mı yakın mı, mesafe."""
+
+    __slots__ = ('post_id', 'kind', 'distance', 'status')
+
+    EXACT = 'exact'
+    NEAR = 'near'
+
+    def __init__(self, post_id, kind, distance, status):
+        self.post_id = post_id
+        self.kind = kind
+        self.distance = distance
+        self.status = status
+
+    def __str__(self):
+        if self.kind == self.EXACT:
+            return f"Post #{self.post_id} ({self.status}) ile aynı içerik"
+        return f"Post #{self.post_id} ({self.status}) ile neredeyse aynı içerik (mesafe {self.distance})"
+
+
+def normalize(text):
+    """
+    Tam eşleşme için metni sadeleştirir: NFKC, casefold, tek boşluk.
+    Türkçe büyük I/İ harfleri küçük ı/i ile aynı sonucu verir.
+    """
+    text = unicodedata.normalize('NFKC', text or '').replace('I', 'ı').replace('İ', 'i')
+    return _SPACE_RE.sub(' ', text.casefold()).strip()
+
+
+def _features(text):
+    """SimHash özellikleri: kelimeler ve ardışık kelime ikilileri (bağlantılar ve
+    noktalama atılır, aksanlar sadeleştirilir: ı -> i, ş -> s)."""
+    text = unicodedata.normalize('NFKD', _URL_RE.sub(' ', normalize(text)).replace('ı', 'i'))
+    words = _WORD_RE.findall(''.join(c for c in text if not unicodedata.combining(c)))
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def exact_hash(text):
+    """Normalize edilmiş metnin özeti."""
+    return hashlib.sha1(normalize(text).encode('utf-8')).hexdigest()
+
+
+def simhash(text):
+    """
+    Kelime özelliklerinden 64 bitlik SimHash imzası (kelimesi yoksa 0).
+
+    Bit başına oy sayımı bit dilimli sayaçlarla yapılır: her seviye 64 bitin
+    sayacının bir basamağını tutar, böylece özellik başına ve sonuçta 64 adımlık
+    döngü yerine birkaç tamsayı işlemi yeterli olur.
+    """
+    features = _features(text)
+    if not features:
+        return 0
+    total = len(features)
+
+    counters = []
+    for feature in features:
+        carry = hash(feature) & _MASK64
+        for level, counter in enumerate(counters):
+            counters[level] = counter ^ carry
+            carry &= counter
+            if not carry:
+                break
+        else:
+            if carry:
+                counters.append(carry)
+
+    # Çoğunluk oyu: 64 sayacın hepsi aynı anda (total // 2) ile karşılaştırılır,
+    # en anlamlı basamaktan başlayarak "büyük" ve "eşit" bit maskeleri tutulur
+    threshold = total // 2
+    greater, equal = 0, _MASK64
+    for level in range(max(len(counters), threshold.bit_length()) - 1, -1, -1):
+        counter = counters[level] if level < len(counters) else 0
+        if threshold >> level & 1:
+            equal &= counter
+        else:
+            greater |= equal & counter
+            equal &= ~counter
+    return greater
+
+
+def _band_layout(band_count):
+    """64 biti band_count banda böler: [(kaydırma, maske), ...]"""
+    width = SIMHASH_BITS // band_count
+    layout = []
+    for band in range(band_count):
+        bits = width if band < band_count - 1 else SIMHASH_BITS - width * (band_count - 1)
+        layout.append((band * width, (1 << bits) - 1))
+    return layout
+
+
+class FingerprintIndex:
+    """
+    Platform/hesap bazında tam özet ve SimHash bant indeksi (Twitter aynı
+    metni aynı hesapta reddeder; farklı hesaplar aynı metni paylaşabilir).
+
+    Yalnızca pending postlar ve son ``window_days`` gün içinde gönderilmiş
+    postlar indekslenir; başarısız/iptal edilmiş postlar tekrar planlanabilir.
+    """
+
+    def __init__(self, window_days=DUPLICATE_WINDOW_DAYS, max_distance=DUPLICATE_MAX_DISTANCE):
+        self.window_days = window_days
+        self.max_distance = max(0, min(max_distance, SIMHASH_BITS // 4 - 1))
+        self._layout = _band_layout(self.max_distance + 1)
+        self._exact = {}      # (kapsam, özet) -> {post_id}
+        self._bands = {}      # (kapsam, bant, değer) -> {post_id}
+        self._entries = {}    # post_id -> (kapsam, içerik, özet, simhash, durum)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def build(cls, posts, previous=None, now=None, **kwargs):
+        """
+        Post listesinden indeksi oluşturur.
+
+        Args:
+            previous (FingerprintIndex): Önceki indeks; içeriği değişmemiş postların
+                imzaları yeniden hesaplanmaz
+        """
+        index = cls(**kwargs)
+        now = now or datetime.now()
+        known = previous._entries if previous is not None else {}
+        for post in posts:
+            entry = known.get(post.id)
+            if entry is not None and entry[1] == post.content:
+                index.add(post, now, digest=entry[2], signature=entry[3])
+            else:
+                index.add(post, now)
+        return index
+
+    def _tracked(self, post, now):
+        if post.status == PostStatus.PENDING:
+            return True
+        if post.status == PostStatus.SENT:
+            sent_at = post.sent_at or post.schedule_time
+            return sent_at is not None and sent_at >= now - timedelta(days=self.window_days)
+        return False
+
+    @staticmethod
+    def _scope(platform, account):
+        return platform, normalize_account(account)
+
+    def _band_keys(self, scope, signature):
+        return [(scope, band, signature >> shift & mask) for band, (shift, mask) in enumerate(self._layout)]
+
+    def add(self, post, now=None, digest=None, signature=None):
+        """Postu indekse ekler (takip edilmeyen durumdaysa atlanır)."""
+        if not self._tracked(post, now or datetime.now()):
+            return
+        if digest is None:
+            digest, signature = exact_hash(post.content), simhash(post.content)
+        scope = self._scope(post.platform, post.account)
+        self._entries[post.id] = (scope, post.content, digest, signature, post.status)
+        self._exact.setdefault((scope, digest), set()).add(post.id)
+        if signature:
+            for key in self._band_keys(scope, signature):
+                self._bands.setdefault(key, set()).add(post.id)
+
+    def find(self, content, platform, account=None, exclude=None):
+        """
+        İçeriğin aynı platform/hesaptaki tam ve yakın kopyalarını bulur.
+
+        Args:
+            content (str): Kontrol edilecek metin
+            platform (str): Platform adı
+            account (str): Hesap adı (opsiyonel, varsayılan hesap)
+            exclude (int): Sonuçlardan çıkarılacak post ID'si (kendisi)
+
+        Returns:
+            list[DuplicateMatch]: Önce tam eşleşmeler, sonra mesafeye göre yakınlar
+        """
+        scope = self._scope(platform, account)
+        matches = [
+            DuplicateMatch(post_id, DuplicateMatch.EXACT, 0, self._entries[post_id][4])
+            for post_id in sorted(self._exact.get((scope, exact_hash(content)), ()))
+            if post_id != exclude
+        ]
+
+        signature = simhash(content)
+        if not signature:
+            return matches  # Kelimesi olmayan içerik (yalnızca emoji/noktalama) için yakınlık aranmaz
+
+        candidates = set()
+        for key in self._band_keys(scope, signature):
+            candidates.update(self._bands.get(key, ()))
+        candidates.difference_update(match.post_id for match in matches)
+        candidates.discard(exclude)
+
+        near = []
+        for post_id in candidates:
+            entry = self._entries[post_id]
+            distance = (signature ^ entry[3]).bit_count()
+            if distance <= self.max_distance:
+                near.append(DuplicateMatch(post_id, DuplicateMatch.NEAR, distance, entry[4]))
+        near.sort(key=lambda match: (match.distance, match.post_id))
+        return matches + near
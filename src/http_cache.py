@@ -0,0 +1,96 @@
+"""
+http_cache.py
+=============
+Koşullu GET (ETag / Last-Modified) ve sürüm bazlı çıktı önbelleği.
+
+Dashboard ve post API'leri her istekte posts.json'u okuyup şablonu yeniden
+çizmek yerine önce verinin sürümüne bakar (yalnızca ``os.stat``):
+
+- İstemcinin ``If-None-Match`` değeri güncel ETag ile aynıysa 304 döner;
+  depo okunmaz, şablon çizilmez
+- Aynı sürüm daha önce çizildiyse önbellekteki çıktı döner
+- Aksi halde çıktı üretilir ve sürümüyle birlikte saklanır
+
+ETag, çıktıyı etkileyen her şeyin (veri sürümleri, sorgu parametreleri)
+özetidir; sürüm değişince eski kayıtlar LRU ile kendiliğinden düşer.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+# Saklanan çizilmiş çıktı sayısı (farklı filtreler/sürümler)
+RENDER_CACHE_SIZE = int(os.getenv('RENDER_CACHE_SIZE', '8'))
+
+
+def make_etag(*parts):
+    """Çıktıyı belirleyen parçalardan güçlü bir ETag üretir."""
+    joined = '\x1f'.join(str(part) for part in parts)
+    return '"' + hashlib.blake2b(joined.encode('utf-8'), digest_size=12).hexdigest() + '"'
+
+
+def http_date(timestamp):
+    """Epoch saniyesini HTTP tarih formatına çevirir (Last-Modified)."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def _etag_matches(header, etag):
+    """If-None-Match listesinde ETag var mı? (zayıf karşılaştırma, RFC 9110)"""
+    if header.strip() == '*':
+        return True
+    candidates = (candidate.strip() for candidate in header.split(','))
+    return any(candidate.removeprefix('W/') == etag for candidate in candidates)
+
+
+def not_modified(headers, etag, last_modified=None):
+    """
+    İstemcinin kopyası güncel mi?
+
+    If-None-Match varsa yalnızca ona bakılır; yoksa If-Modified-Since
+    ``last_modified`` (epoch saniyesi) ile saniye hassasiyetinde karşılaştırılır.
+    """
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+class RenderCache:
+    """ETag -> çizilmiş çıktı (byte) için küçük, thread-safe LRU önbellek."""
+
+    def __init__(self, maxsize=RENDER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+render_cache = RenderCache()
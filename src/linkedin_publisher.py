@@ -2,12 +2,41 @@ import requests
 import os
 import time
 from dotenv import load_dotenv
+from src.capability_cache import credential_fingerprint
+from src.telemetry import API_LATENCY, API_RATE_LIMITED, API_RETRIES
+from src.tracing import tracer
+from src.media import MediaUploadError, media_type, media_uploader
+
+# Önbelleğe alınan Person URN'ün geçerlilik süresi (saniye)
+IDENTITY_TTL = int(os.getenv('LINKEDIN_IDENTITY_TTL', '3600'))
 
 class LinkedInPublisher:
-    def __init__(self):
+    def __init__(self, base_url=None, access_token=None, account=None):
+        """
+        Args:
+            base_url (str): API adresi (opsiyonel, ör. yerel emülatör). Verilmezse
+                LINKEDIN_API_BASE_URL ortam değişkeni, o da yoksa gerçek API kullanılır.
+            access_token (str): Hesabın token'ı (opsiyonel, verilmezse .env)
+            account (str): Hesap adı (opsiyonel, loglama için)
+        """
         load_dotenv()
-        self.access_token = os.getenv('LINKEDIN_ACCESS_TOKEN')
+        self.account = account
+        self.access_token = access_token or os.getenv('LINKEDIN_ACCESS_TOKEN')
         self.api_version = "2.0.0"
+        self.base_url = (base_url or os.getenv('LINKEDIN_API_BASE_URL') or 'https://api.linkedin.com').rstrip('/')
+        
+        # Yetenek önbelleği için kimlik bilgisi özeti
+        self.credential_id = credential_fingerprint(self.access_token)
+        
+        # Son hatanın özeti (devre kesici geçici/kalıcı ayrımı için kullanır)
+        self.last_error = None
+        
+        # Bağlantı havuzu: ön hazırlıkta açılan bağlantı gönderimde yeniden kullanılır
+        self.session = requests.Session()
+        
+        # Ön hazırlıkta önbelleğe alınan Person URN (gönderim anında userinfo çağrılmaz)
+        self.person_urn = None
+        self.identity_checked_at = 0.0
         
         if not self.access_token:
             print("❌ LinkedIn Access Token bulunamadı! Lütfen .env dosyasını kontrol edin.")
@@ -19,32 +48,167 @@ class LinkedInPublisher:
             'Content-Type': 'application/json'
         }
         try:
-            response = requests.get('https://api.linkedin.com/v2/userinfo', headers=headers)
+            with API_LATENCY.labels('LinkedIn', 'userinfo').time(), tracer.span('linkedin.userinfo') as span:
+                response = self.session.get(f'{self.base_url}/v2/userinfo', headers=headers)
+                span.set('status_code', response.status_code)
+            if response.status_code == 429:
+                API_RATE_LIMITED.labels('LinkedIn', 'userinfo').inc()
             if response.status_code == 200:
-                return response.json().get('sub')
+                self.person_urn = response.json().get('sub')
+                self.identity_checked_at = time.time()
+                return self.person_urn
+            self._record_error("HTTPError", response.status_code, response.text)
             print(f"❌ Kullanıcı bilgisi alınamadı: {response.status_code}")
             return None
         except Exception as e:
+            self._record_error(type(e).__name__, None, str(e))
             print(f"⚠️ Kimlik bilgisi çekilirken hata oluştu: {e}")
             return None
 
+    def refresh_identity(self):
+        """
+        Person URN'ü yeniler (token'ı doğrular ve havuzdaki bağlantıyı ısıtır).
+        
+        Returns:
+            str or None: Person URN
+        """
+        if not self.access_token:
+            return None
+        return self.get_user_info()
+
+    def upload_media(self, path):
+        """
+        registerUpload ile yükleme adresi alır ve dosyayı akış halinde PUT eder
+        (requests dosyayı parça parça gönderir, tamamen belleğe okunmaz).
+        
+        Returns:
+            tuple: (asset URN, None) - LinkedIn asset'lerinin süresi dolmaz
+        """
+        person_urn = self.person_urn or self.get_user_info()
+        if not person_urn:
+            raise MediaUploadError("LinkedIn kullanıcı bilgisi alınamadı", transient=True)
+        
+        mime = media_type(path)
+        recipe = 'feedshare-video' if mime.startswith('video/') else 'feedshare-image'
+        headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json',
+            'X-Restli-Protocol-Version': self.api_version
+        }
+        register = {
+            "registerUploadRequest": {
+                "recipes": [f"urn:li:digitalmediaRecipe:{recipe}"],
+                "owner": f"urn:li:person:{person_urn}",
+                "serviceRelationships": [{
+                    "relationshipType": "OWNER",
+                    "identifier": "urn:li:userGeneratedContent"
+                }]
+            }
+        }
+        with API_LATENCY.labels('LinkedIn', 'registerUpload').time(), tracer.span('linkedin.registerUpload') as span:
+            response = self.session.post(f'{self.base_url}/v2/assets?action=registerUpload',
+                                         headers=headers, json=register)
+            span.set('status_code', response.status_code)
+        response.raise_for_status()
+        value = response.json()['value']
+        upload_url = value['uploadMechanism'][
+            'com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest']['uploadUrl']
+        
+        with open(path, 'rb') as f, API_LATENCY.labels('LinkedIn', 'media_upload').time(), \
+                tracer.span('linkedin.media_upload', bytes=os.path.getsize(path)) as span:
+            response = self.session.put(upload_url, data=f, headers={
+                'Authorization': f'Bearer {self.access_token}',
+                'Content-Type': mime
+            })
+            span.set('status_code', response.status_code)
+        response.raise_for_status()
+        return value['asset'], None
+
+    def validate_content(self, content):
+        """
+        LinkedIn kurallarına göre içerik kontrolü (API çağrısı yapmaz)
+        
+        Returns:
+            str or None: Sorun açıklaması; içerik geçerliyse None
+        """
+        if not content or not content.strip():
+            return "LinkedIn postu boş!"
+        if len(content) > 3000:
+            return f"LinkedIn postu {len(content)} karakter. Sınır 3000!"
+        return None
+
+    def health_check(self):
+        """Devre kesici için hafif bağlantı kontrolü (userinfo)"""
+        return bool(self.access_token) and self.get_user_info() is not None
+
+    def _record_error(self, error_class, status_code, message):
+        """Son hatayı kaydeder; bağlantı hataları ve 429/5xx geçici sayılır."""
+        self.last_error = {
+            "error_class": error_class,
+            "status_code": status_code,
+            "message": message,
+            "transient": status_code is None or status_code == 429 or status_code >= 500
+        }
+
+    @staticmethod
+    def _may_retry(retry_gate):
+        """Geçici hatadan sonra tekrar denemeye izin var mı? (devre açıldıysa hayır)"""
+        if retry_gate is None or retry_gate():
+            return True
+        print("🚫 Devre kesici açıldı, tekrar deneme durduruldu")
+        return False
+
     # DÜZELTME BURADA YAPILDI: post_id parametresi eklendi
-    def post_to_linkedin(self, content, post_id=None):
-        """LinkedIn'e post atar - Akıllı Retry ve Token tabanlı"""
+    def post_to_linkedin(self, content, post_id=None, media=None, retry_gate=None):
+        """
+        LinkedIn'e post atar - Akıllı Retry ve Token tabanlı
+        
+        Args:
+            media (list): Eklenecek dosya yolları (opsiyonel, önbellekli ve eşzamanlı yüklenir)
+            retry_gate (callable): Her geçici hatadan sonra çağrılır; False dönerse
+                (ör. devre kesici açıldı) tekrar denenmez (opsiyonel)
+        """
+        self.last_error = None
         if not self.access_token:
+            self.last_error = {
+                "error_class": "MissingToken",
+                "status_code": None,
+                "message": "LinkedIn Access Token bulunamadı",
+                "transient": False
+            }
             return False
 
-        # 1. İçerik Uzunluk Kontrolü
-        if len(content) > 3000:
-            print(f"❌ Hata: LinkedIn postu {len(content)} karakter. Sınır 3000!")
+        # 1. İçerik Kontrolü
+        problem = self.validate_content(content)
+        if problem:
+            self.last_error = {
+                "error_class": "InvalidContent",
+                "status_code": None,
+                "message": problem,
+                "transient": False
+            }
+            print(f"❌ Hata: {problem}")
             return False
 
-        # 2. Kullanıcı URN al
-        person_urn = self.get_user_info()
+        # 2. Kullanıcı URN al (ön hazırlıkta alınmışsa önbellekten)
+        person_urn = self.person_urn
+        if not person_urn or time.time() - self.identity_checked_at > IDENTITY_TTL:
+            person_urn = self.get_user_info()
         if not person_urn:
             return False
 
-        url = 'https://api.linkedin.com/v2/ugcPosts'
+        # 3. Medya (önbellekteyse yeniden yüklenmez)
+        assets = []
+        if media:
+            try:
+                assets = media_uploader.upload_all('LinkedIn', self, media)
+            except MediaUploadError as e:
+                self._record_error("MediaUploadError", None, str(e))
+                self.last_error["transient"] = e.transient
+                print(f"❌ LinkedIn medya hatası: {e}")
+                return False
+
+        url = f'{self.base_url}/v2/ugcPosts'
         headers = {
             'Authorization': f'Bearer {self.access_token}',
             'Content-Type': 'application/json',
@@ -62,23 +226,40 @@ class LinkedInPublisher:
             },
             "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
         }
+        if assets:
+            share = post_data["specificContent"]["com.linkedin.ugc.ShareContent"]
+            is_video = any(media_type(path).startswith('video/') for path in media)
+            share["shareMediaCategory"] = "VIDEO" if is_video else "IMAGE"
+            share["media"] = [{"status": "READY", "media": asset} for asset in assets]
 
-        # 3. Akıllı Retry Mekanizması
+        # 4. Akıllı Retry Mekanizması
         max_attempts = 3
         for attempt in range(1, max_attempts + 1):
+            tracer.current_span().set('attempts', attempt)
             try:
-                response = requests.post(url, headers=headers, json=post_data)
+                with API_LATENCY.labels('LinkedIn', 'ugcPosts').time(), tracer.span('linkedin.ugcPosts') as span:
+                    response = self.session.post(url, headers=headers, json=post_data)
+                    span.set('status_code', response.status_code)
                 
                 if response.status_code == 201:
+                    self.last_error = None
                     print(f"✅ LinkedIn postu başarıyla gönderildi! (Post ID: {post_id})")
                     return True
                 
+                self._record_error("HTTPError", response.status_code, response.text)
+                
                 # Rate Limit veya Geçici Hata Kontrolü
-                elif response.status_code in [429, 500, 503]:
+                if response.status_code in [429, 500, 503]:
                     wait_time = 60 if response.status_code == 429 else 10
+                    if response.status_code == 429:
+                        API_RATE_LIMITED.labels('LinkedIn', 'ugcPosts').inc()
+                    if not self._may_retry(retry_gate):
+                        break
                     if attempt < max_attempts:
                         print(f"⏰ Hata {response.status_code}. {wait_time} sn sonra tekrar deneniyor... ({attempt}/{max_attempts})")
-                        time.sleep(wait_time)
+                        API_RETRIES.labels('LinkedIn', 'ugcPosts').inc()
+                        with tracer.span('retry_sleep', seconds=wait_time, reason=str(response.status_code)):
+                            time.sleep(wait_time)
                     else:
                         print("❌ Tüm denemeler başarısız oldu.")
                 else:
@@ -86,13 +267,25 @@ class LinkedInPublisher:
                     break
 
             except Exception as e:
+                self._record_error(type(e).__name__, None, str(e))
                 print(f"⚠️ Beklenmedik hata: {e}")
-                time.sleep(5)
+                if not self._may_retry(retry_gate) or attempt >= max_attempts:
+                    break
+                API_RETRIES.labels('LinkedIn', 'ugcPosts').inc()
+                with tracer.span('retry_sleep', seconds=5, reason=type(e).__name__):
+                    time.sleep(5)
         
         return False
 
     def get_post_metrics(self, post_id):
         """LinkedIn post istatistiklerini getir (Şimdilik dummy)"""
         # Not: Gerçek API entegrasyonu için Organization API gerekebilir
-        # Şimdilik hata vermemesi için boş dönüyoruz
+        # Şimdilik hata vermemesi için boş dönüyoruz; kalıcı "desteklenmiyor"
+        # hatası bildirilir ki metrik takibi bu hesabı her döngüde çağırmasın
+        self.last_error = {
+            "error_class": "NotSupported",
+            "status_code": None,
+            "message": "LinkedIn metrikleri desteklenmiyor",
+            "transient": False
+        }
         return None
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+media.py
+========
+Post'lara eklenen medya dosyalarının yüklenmesi.
+
+- Dosyalar hiçbir zaman tamamen belleğe okunmaz: özet (SHA-256) ve yükleme
+  parça parça yapılır (Twitter: INIT/APPEND/FINALIZE, LinkedIn: akış halinde PUT)
+- Bir postun birden fazla dosyası aynı anda (ThreadPoolExecutor) yüklenir
+- Yüklenen medyanın kimliği içerik özetiyle önbelleğe alınır
+  (data/media_cache.json); aynı dosya başka postta tekrar yüklenmez
+
+Publisher'lar ``upload_media(path)`` metodunu sağlar ve
+``(media_id, geçerlilik_saniyesi)`` döndürür.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.atomic_file import atomic_write_json
+from src.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+MEDIA_CACHE_FILE = os.getenv('MEDIA_CACHE_FILE', os.path.join(DATA_DIR, 'media_cache.json'))
+MEDIA_DIR = os.getenv('MEDIA_DIR', os.path.join(DATA_DIR, 'media'))
+MEDIA_UPLOAD_WORKERS = int(os.getenv('MEDIA_UPLOAD_WORKERS', '4'))
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Platform başına eklenebilecek en fazla dosya
+MEDIA_LIMITS = {'Twitter': 4, 'LinkedIn': 9}
+
+
+class MediaUploadError(Exception):
+    """Medya yüklenemedi; post medyasız gönderilmez."""
+
+    def __init__(self, message, transient=False):
+        super().__init__(message)
+        self.transient = transient  # Ağ/5xx/429 hataları tekrar denenebilir
+
+
+def file_digest(path):
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesaplar."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def media_type(path):
+    """Dosya uzantısından MIME türü (bilinmiyorsa application/octet-stream)."""
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def validate_media(platform, paths):
+    """
+    Medya listesini yüklemeden kontrol eder.
+
+    Returns:
+        str or None: Sorun açıklaması; medya geçerliyse None
+    """
+    if not paths:
+        return None
+    limit = MEDIA_LIMITS.get(platform)
+    if limit is not None and len(paths) > limit:
+        return f"{platform} için en fazla {limit} medya eklenebilir"
+    for path in paths:
+        if not os.path.isfile(path):
+            return f"Medya dosyası bulunamadı: {path}"
+        if not media_type(path).startswith(('image/', 'video/')):
+            return f"Desteklenmeyen medya türü: {path}"
+    return None
+
+
+def store_upload(fileobj, filename, media_dir=MEDIA_DIR):
+    """
+    Dashboard'dan yüklenen dosyayı parça parça diske yazar. Dosya içerik
+    özetiyle adlandırılır; aynı dosya ikinci kez kaydedilmez.
+
+    Returns:
+        str: Kaydedilen dosyanın yolu
+    """
+    os.makedirs(media_dir, exist_ok=True)
+    extension = os.path.splitext(filename or '')[1].lower()
+    digest = hashlib.sha256()
+    tmp_path = os.path.join(media_dir, f".upload-{threading.get_ident()}-{time.time_ns()}")
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in iter(lambda: fileobj.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                f.write(chunk)
+        path = os.path.join(media_dir, digest.hexdigest() + extension)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+class MediaCache:
+    """(platform, hesap, içerik özeti) -> yüklenmiş medya kimliği."""
+
+    def __init__(self, path=MEDIA_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def _key(platform, credential_id, digest):
+        return f"{platform}:{credential_id}:{digest}"
+
+    def get(self, platform, credential_id, digest):
+        """Geçerliliği dolmamış medya kimliği (yoksa None)."""
+        with self._lock:
+            entry = self._load().get(self._key(platform, credential_id, digest))
+        if not entry:
+            return None
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return entry['media_id']
+
+    def put(self, platform, credential_id, digest, media_id, ttl=None):
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            entries[self._key(platform, credential_id, digest)] = {
+                "media_id": media_id,
+                "uploaded_at": now,
+                "expires_at": now + ttl if ttl else None
+            }
+            # Süresi dolmuş kayıtları temizle
+            for key in [k for k, v in entries.items() if v.get('expires_at') and v['expires_at'] <= now]:
+                del entries[key]
+            self._save(entries)
+
+    def _save(self, entries):
+        # Benzersiz geçici dosya: eşzamanlı yükleme thread'leri ve süreçler çakışmaz
+        atomic_write_json(self.path, entries)
+
+
+class MediaUploader:
+    """Bir postun medyasını eşzamanlı ve önbellekli olarak yükler."""
+
+    def __init__(self, cache=None, workers=MEDIA_UPLOAD_WORKERS):
+        self.cache = cache or MediaCache()
+        self.workers = workers
+        self._inflight = {}  # Aynı dosyanın eşzamanlı iki kez yüklenmesini önler
+        self._inflight_lock = threading.Lock()
+
+    def upload_all(self, platform, publisher, paths):
+        """
+        Dosyaları yükler ve medya kimliklerini aynı sırayla döndürür.
+
+        Raises:
+            MediaUploadError: Herhangi bir dosya yüklenemezse
+        """
+        if not paths:
+            return []
+        problem = validate_media(platform, paths)
+        if problem:
+            raise MediaUploadError(problem)
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(paths)),
+                                thread_name_prefix='MediaUpload') as pool:
+            # Her görev aktif trace'in kopyasıyla çalışır (span'lar aynı denemeye bağlanır)
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._upload_one, platform, publisher, path)
+                for path in paths
+            ]
+            return [future.result() for future in futures]
+
+    def _upload_one(self, platform, publisher, path):
+        with tracer.span('media.upload', file=os.path.basename(path)) as span:
+            media_id, cached = self._upload_cached(platform, publisher, path)
+            span.set('cached', cached)
+        return media_id
+
+    def _upload_cached(self, platform, publisher, path):
+        digest = file_digest(path)
+        credential_id = getattr(publisher, 'credential_id', None)
+        cached = self.cache.get(platform, credential_id, digest)
+        if cached:
+            return cached, True
+
+        key = (platform, credential_id, digest)
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                # Başka bir thread aynı dosyayı az önce yüklemiş olabilir
+                cached = self.cache.get(platform, credential_id, digest)
+                if cached:
+                    return cached, True
+                started = time.perf_counter()
+                try:
+                    media_id, ttl = publisher.upload_media(path)
+                except Exception as e:
+                    status = getattr(getattr(e, 'response', None), 'status_code', None)
+                    transient = status is None or status == 429 or status >= 500
+                    raise MediaUploadError(f"{os.path.basename(path)} yüklenemedi: {e}", transient) from e
+                if not media_id:
+                    raise MediaUploadError(f"{os.path.basename(path)} yüklenemedi")
+                self.cache.put(platform, credential_id, digest, media_id, ttl)
+        finally:
+            # Başarısız yüklemelerin kilitleri de bırakılır (sözlük büyümesin)
+            with self._inflight_lock:
+                if self._inflight.get(key) is lock:
+                    del self._inflight[key]
+
+        logger.info("🖼️ %s medyası yüklendi: %s (%.0f ms)", platform, os.path.basename(path),
+                    (time.perf_counter() - started) * 1000, extra={"platform": platform})
+        return media_id, False
+
+
+media_uploader = MediaUploader()
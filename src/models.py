@@ -0,0 +1,268 @@
+"""
+models.py
+=========
+Post ve metrik verileri için __slots__ tabanlı, hafif model sınıfları.
+
+Depodaki (posts.json) dict kayıtları yalnızca burada nesneye çevrilir:
+okurken ``Post.from_dict``, yazarken ``Post.to_dict`` kullanılır. Uygulamanın
+geri kalanı sadece ``Post`` / ``Metrics`` nesneleriyle çalışır.
+"""
+
+import sys
+from datetime import datetime
+
+# Depodaki tarih formatları
+SCHEDULE_FORMAT = "%Y-%m-%d %H:%M"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class PostStatus:
+    """Post durumları (interned string sabitleri)."""
+    PENDING = sys.intern('pending')
+    SENT = sys.intern('sent')
+    FAILED = sys.intern('failed')
+    CANCELLED = sys.intern('cancelled')  # İptal edilen serinin gönderilmemiş postları
+    EXPIRED = sys.intern('expired')  # Son geçerlilik zamanına kadar gönderilemeyen postlar
+
+    ALL = (PENDING, SENT, FAILED, CANCELLED, EXPIRED)
+
+
+class PostPriority:
+    """Gönderim önceliği (büyük değer önce gönderilir)."""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+    LABELS = {HIGH: 'yüksek', NORMAL: 'normal', LOW: 'düşük'}
+
+    @classmethod
+    def parse(cls, value):
+        """Sayı veya isimden ('high', 'yüksek', '2') önceliği döndürür; bilinmiyorsa NORMAL."""
+        if value is None or value == '':
+            return cls.NORMAL
+        names = {'low': cls.LOW, 'normal': cls.NORMAL, 'high': cls.HIGH}
+        names.update({label: level for level, label in cls.LABELS.items()})
+        text = str(value).strip().lower()
+        if text in names:
+            return names[text]
+        try:
+            return max(cls.LOW, min(cls.HIGH, int(text)))
+        except ValueError:
+            return cls.NORMAL
+
+
+class Platform:
+    """Desteklenen platform isimleri (interned string sabitleri)."""
+    TWITTER = sys.intern('Twitter')
+    LINKEDIN = sys.intern('LinkedIn')
+
+    ALL = (TWITTER, LINKEDIN)
+
+
+def intern_value(value):
+    """String değerleri intern eder, böylece binlerce post aynı nesneyi paylaşır."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def parse_datetime(value):
+    """
+    Depodaki tarih string'ini datetime'a çevirir.
+
+    'YYYY-MM-DD HH:MM', 'YYYY-MM-DD HH:MM:SS' ve HTML datetime-local
+    ('YYYY-MM-DDTHH:MM') formatlarını kabul eder.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def format_datetime(value, fmt=DATETIME_FORMAT):
+    """datetime'ı depodaki string formatına çevirir."""
+    if value is None:
+        return None
+    return value.strftime(fmt)
+
+
+class Metrics:
+    """Bir postun performans metrikleri (tamsayı alanlar)."""
+
+    __slots__ = ('likes', 'shares', 'replies', 'impressions')
+
+    FIELDS = __slots__
+
+    def __init__(self, likes=0, shares=0, replies=0, impressions=0):
+        self.likes = likes
+        self.shares = shares  # Twitter için retweets, LinkedIn için shares
+        self.replies = replies
+        self.impressions = impressions
+
+    @classmethod
+    def from_dict(cls, data):
+        metrics = cls()
+        if data:
+            metrics.update(data)
+        return metrics
+
+    def update(self, new_metrics):
+        """Gelen metrikleri tamsayıya çevirerek günceller; bilinmeyen anahtarları yok sayar."""
+        for key in self.FIELDS:
+            if key in new_metrics and new_metrics[key] is not None:
+                try:
+                    setattr(self, key, int(new_metrics[key]))
+                except (TypeError, ValueError):
+                    pass
+
+    def to_dict(self):
+        return {
+            "likes": self.likes,
+            "shares": self.shares,
+            "replies": self.replies,
+            "impressions": self.impressions
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, Metrics):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return (f"Metrics(likes={self.likes}, shares={self.shares}, "
+                f"replies={self.replies}, impressions={self.impressions})")
+
+
+class Post:
+    """Tek bir planlanmış/gönderilmiş post."""
+
+    __slots__ = (
+        'id', 'content', 'platform', 'schedule_time', 'status', 'api_post_id',
+        'created_at', 'sent_at', 'last_updated', 'metrics', 'media', 'series_id', 'account',
+        'priority', 'expires_at', 'failure', 'outbox', 'extra'
+    )
+
+    # Modelin tanıdığı alanlar; geri kalan anahtarlar 'extra' içinde korunur
+    _KNOWN_KEYS = frozenset({
+        'id', 'content', 'platform', 'schedule_time', 'status', 'api_post_id',
+        'created_at', 'sent_at', 'last_updated', 'metrics', 'media', 'series_id', 'account',
+        'priority', 'expires_at', 'failure', 'outbox'
+    })
+
+    def __init__(self, id, content, platform, schedule_time, status=PostStatus.PENDING,
+                 api_post_id=None, created_at=None, sent_at=None, last_updated=None,
+                 metrics=None, media=None, series_id=None, account=None,
+                 priority=PostPriority.NORMAL, expires_at=None, failure=None, outbox=None, extra=None):
+        self.id = id
+        self.content = content
+        self.platform = intern_value(platform)
+        self.schedule_time = parse_datetime(schedule_time)
+        self.status = intern_value(status)
+        self.api_post_id = api_post_id
+        self.created_at = parse_datetime(created_at)
+        self.sent_at = parse_datetime(sent_at)
+        self.last_updated = parse_datetime(last_updated)
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.media = list(media) if media else []  # Eklenecek dosya yolları
+        self.series_id = series_id  # Tekrarlayan seriden üretildiyse serinin ID'si
+        self.account = intern_value(account)  # None: varsayılan hesap
+        self.priority = PostPriority.parse(priority)
+        self.expires_at = parse_datetime(expires_at)  # Bu zamana kadar gönderilemezse 'expired' olur
+        self.failure = failure or None  # Başarısız gönderim kaydı (dead-letter; bkz. src/dead_letter.py)
+        self.outbox = list(outbox) if outbox else []  # Teslim edilmemiş dış bildirimler (bkz. src/outbox.py)
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Depodaki dict kaydından Post oluşturur."""
+        extra = {k: v for k, v in data.items() if k not in cls._KNOWN_KEYS}
+        return cls(
+            id=data.get('id'),
+            content=data.get('content', ''),
+            platform=data.get('platform'),
+            schedule_time=data.get('schedule_time'),
+            status=data.get('status', PostStatus.PENDING),
+            api_post_id=data.get('api_post_id'),
+            created_at=data.get('created_at'),
+            sent_at=data.get('sent_at'),
+            last_updated=data.get('last_updated'),
+            metrics=Metrics.from_dict(data.get('metrics')),
+            media=data.get('media'),
+            series_id=data.get('series_id'),
+            account=data.get('account'),
+            priority=data.get('priority'),
+            expires_at=data.get('expires_at'),
+            failure=data.get('failure'),
+            outbox=data.get('outbox'),
+            extra=extra
+        )
+
+    def to_dict(self):
+        """Postu depoya yazılacak dict formatına çevirir."""
+        data = {
+            "id": self.id,
+            "content": self.content,
+            "platform": self.platform,
+            "schedule_time": format_datetime(self.schedule_time, SCHEDULE_FORMAT),
+            "status": self.status,
+            "api_post_id": self.api_post_id,
+            "created_at": format_datetime(self.created_at),
+            "metrics": self.metrics.to_dict()
+        }
+        if self.sent_at is not None:
+            data["sent_at"] = format_datetime(self.sent_at)
+        if self.last_updated is not None:
+            data["last_updated"] = format_datetime(self.last_updated)
+        if self.media:
+            data["media"] = list(self.media)
+        if self.series_id is not None:
+            data["series_id"] = self.series_id
+        if self.account is not None:
+            data["account"] = self.account
+        if self.priority != PostPriority.NORMAL:
+            data["priority"] = self.priority
+        if self.expires_at is not None:
+            data["expires_at"] = format_datetime(self.expires_at, SCHEDULE_FORMAT)
+        if self.failure:
+            data["failure"] = self.failure
+        if self.outbox:
+            data["outbox"] = list(self.outbox)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def schedule_time_text(self):
+        """Şablonlarda gösterim için 'YYYY-MM-DD HH:MM' formatında zaman."""
+        return format_datetime(self.schedule_time, SCHEDULE_FORMAT) or ''
+
+    def is_due(self, now=None):
+        """Post beklemede ve zamanı gelmiş mi?"""
+        if self.status != PostStatus.PENDING or self.schedule_time is None:
+            return False
+        return self.schedule_time <= (now or datetime.now())
+
+    def is_expired(self, now=None):
+        """Post beklemede ve son geçerlilik zamanı geçmiş mi?"""
+        if self.status != PostStatus.PENDING or self.expires_at is None:
+            return False
+        return self.expires_at <= (now or datetime.now())
+
+    def dispatch_key(self):
+        """Gönderim sırası: önce öncelik, sonra son geçerlilik zamanı, sonra planlanan zaman."""
+        return (-self.priority, self.expires_at or datetime.max, self.schedule_time or datetime.max, self.id or 0)
+
+    @property
+    def priority_label(self):
+        """Şablonlarda gösterim için öncelik adı."""
+        return PostPriority.LABELS.get(self.priority, str(self.priority))
+
+    @property
+    def expires_at_text(self):
+        """Şablonlarda gösterim için son geçerlilik zamanı (yoksa boş)."""
+        return format_datetime(self.expires_at, SCHEDULE_FORMAT) or ''
+
+    def __repr__(self):
+        return f"Post(id={self.id}, platform={self.platform}, status={self.status})"
@@ -0,0 +1,381 @@
+"""
+outbox.py
+=========
+Dış sistemlere (Slack benzeri webhook'lar, BI hattı) giden bildirimler için
+transactional outbox.
+
+Gönderim sonucu ve metrik güncellemesi gibi durum değişiklikleri olayı
+doğrudan ağa göndermez; olay postun ``outbox`` alanına eklenir ve durum
+değişikliğiyle **aynı** posts.json yazımında kaydedilir. Böylece:
+
+- Gönderim yoluna ağ gecikmesi eklenmez (webhook yavaşsa zamanlayıcı beklemez)
+- Süreç çökerse olay kaybolmaz; durum yazıldıysa olay da yazılmıştır
+
+Arka plandaki ``OutboxDispatcher`` bekleyen olayları toplar, ``OUTBOX_URL``'e
+``{"events": [...]}`` gövdesiyle toplu (batch) POST eder ve teslim edilenleri
+tek yazımla postlardan siler:
+
+- Sıra: aynı postun olayları kayıt sırasıyla gider; bir batch başarısız olursa
+  sonrakiler denenmez, her postun yalnızca baştaki olayları teslim edilmiş olur
+- Tekrar deneme: bağlantı hatası ve 5xx'te üstel bekleme, 429/503'te
+  ``Retry-After``; diğer 4xx yanıtları kalıcı kabul edilir, batch atlanır
+- Geri basınç: aynı anda tek batch gönderilir, batch en fazla
+  ``OUTBOX_BATCH_SIZE`` olay içerir; alıcı yavaşladıkça dağıtıcı da yavaşlar,
+  olaylar diskte bekler. Post başına bekleyen olay ``OUTBOX_MAX_PER_POST`` ile
+  sınırlıdır (aşılırsa en eski olay düşürülür ve sayılır)
+
+Teslimat "en az bir kez"dir: batch teslim edildikten sonra silinmeden süreç
+durursa olaylar yeniden gönderilir; alıcı olay ``id``'si ile tekrarları ayıklar.
+
+Olay türleri:
+    post.sent        Post platformda yayınlandı
+    post.failed      Gönderim başarısız (dead-letter kuyruğuna düştü)
+    post.engagement  Bir metrik eşiği aştı (OUTBOX_THRESHOLDS, ör. likes:100,likes:1000)
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import requests
+
+from src.accounts import normalize_account
+from src.models import DATETIME_FORMAT, format_datetime
+from src.telemetry import registry
+
+logger = logging.getLogger(__name__)
+
+# Webhook adresi; tanımlı değilse olay kaydedilmez ve dağıtıcı çalışmaz
+OUTBOX_URL = os.getenv('OUTBOX_URL', '')
+# Bir istekte gönderilen en fazla olay
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+# İlk olaydan sonra batch'in dolması için beklenen süre (saniye)
+OUTBOX_LINGER = float(os.getenv('OUTBOX_LINGER', '0.5'))
+# Bildirim gelmese de (başka süreç, yeniden başlatma) bekleyen olaylara bakılma aralığı (saniye)
+OUTBOX_SCAN_INTERVAL = float(os.getenv('OUTBOX_SCAN_INTERVAL', '30'))
+OUTBOX_TIMEOUT = float(os.getenv('OUTBOX_TIMEOUT', '10'))
+# Art arda hatalarda en uzun bekleme (saniye)
+OUTBOX_MAX_BACKOFF = float(os.getenv('OUTBOX_MAX_BACKOFF', '300'))
+OUTBOX_MAX_PER_POST = int(os.getenv('OUTBOX_MAX_PER_POST', '50'))
+OUTBOX_THRESHOLDS = os.getenv('OUTBOX_THRESHOLDS', 'likes:100,shares:25')
+
+POST_SENT = 'post.sent'
+POST_FAILED = 'post.failed'
+POST_ENGAGEMENT = 'post.engagement'
+
+OUTBOX_RECORDED = registry.counter(
+    'autoposting_outbox_recorded_total',
+    'Outbox\'a kaydedilen olaylar',
+    ('type',)
+)
+OUTBOX_DELIVERED = registry.counter(
+    'autoposting_outbox_delivered_total',
+    'Alıcıya teslim edilen olaylar'
+)
+OUTBOX_DROPPED = registry.counter(
+    'autoposting_outbox_dropped_total',
+    'Teslim edilmeden düşürülen olaylar (overflow/rejected)',
+    ('reason',)
+)
+OUTBOX_BATCHES = registry.counter(
+    'autoposting_outbox_batches_total',
+    'Gönderilen batch\'ler (sonuç: delivered/retry/rejected)',
+    ('result',)
+)
+OUTBOX_PENDING = registry.gauge(
+    'autoposting_outbox_pending',
+    'Son taramada teslim bekleyen olay sayısı'
+)
+OUTBOX_LATENCY = registry.histogram(
+    'autoposting_outbox_request_duration_seconds',
+    'Outbox batch isteği süresi',
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+)
+
+
+def parse_thresholds(text):
+    """
+    'likes:100,likes:1000,shares:25' -> {'likes': [100, 1000], 'shares': [25]}
+
+    Geçersiz parçalar uyarıyla atlanır.
+    """
+    thresholds = {}
+    for part in (text or '').split(','):
+        metric, _, value = part.strip().partition(':')
+        if not metric:
+            continue
+        try:
+            thresholds.setdefault(metric, []).append(int(value))
+        except ValueError:
+            logger.warning(f"⚠️ Geçersiz outbox eşiği atlandı: {part.strip()}")
+    return {metric: sorted(values) for metric, values in thresholds.items()}
+
+
+class Outbox:
+    """
+    Olayları postun ``outbox`` alanına ekler (kayıt ContentManager'ın yazımıyla
+    yapılır) ve yazımdan sonra dağıtıcıyı uyandırır.
+    """
+
+    def __init__(self, enabled=bool(OUTBOX_URL), thresholds=OUTBOX_THRESHOLDS, max_per_post=OUTBOX_MAX_PER_POST):
+        self.enabled = enabled
+        self.thresholds = parse_thresholds(thresholds) if isinstance(thresholds, str) else dict(thresholds or {})
+        self.max_per_post = max_per_post
+        # Yeni olay yazıldığında dağıtıcı beklemeyi keser
+        self.wakeup = threading.Event()
+
+    def record(self, post, type, data, now=None):
+        """Olayı postun outbox'ına ekler (dosyaya yazmak çağıranın işidir)."""
+        if not self.enabled:
+            return False
+        # seq: post içinde artan sıra numarası (alıcı sıralamayı bununla doğrulayabilir)
+        seq = time.time_ns()
+        if post.outbox:
+            seq = max(seq, post.outbox[-1].get("seq", 0) + 1)
+        post.outbox.append({
+            "id": uuid.uuid4().hex,
+            "type": type,
+            "post_id": post.id,
+            "seq": seq,
+            "at": (now or datetime.now()).strftime(DATETIME_FORMAT),
+            "data": data
+        })
+        if len(post.outbox) > self.max_per_post:
+            dropped = post.outbox.pop(0)
+            OUTBOX_DROPPED.labels('overflow').inc()
+            logger.warning("⚠️ Post #%s outbox'ı dolu (%d), en eski olay düşürüldü: %s",
+                           post.id, self.max_per_post, dropped["type"], extra={"post_id": post.id})
+        OUTBOX_RECORDED.labels(type).inc()
+        return True
+
+    @staticmethod
+    def _base(post):
+        return {
+            "platform": post.platform,
+            "account": normalize_account(post.account),
+            "content": post.content
+        }
+
+    def record_sent(self, post):
+        return self.record(post, POST_SENT, {
+            **self._base(post),
+            "api_post_id": post.api_post_id,
+            "sent_at": format_datetime(post.sent_at)
+        }, post.sent_at)
+
+    def record_failed(self, post):
+        failure = post.failure or {}
+        return self.record(post, POST_FAILED, {
+            **self._base(post),
+            "error_class": failure.get('error_class'),
+            "status_code": failure.get('status_code'),
+            "message": failure.get('message'),
+            "redrives": failure.get('redrives', 0)
+        }, post.sent_at)
+
+    def record_engagement(self, post, before):
+        """
+        Metrik güncellemesinde aşılan eşikler için olay kaydeder.
+
+        Args:
+            before (dict): Güncellemeden önceki metrikler (Metrics.to_dict())
+
+        Returns:
+            bool: En az bir olay kaydedildi mi?
+        """
+        if not self.enabled or not self.thresholds:
+            return False
+        after = post.metrics.to_dict()
+        recorded = False
+        for metric, values in self.thresholds.items():
+            old, new = before.get(metric, 0) or 0, after.get(metric, 0) or 0
+            for threshold in values:
+                if old < threshold <= new:
+                    recorded = self.record(post, POST_ENGAGEMENT, {
+                        **self._base(post),
+                        "api_post_id": post.api_post_id,
+                        "metric": metric,
+                        "threshold": threshold,
+                        "value": new
+                    }) or recorded
+        return recorded
+
+    def notify(self):
+        self.wakeup.set()
+
+
+class OutboxDispatcher:
+    """Bekleyen outbox olaylarını arka planda toplu halde teslim eder."""
+
+    def __init__(self, content_manager, url=OUTBOX_URL, batch_size=OUTBOX_BATCH_SIZE, session=None):
+        """
+        Args:
+            content_manager: ContentManager instance (olaylar onun outbox'ından okunur)
+            url (str): Olayların POST edileceği adres
+            batch_size (int): İstek başına en fazla olay
+            session: requests.Session (opsiyonel, bağlantılar yeniden kullanılır)
+        """
+        self.cm = content_manager
+        self.outbox = content_manager.outbox
+        self.url = url
+        self.batch_size = max(1, batch_size)
+        self.session = session or requests.Session()
+        self.running = False
+        self._stopping = threading.Event()
+        self._pass_lock = threading.Lock()
+        self._failures = 0
+        self._retry_at = 0.0
+        # Son taramada olay yoksa deponun sürümü; değişmedikçe periyodik tarama dosyayı okumaz
+        self._idle_version = None
+
+    def start(self):
+        """Dağıtıcıyı başlat (thread hedefi)"""
+        self.running = True
+        logger.info(f"📤 Outbox dağıtıcısı başladı: {self.url} (batch {self.batch_size})")
+
+        while not self._stopping.is_set():
+            signalled = self.outbox.wakeup.wait(OUTBOX_SCAN_INTERVAL)
+            if self._stopping.is_set():
+                break
+            if signalled:
+                self.outbox.wakeup.clear()
+                # Aynı anda gelen olaylar tek batch'te toplansın
+                self._stopping.wait(OUTBOX_LINGER)
+            elif self.cm.data_version() == self._idle_version:
+                continue
+
+            # Alıcı hata verdiyse bekleme süresi dolmadan tekrar denenmez
+            delay = self._retry_at - time.monotonic()
+            if delay > 0 and self._stopping.wait(delay):
+                break
+
+            with self._pass_lock:
+                if self._stopping.is_set():
+                    break
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"⚠️ Outbox dağıtım hatası: {e}")
+
+    def stop(self):
+        """Dağıtıcıyı durdur (süren batch tamamlanır; kalan olaylar diskte bekler)"""
+        self.running = False
+        if not self._stopping.is_set():
+            self._stopping.set()
+            self.outbox.wakeup.set()
+            logger.info("🛑 Outbox dağıtıcısı durduruldu")
+
+    def drain(self, timeout):
+        """
+        Dağıtıcıyı durdurur ve süren batch'in bitmesini en fazla ``timeout`` saniye bekler.
+
+        Returns:
+            bool: Süre dolmadan bitti mi?
+        """
+        self.stop()
+        drained = self._pass_lock.acquire(timeout=max(0.0, timeout))
+        if drained:
+            self._pass_lock.release()
+        return drained
+
+    def _batches(self, pending):
+        """
+        Postların olaylarını sırayı bozmadan batch'lere böler (en eski olaylı post önce).
+        Bir postun olayları iki batch'e bölünebilir; batch'ler sırayla gönderildiği için
+        sıra korunur.
+        """
+        pending = sorted(pending, key=lambda item: (item[1][0]["at"], item[0]))
+        batch = []
+        for _, events in pending:
+            for event in events:
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def flush(self):
+        """
+        Bekleyen olayları batch'ler halinde gönderir ve teslim edilenleri siler.
+
+        Returns:
+            int: Teslim edilen (veya kalıcı hatayla atlanan) olay sayısı
+        """
+        version = self.cm.data_version()
+        pending = self.cm.get_outbox()
+        total = sum(len(events) for _, events in pending)
+        OUTBOX_PENDING.set(total)
+        if not total:
+            self._idle_version = version
+            return 0
+        self._idle_version = None
+
+        done = {}
+        for batch in self._batches(pending):
+            result = self._deliver(batch)
+            if result == 'retry':
+                break
+            for event in batch:
+                done.setdefault(event["post_id"], []).append(event["id"])
+            if self._stopping.is_set():
+                break
+
+        count = sum(len(ids) for ids in done.values())
+        if done:
+            self.cm.ack_outbox(done)
+            OUTBOX_PENDING.set(total - count)
+            logger.info(f"📤 Outbox: {count}/{total} olay teslim edildi")
+        return count
+
+    def _deliver(self, batch):
+        """
+        Tek batch'i gönderir.
+
+        Returns:
+            str: 'delivered', 'rejected' (kalıcı hata, atlanır) veya 'retry'
+        """
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.url, json={"events": batch}, timeout=OUTBOX_TIMEOUT)
+        except requests.RequestException as e:
+            return self._backoff(f"bağlantı hatası: {e}")
+        finally:
+            OUTBOX_LATENCY.observe(time.perf_counter() - started)
+
+        if response.ok:
+            self._failures = 0
+            OUTBOX_BATCHES.labels('delivered').inc()
+            OUTBOX_DELIVERED.inc(len(batch))
+            return 'delivered'
+        if response.status_code in (408, 429) or response.status_code >= 500:
+            return self._backoff(f"HTTP {response.status_code}", response.headers.get('Retry-After'))
+
+        self._failures = 0
+        OUTBOX_BATCHES.labels('rejected').inc()
+        OUTBOX_DROPPED.labels('rejected').inc(len(batch))
+        logger.error(f"❌ Outbox alıcısı batch'i reddetti (HTTP {response.status_code}), "
+                     f"{len(batch)} olay atlandı: {response.text[:200]}")
+        return 'rejected'
+
+    def _backoff(self, reason, retry_after=None):
+        """Sonraki denemeyi erteler (Retry-After varsa ona, yoksa üstel beklemeye göre)."""
+        self._failures += 1
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = min(OUTBOX_MAX_BACKOFF, 2 ** self._failures) * random.uniform(0.5, 1.0)
+        self._retry_at = time.monotonic() + delay
+        OUTBOX_BATCHES.labels('retry').inc()
+        logger.warning(f"⏸️ Outbox teslim edilemedi ({reason}), {delay:.1f} sn sonra tekrar denenecek")
+        # Sonraki deneme zamanlayıcıyla değil, bekleme dolunca yapılsın
+        self.outbox.wakeup.set()
+        return 'retry'
+
+
+# Global outbox (ContentManager varsayılan olarak bunu kullanır)
+outbox = Outbox()
@@ -1,20 +1,72 @@
 import tweepy
+import requests
 from dotenv import load_dotenv
+from urllib.parse import urlsplit
 import os
 import time
 from src.error_handler import error_handler
+from src.capability_cache import credential_fingerprint
+from src.telemetry import API_LATENCY, API_RATE_LIMITED, API_RETRIES
+from src.tracing import tracer
+from src.media import MediaUploadError, media_type, media_uploader
+
+class BaseURLAdapter(requests.adapters.HTTPAdapter):
+    """Gelen istekleri aynı path ile başka bir sunucuya (ör. emülatör) yönlendirir."""
+    
+    def __init__(self, base_url, **kwargs):
+        self.base_url = base_url.rstrip('/')
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
 
 class PostPublisher:
-    def __init__(self):
+    def __init__(self, base_url=None, credentials=None, account=None):
+        """
+        Args:
+            base_url (str): API adresi (opsiyonel, ör. yerel emülatör). Verilmezse
+                TWITTER_API_BASE_URL ortam değişkeni, o da yoksa gerçek API kullanılır.
+            credentials (dict): TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN,
+                TWITTER_ACCESS_SECRET değerleri (opsiyonel, verilmezse .env)
+            account (str): Hesap adı (opsiyonel, loglama için)
+        """
         load_dotenv()
-        # Twitter client oluştur
+        self.account = account
+        self.credentials = credentials or {
+            key: os.getenv(key)
+            for key in ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN', 'TWITTER_ACCESS_SECRET')
+        }
+        
+        # Twitter client oluştur (her hesabın kendi session'ı/bağlantı havuzu olur)
         self.twitter_client = tweepy.Client(
-            consumer_key=os.getenv('TWITTER_API_KEY'),
-            consumer_secret=os.getenv('TWITTER_API_SECRET'),
-            access_token=os.getenv('TWITTER_ACCESS_TOKEN'),
-            access_token_secret=os.getenv('TWITTER_ACCESS_SECRET')
+            consumer_key=self.credentials['TWITTER_API_KEY'],
+            consumer_secret=self.credentials['TWITTER_API_SECRET'],
+            access_token=self.credentials['TWITTER_ACCESS_TOKEN'],
+            access_token_secret=self.credentials['TWITTER_ACCESS_SECRET']
         )
         
+        # tweepy host'u sabit kodlar; farklı adres için session seviyesinde yönlendir
+        self.base_url = base_url or os.getenv('TWITTER_API_BASE_URL')
+        if self.base_url:
+            self.twitter_client.session.mount('https://api.twitter.com/', BaseURLAdapter(self.base_url))
+            print(f"🧪 Twitter API adresi: {self.base_url}")
+        
+        # Medya yükleme yalnızca v1.1 API'de var; ilk medyalı postta oluşturulur
+        self._media_api = None
+        
+        # Yetenek önbelleği için kimlik bilgisi özeti
+        self.credential_id = credential_fingerprint(self.credentials['TWITTER_ACCESS_TOKEN'])
+        
+        # Son hatanın özeti (devre kesici geçici/kalıcı ayrımı için kullanır)
+        self.last_error = None
+        
+        # Ön hazırlıkta önbelleğe alınan kimlik (gönderim anında get_me çağrılmaz)
+        self.username = None
+        self.identity_checked_at = 0.0
+        
         # Twitter API erişim seviyesini kontrol et
         self.check_api_access()
     
@@ -24,35 +76,153 @@ class PostPublisher:
             # Basit bir API çağrısı yaparak yetkileri test et
             me = self.twitter_client.get_me()
             if me.data:
+                self.username = me.data.username
                 print(f"✅ Twitter bağlantısı başarılı! (@{me.data.username})")
             else:
                 print("⚠️ Twitter kullanıcı bilgisi alınamadı.")
         except Exception as e:
             print(f"⚠️ Twitter API bağlantı hatası: {e}")
     
-    def post_to_twitter(self, content, post_id=None):
-        """Twitter'a tweet at - akıllı retry ile"""
+    def refresh_identity(self):
+        """
+        Kullanıcı adını yeniler ve önbelleğe alır. İstek aynı zamanda token'ı
+        doğrular ve session'daki bağlantıyı sıcak tutar.
+        
+        Returns:
+            str or None: Kullanıcı adı
+        """
+        try:
+            with API_LATENCY.labels('Twitter', 'get_me').time(), tracer.span('twitter.get_me'):
+                me = self.twitter_client.get_me()
+        except Exception as e:
+            self._record_error(e, transient=not isinstance(e, (tweepy.Unauthorized, tweepy.Forbidden)))
+            return None
+        self.identity_checked_at = time.time()
+        if me.data:
+            self.username = me.data.username
+        return self.username
+    
+    @property
+    def media_api(self):
+        """Medya yükleme için tweepy.API (v1.1, upload.twitter.com)"""
+        if self._media_api is None:
+            auth = tweepy.OAuth1UserHandler(
+                self.credentials['TWITTER_API_KEY'],
+                self.credentials['TWITTER_API_SECRET'],
+                self.credentials['TWITTER_ACCESS_TOKEN'],
+                self.credentials['TWITTER_ACCESS_SECRET']
+            )
+            self._media_api = tweepy.API(auth)
+            if self.base_url:
+                self._media_api.session.mount('https://upload.twitter.com/', BaseURLAdapter(self.base_url))
+        return self._media_api
+    
+    def upload_media(self, path):
+        """
+        Dosyayı INIT/APPEND/FINALIZE ile 1 MB'lık parçalar halinde yükler
+        (dosya tamamen belleğe okunmaz).
+        
+        Returns:
+            tuple: (media_id, geçerlilik süresi saniye)
+        """
+        mime = media_type(path)
+        if mime == 'image/gif':
+            category = 'tweet_gif'
+        elif mime.startswith('video/'):
+            category = 'tweet_video'
+        else:
+            category = 'tweet_image'
+        
+        with open(path, 'rb') as f, API_LATENCY.labels('Twitter', 'media_upload').time(), \
+                tracer.span('twitter.media_upload', bytes=os.path.getsize(path)):
+            media = self.media_api.chunked_upload(
+                os.path.basename(path), file=f, file_type=mime, media_category=category
+            )
+        return str(media.media_id), getattr(media, 'expires_after_secs', None)
+    
+    def validate_content(self, content):
+        """
+        Twitter kurallarına göre içerik kontrolü (API çağrısı yapmaz)
+        
+        Returns:
+            str or None: Sorun açıklaması; içerik geçerliyse None
+        """
+        if not content or not content.strip():
+            return "Tweet içeriği boş!"
+        if len(content) > 280:
+            return "Tweet 280 karakterden uzun!"
+        return None
+    
+    def health_check(self):
+        """Devre kesici için hafif bağlantı kontrolü (get_me)"""
+        try:
+            with API_LATENCY.labels('Twitter', 'get_me').time():
+                return bool(self.twitter_client.get_me().data)
+        except Exception:
+            return False
+    
+    def _record_error(self, e, transient):
+        """Son hatayı sınıfı ve HTTP kodu ile kaydet"""
+        response = getattr(e, 'response', None)
+        self.last_error = {
+            "error_class": type(e).__name__,
+            "status_code": getattr(response, 'status_code', None),
+            "message": str(e),
+            "transient": transient
+        }
+    
+    @staticmethod
+    def _may_retry(retry_gate):
+        """Geçici hatadan sonra tekrar denemeye izin var mı? (devre açıldıysa hayır)"""
+        if retry_gate is None or retry_gate():
+            return True
+        print("🚫 Devre kesici açıldı, tekrar deneme durduruldu")
+        return False
+    
+    def post_to_twitter(self, content, post_id=None, media=None, retry_gate=None):
+        """
+        Twitter'a tweet at - akıllı retry ile
+        
+        Args:
+            media (list): Eklenecek dosya yolları (opsiyonel, önbellekli ve eşzamanlı yüklenir)
+            retry_gate (callable): Her geçici hatadan sonra çağrılır; False dönerse
+                (ör. devre kesici açıldı) tekrar denenmez (opsiyonel)
+        """
+        self.last_error = None
         max_attempts = 3
+        media_ids = None
         for attempt in range(1, max_attempts + 1):
+            tracer.current_span().set('attempts', attempt)
             try:
                 # İçerik kontrolü - kalıcı hata, retry yok
-                if len(content) > 280:
-                    error = "Tweet 280 karakterden uzun!"
+                error = self.validate_content(content)
+                if error:
+                    self.last_error = {
+                        "error_class": "InvalidContent",
+                        "status_code": None,
+                        "message": error,
+                        "transient": False
+                    }
                     error_handler.log_error('twitter', post_id, error, content)
                     print(f"❌ {error}")
                     print(f"💡 Tweet uzunluğu: {len(content)} karakter")
                     return False
                 
+                # Medya (önbellekteyse yeniden yüklenmez)
+                if media and media_ids is None:
+                    media_ids = media_uploader.upload_all('Twitter', self, media)
+                
                 # Tweet at
-                response = self.twitter_client.create_tweet(text=content)
+                with API_LATENCY.labels('Twitter', 'create_tweet').time(), tracer.span('twitter.create_tweet'):
+                    response = self.twitter_client.create_tweet(text=content, media_ids=media_ids)
                 tweet_id = response.data['id']
                 
-                # Tweet URL'sini oluştur
-                me = self.twitter_client.get_me()
-                username = me.data.username if me.data else "twitter"
+                # Tweet URL'sini oluştur (kullanıcı adı ön hazırlıkta önbelleğe alınır)
+                username = self.username or self.refresh_identity() or "twitter"
                 tweet_url = f"https://twitter.com/{username}/status/{tweet_id}"
                 
                 # Başarılı
+                self.last_error = None
                 error_handler.log_success('twitter', post_id, content)
                 print(f"✅ Tweet başarıyla gönderildi!")
                 print(f"Tweet ID: {tweet_id}")
@@ -61,37 +231,63 @@ class PostPublisher:
                 
             except tweepy.TooManyRequests as e:
                 error = "Rate limit aşıldı"
+                self._record_error(e, transient=True)
+                API_RATE_LIMITED.labels('Twitter', 'create_tweet').inc()
                 error_handler.log_error('twitter', post_id, error, content)
+                if not self._may_retry(retry_gate):
+                    return False
                 if attempt < max_attempts:
                     wait_time = 60
                     print(f"⏰ Rate limit! {wait_time} saniye bekleniyor...")
                     error_handler.log_retry('twitter', post_id, attempt)
-                    time.sleep(wait_time)
+                    API_RETRIES.labels('Twitter', 'create_tweet').inc()
+                    with tracer.span('retry_sleep', seconds=wait_time, reason='429'):
+                        time.sleep(wait_time)
                 else:
                     print(f"❌ Rate limit devam ediyor, vazgeçildi.")
                     return False
                     
             except tweepy.Forbidden as e:
                 error = f"Yetki hatası: {str(e)}"
+                self._record_error(e, transient=False)
                 error_handler.log_error('twitter', post_id, error, content)
                 print(f"❌ {error}")
                 return False
                 
+            except MediaUploadError as e:
+                error = str(e)
+                self._record_error(e, transient=e.transient)
+                error_handler.log_error('twitter', post_id, error, content)
+                if not e.transient or not self._may_retry(retry_gate) or attempt >= max_attempts:
+                    print(f"❌ {error}")
+                    return False
+                print(f"🔄 Medya hatası: {error} (Deneme {attempt}/{max_attempts})")
+                error_handler.log_retry('twitter', post_id, attempt)
+                API_RETRIES.labels('Twitter', 'media_upload').inc()
+                with tracer.span('retry_sleep', seconds=10, reason='MediaUploadError'):
+                    time.sleep(10)
+            
             except tweepy.BadRequest as e:
                 error = f"Geçersiz istek: {str(e)}"
+                self._record_error(e, transient=False)
                 error_handler.log_error('twitter', post_id, error, content)
                 print(f"❌ {error}")
                 return False
                 
             except Exception as e:
                 error = str(e)
+                self._record_error(e, transient=True)
                 error_handler.log_error('twitter', post_id, error, content)
+                if not self._may_retry(retry_gate):
+                    return False
                 if attempt < max_attempts:
                     wait_time = 10
                     print(f"🔄 Hata: {error}")
                     print(f"⏰ {wait_time} saniye sonra tekrar denenecek... (Deneme {attempt}/{max_attempts})")
                     error_handler.log_retry('twitter', post_id, attempt)
-                    time.sleep(wait_time)
+                    API_RETRIES.labels('Twitter', 'create_tweet').inc()
+                    with tracer.span('retry_sleep', seconds=wait_time, reason=type(e).__name__):
+                        time.sleep(wait_time)
                 else:
                     print(f"❌ Tüm denemeler başarısız!")
                     return False
@@ -104,11 +300,13 @@ class PostPublisher:
         Not: Bu özellik Twitter API v2 Elevated Access gerektirir.
         Free tier için metrics çekilemeyebilir.
         """
+        self.last_error = None
         try:
-            response = self.twitter_client.get_tweet(
-                id=tweet_id,
-                tweet_fields=['public_metrics']
-            )
+            with API_LATENCY.labels('Twitter', 'get_tweet').time():
+                response = self.twitter_client.get_tweet(
+                    id=tweet_id,
+                    tweet_fields=['public_metrics']
+                )
             
             if response.data:
                 metrics = response.data.public_metrics
@@ -124,17 +322,22 @@ class PostPublisher:
             
         except tweepy.Forbidden as e:
             # Yetki hatası - Free tier için normaldir
+            self._record_error(e, transient=False)
             print(f"⚠️ Twitter metrik erişimi yok (Free tier için normal)")
             print(f"💡 Metrics için Twitter API Elevated Access gerekiyor")
             return None
             
         except tweepy.Unauthorized as e:
             # 401 hatası - OAuth sorunu
+            self._record_error(e, transient=False)
             print(f"⚠️ Twitter metrics için yetkilendirme hatası")
             print(f"💡 Tweet atma çalışıyor ama metrics okuma yetkisi yok")
             return None
             
         except Exception as e:
+            self._record_error(e, transient=True)
+            if isinstance(e, tweepy.TooManyRequests):
+                API_RATE_LIMITED.labels('Twitter', 'get_tweet').inc()
             print(f"⚠️ Twitter metrik hatası: {e}")
             return None
 
@@ -0,0 +1,160 @@
+"""
+profiler.py
+===========
+Çalışan servis için isteğe bağlı, süre sınırlı örnekleyici (sampling) profiler.
+
+Profil alınmadığı sürece hiçbir thread, hook veya sayaç çalışmaz. Profil
+sırasında ayrı bir thread belirli aralıklarla ``sys._current_frames()`` ile
+tüm thread'lerin (PostScheduler, PerformanceTracker, uvicorn) yığınlarını
+okur; izlenen kodun içine hiçbir şey eklenmez.
+
+Çıktı flamegraph.pl / speedscope ile uyumlu "collapsed stack" formatıdır:
+    <thread>;<dosya>:<fonksiyon>;... <örnek sayısı>
+
+Tetikleme:
+    GET /admin/profile?seconds=30&interval_ms=10   (X-Admin-Token başlığı)
+    kill -USR1 <pid>                               (logs/profile_*.collapsed)
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '60'))
+PROFILE_DEFAULT_SECONDS = float(os.getenv('PROFILE_DEFAULT_SECONDS', '30'))
+PROFILE_DEFAULT_INTERVAL_MS = float(os.getenv('PROFILE_DEFAULT_INTERVAL_MS', '10'))
+PROFILE_MIN_INTERVAL_MS = 1.0
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'logs')
+
+
+class ProfilerBusyError(RuntimeError):
+    """Aynı anda yalnızca bir profil alınabilir."""
+
+
+class SamplingProfiler:
+    """Tüm thread'lerin yığınlarını örnekleyip collapsed stack üretir."""
+
+    def __init__(self, max_seconds=PROFILE_MAX_SECONDS):
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._lock.locked()
+
+    def _clamp(self, seconds, interval_ms):
+        seconds = min(max(float(seconds), 0.1), self.max_seconds)
+        interval = max(float(interval_ms), PROFILE_MIN_INTERVAL_MS) / 1000
+        return seconds, interval
+
+    def profile(self, seconds=PROFILE_DEFAULT_SECONDS, interval_ms=PROFILE_DEFAULT_INTERVAL_MS):
+        """
+        Çağıran thread'de profil alır ve collapsed stack metnini döndürür.
+
+        Args:
+            seconds (float): Profil süresi (max_seconds ile sınırlanır)
+            interval_ms (float): Örnekleme aralığı (en az 1 ms)
+
+        Raises:
+            ProfilerBusyError: Başka bir profil zaten çalışıyorsa
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Zaten çalışan bir profil var")
+        try:
+            seconds, interval = self._clamp(seconds, interval_ms)
+            stacks, samples = self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+        return self._render(stacks, samples, seconds, interval)
+
+    def profile_to_file(self, seconds=PROFILE_DEFAULT_SECONDS, interval_ms=PROFILE_DEFAULT_INTERVAL_MS,
+                        directory=PROFILE_DIR):
+        """
+        Profili arka plan thread'inde alır ve logs/profile_*.collapsed dosyasına yazar.
+
+        Returns:
+            threading.Thread or None: Başka profil çalışıyorsa None
+        """
+        if self.running:
+            print("⚠️ Profil zaten çalışıyor, yeni istek yok sayıldı")
+            return None
+
+        def run():
+            try:
+                output = self.profile(seconds, interval_ms)
+            except ProfilerBusyError:
+                print("⚠️ Profil zaten çalışıyor, yeni istek yok sayıldı")
+                return
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"profile_{datetime.now().strftime('%Y%m%d-%H%M%S')}.collapsed")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(output)
+            print(f"🔥 Profil yazıldı: {path}")
+
+        thread = threading.Thread(target=run, daemon=True, name="SamplingProfiler")
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Örnekleme
+    # ------------------------------------------------------------------
+    def _sample(self, seconds, interval):
+        own_id = threading.get_ident()
+        stacks = Counter()
+        labels = {}  # code nesnesi -> "dosya:fonksiyon" (tekrar formatlamamak için)
+        samples = 0
+        deadline = time.perf_counter() + seconds
+
+        while True:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                        labels[code] = label
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(names.get(thread_id, f"thread-{thread_id}").replace(' ', '_'))
+                parts.reverse()
+                stacks[';'.join(parts)] += 1
+            samples += 1
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+        return stacks, samples
+
+    @staticmethod
+    def _render(stacks, samples, seconds, interval):
+        # Başlık satırı eklenmez; bazı flamegraph araçları yorum satırını kabul etmiyor
+        print(f"🔥 Profil tamamlandı: {seconds:g}s, {interval * 1000:g}ms aralık, {samples} örnek")
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def install_signal_handler(signum=getattr(signal, 'SIGUSR1', None)):
+    """
+    Sinyal alındığında varsayılan süreyle profil alıp dosyaya yazar.
+    Ana thread'den çağrılmalıdır; SIGUSR1 olmayan platformlarda (Windows) sessizce atlanır.
+    """
+    if signum is None:
+        return False
+
+    def handler(sig, frame):
+        print("🔥 Profil sinyali alındı, örnekleme başlıyor...")
+        profiler.profile_to_file()
+
+    signal.signal(signum, handler)
+    return True
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,85 @@
+"""
+rate_limiter.py
+===============
+Hesap bazında gönderim kotası (kayan pencere).
+
+Her hesabın kendi limiter'ı vardır; bir hesabın kotası dolduğunda yalnızca o
+hesabın postları ertelenir, diğer hesaplar etkilenmez.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class SlidingWindowLimiter:
+    """Son ``window`` saniyede en fazla ``limit`` işleme izin verir."""
+
+    def __init__(self, name, limit, window=24 * 3600):
+        """
+        Args:
+            name (str): Hesap adı (loglama için)
+            limit (int): Pencere başına izin verilen işlem sayısı (0 veya None: sınırsız)
+            window (float): Pencere uzunluğu (saniye)
+        """
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._events = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._events and self._events[0] <= now - self.window:
+            self._events.popleft()
+
+    def try_acquire(self):
+        """Kota varsa bir hak tüketir ve True döner."""
+        if not self.limit:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if len(self._events) >= self.limit:
+                return False
+            self._events.append(now)
+            return True
+
+    def available(self):
+        """Şu an kullanılabilir hak sayısı (sınırsızsa None)."""
+        if not self.limit:
+            return None
+        with self._lock:
+            self._expire(time.monotonic())
+            return self.limit - len(self._events)
+
+    def retry_after(self):
+        """Bir sonraki hakkın açılmasına kalan süre (kota varsa 0)."""
+        if not self.limit:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if len(self._events) < self.limit:
+                return 0.0
+            return max(0.0, self._events[0] + self.window - now)
+
+    def export_state(self):
+        """Penceredeki işlemlerin duvar saati zamanları (yeniden başlatmada kota korunur)."""
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            self._expire(now)
+            return [round(wall - (now - event), 3) for event in self._events]
+
+    def restore_state(self, timestamps):
+        """export_state() çıktısını uygular; pencere dışına düşmüş kayıtlar atılır."""
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            self._events = deque(sorted(now - (wall - stamp) for stamp in timestamps if wall - stamp < self.window))
+
+    def snapshot(self):
+        """Durum özeti (dashboard/loglama için)."""
+        return {
+            "limit": self.limit,
+            "available": self.available(),
+            "retry_after": round(self.retry_after(), 1)
+        }
@@ -0,0 +1,132 @@
+"""
+scheduler_state.py
+==================
+Zamanlayıcı sürecinin yeniden başlatmada korunan durumu (data/scheduler_state.json).
+
+    {
+        "saved_at": 1769076000.0,
+        "api": {"Twitter/default": {"breaker": {...}, "limiter": [...]}},   # Devre ve kota
+        "in_flight": [42],                                                 # Gönderilmekte olan postlar
+        "tracker": {"last_pass": 1769075400.0, "last_archive": ..., "pending": [7, 8]}
+    }
+
+- Devre kesici ve kota pencereleri kapanışta yazılır, açılışta geri yüklenir;
+  yeniden başlatma açık devreyi kapatmaz ve günlük kotayı sıfırlamaz
+- ``in_flight``: platforma gönderilmeden hemen önce post ID'si yazılır, sonuç
+  posts.json'a işlenince silinir. Açılışta hâlâ listede olan pending bir post
+  için gönderimin platforma ulaşıp ulaşmadığı bilinemez; tekrar gönderip
+  kopya üretmek yerine ``StaleClaim`` hatasıyla dead-letter kuyruğuna alınır.
+  Süreç çalışırken gönderim beklenmedik bir hatayla kesilirse post aynı
+  sebeple ``PublishInterrupted`` hatasıyla dead-letter'a alınır; bu da
+  yazılamazsa sahiplenme bırakılmaz ve post bu süreçte tekrar gönderilmez
+- ``tracker``: son metrik turunun zamanı ve yarıda kalan turun kalan post
+  ID'leri; açılışta tam tur baştan yapılmaz, kalan kısımdan devam edilir
+
+Dosya her yazımda benzersiz geçici dosya + fsync + ``os.replace`` ile değiştirilir.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from src.atomic_file import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+SCHEDULER_STATE_FILE = os.getenv('SCHEDULER_STATE_FILE', os.path.join(DATA_DIR, 'scheduler_state.json'))
+
+STALE_CLAIM_ERROR = {
+    "error_class": "StaleClaim",
+    "status_code": None,
+    "message": "Süreç gönderim sırasında durdu; platforma ulaşıp ulaşmadığı bilinmiyor",
+    "transient": False
+}
+
+
+def interrupted_publish_error(exc):
+    """Gönderim sahiplenildikten sonra beklenmedik hatayla kesildiğinde kaydedilen hata."""
+    return {
+        "error_class": "PublishInterrupted",
+        "status_code": None,
+        "message": f"Gönderim beklenmedik hatayla kesildi ({type(exc).__name__}: {exc}); "
+                   f"platforma ulaşıp ulaşmadığı bilinmiyor",
+        "transient": False
+    }
+
+
+class SchedulerState:
+    """Süreç durumunu JSON dosyasında tutan küçük, thread-safe depo."""
+
+    def __init__(self, path=None):
+        self.path = path or SCHEDULER_STATE_FILE
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Zamanlayıcı durumu okunamadı, boş başlanıyor: {e}")
+            return {}
+
+    def _save(self):
+        # Benzersiz geçici dosya: aynı dosyayı yazan başka instance/süreçle çakışmaz
+        self._data["saved_at"] = time.time()
+        atomic_write_json(self.path, self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def update(self, **values):
+        """Verilen anahtarları günceller ve dosyayı yazar."""
+        with self._lock:
+            self._data.update(values)
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Gönderim sahiplenmeleri
+    # ------------------------------------------------------------------
+    def claim(self, post_id):
+        """Post platforma gönderilmeden önce çağrılır (kayıt diske yazılır)."""
+        with self._lock:
+            in_flight = self._data.setdefault("in_flight", [])
+            if post_id not in in_flight:
+                in_flight.append(post_id)
+                self._save()
+
+    def release(self, post_id):
+        """Gönderim sonucu posts.json'a işlendikten (veya gönderim yapılmadan vazgeçildikten) sonra çağrılır."""
+        with self._lock:
+            in_flight = self._data.get("in_flight", [])
+            if post_id in in_flight:
+                in_flight.remove(post_id)
+                self._save()
+
+    def is_claimed(self, post_id):
+        """Post sonucu yazılmamış bir gönderim tarafından sahiplenilmiş mi?"""
+        with self._lock:
+            return post_id in self._data.get("in_flight", ())
+
+    def claims(self):
+        """Önceki süreçten kalan (sonucu yazılmamış) sahiplenmeler."""
+        with self._lock:
+            return list(self._data.get("in_flight", []))
+
+    def clear_claims(self, post_ids):
+        """Çözümlenen sahiplenmeleri listeden çıkarır."""
+        post_ids = set(post_ids)
+        with self._lock:
+            self._data["in_flight"] = [post_id for post_id in self._data.get("in_flight", []) if post_id not in post_ids]
+            self._save()
+
+
+# Zamanlayıcı ve performans takipçisinin paylaştığı durum dosyası
+scheduler_state = SchedulerState()
@@ -0,0 +1,235 @@
+"""
+search.py
+=========
+Post içeriğinde tam metin arama (bellekte ters indeks + BM25 sıralama).
+
+Metin Türkçe kurallarıyla küçültülür (I -> ı, İ -> i) ve aksanlar sadeleştirilir
+(ı -> i, ş -> s, ğ -> g ...); böylece "İSTANBUL", "istanbul" ve "Istanbul"
+aynı terime düşer, Türkçe klavyesi olmayan kullanıcı da "guncelleme" yazarak
+"güncelleme"yi bulur.
+
+İndeks ContentManager tarafından tutulur: ilk aramada çalışma kümesi ve arşiv
+bir kez okunur, sonrasında ``add_post`` ve durum güncellemeleri indekse
+doğrudan uygulanır. Başka bir süreç/instance posts.json'a yazdıysa bir sonraki
+aramada yalnızca içeriği değişen postlar yeniden indekslenir.
+
+Sorgudaki tüm terimleri içeren postlar döner (son terim önek olarak da
+eşleşir: "kampa" -> "kampanya"); sonuçlar BM25 puanına göre sıralanır.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+
+from src.fingerprint import normalize
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# BM25 parametreleri
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Son terimin önek olarak genişletileceği en fazla terim sayısı
+MAX_PREFIX_TERMS = 50
+
+
+# Türkçe harflerin sadeleştirilmesi tek bir translate ile yapılır; başka aksanlı
+# karakter kalırsa (é, ñ ...) NFKD ile genel yola düşülür
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def tokenize(text):
+    """Türkçe duyarlı küçültme ve aksan sadeleştirmesiyle terim listesi."""
+    text = normalize(text).translate(_FOLD)
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return _WORD_RE.findall(text)
+
+
+class SearchDoc:
+    """İndeksteki bir post: sonuç ve filtreleme için gereken alanlar."""
+
+    __slots__ = ('id', 'content', 'platform', 'account', 'status', 'schedule_time', 'length', 'archived')
+
+    def __init__(self, post, length, archived):
+        self.id = post.id
+        self.content = post.content
+        self.length = length
+        self.archived = archived
+        self.update(post)
+
+    def update(self, post):
+        self.platform = post.platform
+        self.account = post.account
+        self.status = post.status
+        self.schedule_time = post.schedule_time
+
+    def to_dict(self, score):
+        return {
+            "id": self.id,
+            "score": round(score, 4),
+            "content": self.content,
+            "platform": self.platform,
+            "account": self.account,
+            "status": self.status,
+            "schedule_time": self.schedule_time.strftime("%Y-%m-%d %H:%M") if self.schedule_time else None,
+            "archived": self.archived
+        }
+
+
+class SearchIndex:
+    """Terim -> {post_id: terim frekansı} ters indeksi."""
+
+    def __init__(self):
+        self._postings = {}
+        self._docs = {}
+        self._total_length = 0
+        self._terms = None  # Önek araması için sıralı terim listesi (ihtiyaç olunca kurulur)
+        self._norms = None  # post_id -> BM25 uzunluk normu (ekleme/çıkarmada geçersizleşir)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, post_id):
+        return post_id in self._docs
+
+    def add(self, post, archived=False):
+        """
+        Postu ekler; zaten varsa ve içeriği değişmediyse yalnızca durum/platform
+        bilgisini günceller (yeniden token'lara ayırmaz).
+        """
+        doc = self._docs.get(post.id)
+        if doc is not None and doc.content == post.content:
+            doc.update(post)
+            doc.archived = archived or doc.archived
+            return
+        if doc is not None:
+            self.remove(post.id)
+
+        counts = {}
+        for term in tokenize(post.content):
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = postings = {}
+                self._terms = None
+            postings[post.id] = count
+        length = sum(counts.values())
+        self._docs[post.id] = SearchDoc(post, length, archived)
+        self._total_length += length
+        self._norms = None
+
+    def remove(self, post_id):
+        doc = self._docs.pop(post_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        self._norms = None
+        for term in set(tokenize(doc.content)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(post_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._terms = None
+
+    def sync(self, posts, archived=False):
+        """
+        İndeksi post listesiyle eşitler (başka bir yazıcının değişiklikleri için).
+        Aynı gruptaki (çalışma kümesi ya da arşiv) listede olmayan postlar çıkarılır.
+        """
+        seen = set()
+        for post in posts:
+            seen.add(post.id)
+            self.add(post, archived=archived)
+        stale = [post_id for post_id, doc in self._docs.items() if doc.archived == archived and post_id not in seen]
+        for post_id in stale:
+            self.remove(post_id)
+
+    def _length_norms(self):
+        """BM25'in doküman uzunluğu normu; tüm postlar için bir kez hesaplanır."""
+        if self._norms is None:
+            avg_length = self._total_length / len(self._docs) or 1.0
+            scale, base = BM25_K1 * BM25_B / avg_length, BM25_K1 * (1 - BM25_B)
+            self._norms = {post_id: base + scale * doc.length for post_id, doc in self._docs.items()}
+        return self._norms
+
+    def _expand_prefix(self, prefix):
+        """Önekle başlayan terimler (sıralı listede ikili arama)."""
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        start = bisect.bisect_left(self._terms, prefix)
+        matches = []
+        for term in self._terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def search(self, query, limit=20, platform=None, status=None, include_archive=True):
+        """
+        Sorgudaki tüm terimleri içeren postları BM25 puanına göre döndürür.
+
+        Returns:
+            list[dict]: En yüksek puanlı ``limit`` sonuç
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._docs:
+            return []
+
+        # Her sorgu terimi için eşleşen indeks terimleri (son terim önek olarak da)
+        groups = [[term] if term in self._postings else [] for term in terms[:-1]]
+        last = terms[-1]
+        groups.append(list(dict.fromkeys(([last] if last in self._postings else []) + self._expand_prefix(last))))
+        if not all(groups):
+            return []
+
+        # Her grubun post kümesi; kesişim en küçük kümeden başlanarak alınır
+        matched = []
+        for group in groups:
+            if len(group) == 1:
+                matched.append(self._postings[group[0]].keys())
+            else:
+                ids = set()
+                for term in group:
+                    ids.update(self._postings[term])
+                matched.append(ids)
+        matched.sort(key=len)
+        candidates = set(matched[0])
+        for ids in matched[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                return []
+
+        docs = self._docs
+        if platform or status or not include_archive:
+            candidates = [
+                post_id for post_id in candidates
+                if (not platform or docs[post_id].platform == platform)
+                and (not status or docs[post_id].status == status)
+                and (include_archive or not docs[post_id].archived)
+            ]
+
+        doc_count = len(docs)
+        norms = self._length_norms()
+        scores = dict.fromkeys(candidates, 0.0)
+        k1_plus = BM25_K1 + 1
+        for group in groups:
+            for term in group:
+                postings = self._postings[term]
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5)) * k1_plus
+                if len(group) == 1:
+                    # Tek terimli grup: her aday bu terimi içerir (kesişim)
+                    for post_id in scores:
+                        tf = postings[post_id]
+                        scores[post_id] += idf * tf / (tf + norms[post_id])
+                else:
+                    for post_id in scores.keys() & postings.keys():
+                        tf = postings[post_id]
+                        scores[post_id] += idf * tf / (tf + norms[post_id])
+
+        best = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        return [docs[post_id].to_dict(scores[post_id]) for post_id in best]
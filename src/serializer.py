@@ -0,0 +1,229 @@
+"""
+serializer.py
+=============
+Post deposunun (posts.json) disk formatı: JSON veya MessagePack, isteğe
+bağlı gzip/zstd sıkıştırmasıyla.
+
+Yazma formatı ``.env`` ile seçilir; okuma her zaman dosyanın ilk
+byte'larından formatı tanır, bu yüzden mevcut posts.json dosyaları olduğu
+gibi okunur ve format değiştirildiğinde dosya ilk yazımda yeni formata geçer:
+
+    STORE_FORMAT=msgpack         # json (varsayılan) veya msgpack
+    STORE_COMPRESSION=zstd       # none (varsayılan), gzip veya zstd
+    STORE_JSON_INDENT=0          # JSON girintisi (0: boşluksuz, küçük dosya)
+
+Tanıma: gzip ``1f 8b``, zstd ``28 b5 2f fd`` ile başlar; açıldıktan sonra
+``[`` JSON dizisi, ``0x90-0x9f`` / ``0xdc`` / ``0xdd`` MessagePack dizisidir.
+
+MessagePack için ``msgpack``, zstd için ``zstandard`` paketi gerekir; kurulu
+değilse bu format seçildiğinde veya böyle bir dosya okunduğunda açık bir hata
+verilir (dosya bozuk sayılıp sıfırlanmaz).
+"""
+
+import gzip
+import io
+import json
+import os
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # Opsiyonel: yalnızca STORE_FORMAT=msgpack için gerekir
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Opsiyonel: yalnızca STORE_COMPRESSION=zstd için gerekir
+    zstandard = None
+
+FORMATS = ('json', 'msgpack')
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+STORE_FORMAT = os.getenv('STORE_FORMAT', 'json')
+STORE_COMPRESSION = os.getenv('STORE_COMPRESSION', 'none')
+STORE_JSON_INDENT = int(os.getenv('STORE_JSON_INDENT', '4'))
+GZIP_LEVEL = int(os.getenv('STORE_GZIP_LEVEL', '6'))
+ZSTD_LEVEL = int(os.getenv('STORE_ZSTD_LEVEL', '3'))
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_MSGPACK_ARRAY = frozenset(range(0x90, 0xa0)) | {0xdc, 0xdd}
+_WHITESPACE = b' \t\r\n'
+
+
+class StoreFormatError(Exception):
+    """Seçilen veya dosyada bulunan format bu ortamda kullanılamıyor (eksik paket, bilinmeyen ad)."""
+
+
+class CorruptStoreError(ValueError):
+    """Dosya tanınan formatta ama çözülemiyor (yarım/bozuk içerik)."""
+
+
+def _require(module, package, purpose):
+    if module is None:
+        raise StoreFormatError(f"{purpose} için '{package}' paketi gerekli: pip install {package}")
+    return module
+
+
+def detect(head):
+    """
+    Dosyanın ilk byte'larından (format, sıkıştırma) tahmini.
+
+    Sıkıştırılmış dosyalarda format ``None`` döner; içerik açıldıktan sonra
+    yeniden ``detect`` çağrılır.
+    """
+    if head.startswith(_GZIP_MAGIC):
+        return None, 'gzip'
+    if head.startswith(_ZSTD_MAGIC):
+        return None, 'zstd'
+    stripped = head.lstrip(_WHITESPACE)
+    if stripped[:1] and stripped[0] in _MSGPACK_ARRAY:
+        return 'msgpack', 'none'
+    return 'json', 'none'
+
+
+def _decompress(data, compression):
+    try:
+        if compression == 'gzip':
+            return gzip.decompress(data)
+        if compression == 'zstd':
+            return _require(zstandard, 'zstandard', "zstd sıkıştırılmış depo").ZstdDecompressor().decompress(data)
+    except (OSError, EOFError, zlib.error) as e:
+        raise CorruptStoreError(f"{compression} açılamadı: {e}") from e
+    except Exception as e:
+        if zstandard is not None and isinstance(e, zstandard.ZstdError):
+            raise CorruptStoreError(f"zstd açılamadı: {e}") from e
+        raise
+    return data
+
+
+def load_records(data):
+    """
+    Dosya içeriğini (byte) kayıt listesine çevirir; format otomatik tanınır.
+
+    Raises:
+        json.JSONDecodeError / CorruptStoreError: İçerik bozuksa
+        StoreFormatError: Format için gereken paket kurulu değilse
+    """
+    fmt, compression = detect(data[:4])
+    if compression != 'none':
+        data = _decompress(data, compression)
+        fmt, _ = detect(data[:16])
+    if not data.strip(_WHITESPACE):
+        return []
+    if fmt == 'msgpack':
+        unpackb = _require(msgpack, 'msgpack', "MessagePack depo").unpackb
+        try:
+            return unpackb(data, raw=False)
+        except (ValueError, msgpack.exceptions.UnpackException) as e:
+            raise CorruptStoreError(f"MessagePack çözülemedi: {e}") from e
+    return json.loads(data)
+
+
+def _iter_json_array(f, chunk_size=64 * 1024):
+    """
+    Dosyadaki JSON dizisinin elemanlarını, tüm belgeyi belleğe almadan
+    parça parça okuyarak tek tek döndürür.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = buf.find('[')
+    if pos < 0:
+        return
+    pos += 1
+    eof = False
+
+    while True:
+        # Elemanlar arasındaki boşluk ve virgülleri atla
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                return
+            buf = f.read(chunk_size)
+            pos = 0
+            eof = not buf
+            continue
+        if buf[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Eleman tampon sınırında bölünmüş: bir parça daha oku
+            more = f.read(chunk_size)
+            if not more:
+                raise
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+
+        yield item
+        pos = end
+        if pos > chunk_size:
+            buf = buf[pos:]
+            pos = 0
+
+
+def iter_records(f):
+    """
+    İkili modda açılmış depo dosyasındaki kayıtları tüm belgeyi belleğe
+    almadan tek tek döndürür (sıkıştırılmış dosyalar akış halinde açılır).
+    """
+    if not isinstance(f, io.BufferedReader):
+        f = io.BufferedReader(f)
+    _, compression = detect(f.peek(4)[:4])
+    if compression == 'gzip':
+        f = io.BufferedReader(gzip.GzipFile(fileobj=f))
+    elif compression == 'zstd':
+        reader = _require(zstandard, 'zstandard', "zstd sıkıştırılmış depo").ZstdDecompressor().stream_reader(f)
+        f = io.BufferedReader(reader)
+
+    fmt, _ = detect(f.peek(16)[:16])
+    if fmt == 'msgpack':
+        unpacker = _require(msgpack, 'msgpack', "MessagePack depo").Unpacker(f, raw=False)
+        for _ in range(unpacker.read_array_header()):
+            yield unpacker.unpack()
+        return
+
+    yield from _iter_json_array(io.TextIOWrapper(f, encoding='utf-8'))
+
+
+class StoreSerializer:
+    """Depo kayıtlarını seçilen formatta byte dizisine çevirir."""
+
+    def __init__(self, format=STORE_FORMAT, compression=STORE_COMPRESSION, json_indent=STORE_JSON_INDENT):
+        if format not in FORMATS:
+            raise StoreFormatError(f"Bilinmeyen depo formatı: {format} (seçenekler: {', '.join(FORMATS)})")
+        if compression not in COMPRESSIONS:
+            raise StoreFormatError(f"Bilinmeyen sıkıştırma: {compression} (seçenekler: {', '.join(COMPRESSIONS)})")
+        if format == 'msgpack':
+            _require(msgpack, 'msgpack', "STORE_FORMAT=msgpack")
+        if compression == 'zstd':
+            _require(zstandard, 'zstandard', "STORE_COMPRESSION=zstd")
+        self.format = format
+        self.compression = compression
+        self.json_indent = json_indent or None
+
+    @property
+    def name(self):
+        """Loglama/benchmark için kısa ad (ör. 'msgpack+zstd')."""
+        return self.format if self.compression == 'none' else f"{self.format}+{self.compression}"
+
+    def dumps(self, records):
+        """Kayıt listesini dosyaya yazılacak byte dizisine çevirir."""
+        if self.format == 'msgpack':
+            data = msgpack.packb(records, use_bin_type=True)
+        else:
+            separators = None if self.json_indent else (',', ':')
+            data = json.dumps(records, indent=self.json_indent, ensure_ascii=False,
+                              separators=separators).encode('utf-8')
+
+        if self.compression == 'gzip':
+            return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return data
+
+    def __repr__(self):
+        return f"StoreSerializer({self.name})"
@@ -0,0 +1,417 @@
+"""
+series.py
+=========
+Tekrarlayan post serileri (RRULE tabanlı).
+
+Bir seri tek bir kayıt olarak saklanır (data/series.json): içerik, platform,
+başlangıç zamanı ve RFC 5545 RRULE kuralı (ör. ``FREQ=DAILY;COUNT=365``).
+Seri ne kadar uzun olursa olsun önceden post üretilmez; yalnızca bir sonraki
+tekrar zamanı (``next_occurrence``) tutulur. Zamanlayıcı, tekrar zamanı ön
+hazırlık penceresine girdiğinde tek bir somut post oluşturur ve seriyi bir
+sonraki tekrara ilerletir.
+
+Depolama ve zamanlayıcı turu maliyeti serinin uzunluğuna değil, seri
+sayısına bağlıdır: kural son üretilen tekrardan başlatılarak önbelleğe alınır,
+her turda başlangıçtan beri geçmiş tekrarlar yeniden hesaplanmaz.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+from dateutil.rrule import rrule as RRule, rrulestr
+
+from src.accounts import DEFAULT_ACCOUNT, normalize_account
+from src.atomic_file import atomic_write_json
+from src.models import SCHEDULE_FORMAT, format_datetime, intern_value, parse_datetime
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+SERIES_FILE = os.getenv('SERIES_FILE', os.path.join(DATA_DIR, 'series.json'))
+# Servis kapalıyken kaçırılan tekrarlar bu süreden eskiyse gönderilmez, atlanır
+SERIES_MISSED_GRACE = int(os.getenv('SERIES_MISSED_GRACE', '3600'))
+
+# Dashboard'daki basit sıklık seçenekleri
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY', 'HOURLY')
+
+
+class SeriesStatus:
+    """Seri durumları."""
+    ACTIVE = 'active'
+    CANCELLED = 'cancelled'
+    FINISHED = 'finished'  # Kuraldaki tüm tekrarlar üretildi
+
+
+class InvalidRuleError(ValueError):
+    """RRULE çözümlenemedi veya hiç tekrar üretmiyor."""
+
+
+def build_rule(frequency, interval=1, count=None, until=None):
+    """
+    Dashboard alanlarından RRULE metni üretir.
+
+    Args:
+        frequency (str): DAILY/WEEKLY/MONTHLY/YEARLY/HOURLY
+        interval (int): Kaç birimde bir
+        count (int): Toplam tekrar sayısı (opsiyonel)
+        until (datetime): Son tekrar zamanı (opsiyonel)
+    """
+    frequency = (frequency or '').upper()
+    if frequency not in FREQUENCIES:
+        raise InvalidRuleError(f"Geçersiz sıklık: {frequency}")
+    parts = [f"FREQ={frequency}", f"INTERVAL={max(1, int(interval or 1))}"]
+    if count:
+        parts.append(f"COUNT={int(count)}")
+    if until:
+        parts.append(f"UNTIL={until.strftime('%Y%m%dT%H%M%S')}")
+    return ';'.join(parts)
+
+
+def _parse_start(value):
+    """Başlangıç zamanını dakika hassasiyetinde çözer; geçersizse InvalidRuleError."""
+    dtstart = parse_datetime(value)
+    if dtstart is None:
+        raise InvalidRuleError(f"Geçersiz başlangıç zamanı: {value!r}")
+    return dtstart.replace(second=0, microsecond=0)
+
+
+def parse_rule(rule, dtstart):
+    """
+    RRULE metnini dtstart ile çözümler.
+
+    Raises:
+        InvalidRuleError: Kural geçersizse, saniyelik ise veya hiç tekrar üretmiyorsa
+    """
+    text = (rule or '').strip()
+    if text.upper().startswith('RRULE:'):
+        text = text[6:]
+    if 'FREQ=SECONDLY' in text.upper():
+        raise InvalidRuleError("Saniyelik tekrar desteklenmiyor")
+    try:
+        parsed = rrulestr(text, dtstart=dtstart)
+    except (ValueError, TypeError) as e:
+        raise InvalidRuleError(f"Geçersiz kural: {e}") from e
+    if parsed.after(dtstart, inc=True) is None:
+        raise InvalidRuleError("Kural hiç tekrar üretmiyor")
+    return parsed
+
+
+class Series:
+    """Tek bir tekrarlayan post serisi."""
+
+    __slots__ = ('id', 'content', 'platform', 'rule', 'dtstart', 'next_occurrence', 'status',
+                 'media', 'account', 'created_at', 'materialized', 'last_materialized_at', '_rrule', '_anchor')
+
+    def __init__(self, id, content, platform, rule, dtstart, next_occurrence=None,
+                 status=SeriesStatus.ACTIVE, media=None, account=None, created_at=None, materialized=0,
+                 last_materialized_at=None):
+        self.id = id
+        self.content = content
+        self.platform = intern_value(platform)
+        self.rule = rule
+        self.dtstart = parse_datetime(dtstart)
+        self.next_occurrence = parse_datetime(next_occurrence)
+        self.status = status
+        self.media = list(media) if media else []
+        self.account = account  # None: varsayılan hesap
+        self.created_at = parse_datetime(created_at)
+        self.materialized = materialized  # Üretilen post sayısı
+        self.last_materialized_at = parse_datetime(last_materialized_at)
+        self._rrule = None
+        self._anchor = None  # _rrule'un başlangıcı (dtstart veya son üretilen tekrar)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=data.get('id'),
+            content=data.get('content', ''),
+            platform=data.get('platform'),
+            rule=data.get('rule'),
+            dtstart=data.get('dtstart'),
+            next_occurrence=data.get('next_occurrence'),
+            status=data.get('status', SeriesStatus.ACTIVE),
+            media=data.get('media'),
+            account=data.get('account'),
+            created_at=data.get('created_at'),
+            materialized=data.get('materialized', 0),
+            last_materialized_at=data.get('last_materialized_at')
+        )
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "content": self.content,
+            "platform": self.platform,
+            "rule": self.rule,
+            "dtstart": format_datetime(self.dtstart, SCHEDULE_FORMAT),
+            "next_occurrence": format_datetime(self.next_occurrence, SCHEDULE_FORMAT),
+            "status": self.status,
+            "created_at": format_datetime(self.created_at),
+            "materialized": self.materialized,
+            "last_materialized_at": format_datetime(self.last_materialized_at, SCHEDULE_FORMAT)
+        }
+        if self.media:
+            data["media"] = list(self.media)
+        if self.account is not None:
+            data["account"] = self.account
+        return data
+
+    @property
+    def rrule(self):
+        if self._rrule is None:
+            self._rrule = parse_rule(self.rule, self.dtstart)
+            self._anchor = self.dtstart
+        return self._rrule
+
+    def occurrence_after(self, moment, inclusive=False):
+        """
+        moment'tan sonraki ilk tekrar (yoksa None), dakika hassasiyetinde.
+
+        Kural, son üretilen tekrara (last_materialized_at) ulaşıldığında oradan
+        yeniden başlatılır (COUNT kalan tekrar sayısına indirilir); sonraki
+        çağrılar dtstart'tan beri geçmiş tekrarları yeniden üretmez.
+        """
+        if self._anchor is not None and moment < self._anchor:
+            self._rrule = None  # Başlangıçtan önceki an (ör. kural değişti): baştan çöz
+        rule = self.rrule
+        if not isinstance(rule, RRule):
+            occurrence = rule.after(moment, inc=inclusive)
+        else:
+            occurrence, anchor, skipped = None, None, 0
+            limit = self.last_materialized_at
+            for index, candidate in enumerate(rule):
+                if candidate > moment or (inclusive and candidate == moment):
+                    occurrence = candidate
+                    break
+                if limit is not None and candidate <= limit:
+                    anchor, skipped = candidate, index
+            if skipped:
+                count = rule._count
+                self._rrule = rule.replace(dtstart=anchor, count=count - skipped if count else None)
+                self._anchor = anchor
+        return occurrence.replace(second=0, microsecond=0) if occurrence else None
+
+    def upcoming(self, limit=5):
+        """Dashboard için sıradaki birkaç tekrar zamanı."""
+        if self.status != SeriesStatus.ACTIVE or self.next_occurrence is None:
+            return []
+        result, moment = [self.next_occurrence], self.next_occurrence
+        while len(result) < limit:
+            moment = self.occurrence_after(moment)
+            if moment is None:
+                break
+            result.append(moment)
+        return result
+
+    @property
+    def next_occurrence_text(self):
+        return format_datetime(self.next_occurrence, SCHEDULE_FORMAT) or ''
+
+    @property
+    def dtstart_text(self):
+        return format_datetime(self.dtstart, SCHEDULE_FORMAT) or ''
+
+
+class SeriesStore:
+    """data/series.json üzerinde seri kayıtları."""
+
+    def __init__(self, path=SERIES_FILE, missed_grace=SERIES_MISSED_GRACE):
+        self.path = path
+        self.missed_grace = missed_grace
+        self._lock = threading.RLock()
+        self._cache = None
+        self._signature = None
+
+    # ------------------------------------------------------------------
+    # Okuma / yazma
+    # ------------------------------------------------------------------
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def data_version(self):
+        """Seri dosyasının sürüm belirteci (mtime/boyut; dosya okunmaz)."""
+        signature = self._file_signature()
+        return '0' if signature is None else f"{signature[0]:x}-{signature[1]:x}"
+
+    def last_modified(self):
+        """Seri dosyasının son değişiklik zamanı (epoch saniyesi; yoksa None)."""
+        signature = self._file_signature()
+        return None if signature is None else signature[0] / 1e9
+
+    def get_all(self):
+        """Tüm seriler (dosya değişmediyse bellekteki kopya kullanılır)."""
+        with self._lock:
+            signature = self._file_signature()
+            if self._cache is None or signature != self._signature:
+                if signature is None:
+                    records = []
+                else:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        records = json.load(f)
+                self._cache = [Series.from_dict(r) for r in records]
+                self._signature = signature
+            return self._cache
+
+    def get(self, series_id):
+        return next((s for s in self.get_all() if s.id == series_id), None)
+
+    def _save_all(self, series):
+        # Benzersiz geçici dosya: aynı dosyayı yazan başka süreçle çakışmaz
+        atomic_write_json(self.path, [s.to_dict() for s in series], ensure_ascii=False)
+        self._cache = series
+        self._signature = self._file_signature()
+
+    # ------------------------------------------------------------------
+    # Seri işlemleri
+    # ------------------------------------------------------------------
+    def next_due(self):
+        """Aktif serilerin en yakın tekrar zamanı (yoksa None)."""
+        return min((s.next_occurrence for s in self.get_all()
+                    if s.status == SeriesStatus.ACTIVE and s.next_occurrence is not None), default=None)
+
+    def add_series(self, content, platform, rule, dtstart, media=None, account=None, now=None):
+        """
+        Yeni seri ekler.
+
+        Raises:
+            InvalidRuleError: Başlangıç zamanı veya kural geçersizse ya da gelecekte tekrar yoksa
+        """
+        now = now or datetime.now()
+        dtstart = _parse_start(dtstart)
+        with self._lock:
+            series_list = list(self.get_all())
+            series = Series(
+                id=max((s.id for s in series_list), default=0) + 1,
+                content=content,
+                platform=platform,
+                rule=rule,
+                dtstart=dtstart,
+                media=media,
+                account=None if normalize_account(account) == DEFAULT_ACCOUNT else normalize_account(account),
+                created_at=now.replace(microsecond=0)
+            )
+            series.next_occurrence = series.occurrence_after(max(dtstart, now), inclusive=True)
+            if series.next_occurrence is None:
+                raise InvalidRuleError("Kuralın gelecekte tekrarı yok")
+            series_list.append(series)
+            self._save_all(series_list)
+        logger.info("🔁 Seri #%s eklendi (%s), ilk tekrar: %s", series.id, rule, series.next_occurrence_text)
+        return series
+
+    def update_series(self, series_id, content=None, platform=None, rule=None, dtstart=None, now=None):
+        """
+        Serinin içeriğini/platformunu/kuralını değiştirir; kural değişirse
+        sıradaki tekrar şimdiden itibaren yeniden hesaplanır.
+
+        Returns:
+            Series or None: Seri bulunamazsa None
+        """
+        now = now or datetime.now()
+        with self._lock:
+            series_list = list(self.get_all())
+            index = next((i for i, s in enumerate(series_list) if s.id == series_id), None)
+            if index is None:
+                return None
+            # Değişiklikler kopya üzerinde yapılır; kural geçersizse bellekteki seri değişmez
+            series = Series.from_dict(series_list[index].to_dict())
+            if content is not None:
+                series.content = content
+            if platform is not None:
+                series.platform = intern_value(platform)
+            if rule is not None or dtstart is not None:
+                new_rule = rule if rule is not None else series.rule
+                new_start = _parse_start(dtstart) if dtstart else series.dtstart
+                parse_rule(new_rule, new_start)  # Geçersizse hata verir (kopya atılır)
+                series.rule, series.dtstart, series._rrule, series._anchor = new_rule, new_start, None, None
+            if (rule is not None or dtstart is not None) and series.status != SeriesStatus.CANCELLED:
+                # Son üretilen tekrarı tekrar üretmemek için ondan sonrasından başla
+                moment = max(now, series.last_materialized_at or now)
+                series.next_occurrence = series.occurrence_after(moment, inclusive=moment == now)
+                if series.status == SeriesStatus.FINISHED and series.next_occurrence is not None:
+                    series.status = SeriesStatus.ACTIVE
+                elif series.next_occurrence is None and series.status == SeriesStatus.ACTIVE:
+                    series.status = SeriesStatus.FINISHED
+            series_list[index] = series
+            self._save_all(series_list)
+        return series
+
+    def cancel_series(self, series_id):
+        """Seriyi iptal eder (yeni post üretilmez). Bulunamazsa False."""
+        with self._lock:
+            series_list = list(self.get_all())
+            series = next((s for s in series_list if s.id == series_id), None)
+            if series is None:
+                return False
+            series.status = SeriesStatus.CANCELLED
+            series.next_occurrence = None
+            self._save_all(series_list)
+        logger.info("🛑 Seri #%s iptal edildi", series_id)
+        return True
+
+    def materialize_due(self, content_manager, until, existing=(), now=None):
+        """
+        Tekrar zamanı 'until' anına kadar gelmiş aktif seriler için somut post
+        oluşturur ve serileri bir sonraki tekrara ilerletir.
+
+        Args:
+            content_manager: ContentManager instance
+            until (datetime): Bu zamana kadarki tekrarlar üretilir (ön hazırlık ufku)
+            existing (iterable): Zaten var olan pending postlar; aynı (seri, zaman)
+                için ikinci post üretilmez (yarıda kalan turdan sonra)
+            now (datetime): Şimdiki zaman
+
+        Returns:
+            list: Oluşturulan Post nesneleri
+        """
+        now = now or datetime.now()
+        with self._lock:
+            series_list = list(self.get_all())
+            due = [s for s in series_list
+                   if s.status == SeriesStatus.ACTIVE and s.next_occurrence is not None
+                   and s.next_occurrence <= until]
+            if not due:
+                return []
+
+            seen = {(p.series_id, p.schedule_time) for p in existing if p.series_id is not None}
+            stale_before = now - timedelta(seconds=self.missed_grace)
+            created = []
+            for series in due:
+                occurrence = series.next_occurrence
+                if occurrence < stale_before:
+                    # Kaçırılan tekrarlar toplu gönderilmez; ilk güncel tekrara atla
+                    skipped_to = series.occurrence_after(stale_before, inclusive=True)
+                    logger.warning("⏭️ Seri #%s: %s tarihinden beri kaçırılan tekrarlar atlandı",
+                                   series.id, series.next_occurrence_text)
+                    occurrence = skipped_to
+
+                while occurrence is not None and occurrence <= until:
+                    if (series.id, occurrence) not in seen:
+                        try:
+                            created.append(content_manager.add_post(
+                                series.content, series.platform, occurrence,
+                                media=series.media, series_id=series.id,
+                                account=series.account,
+                                on_duplicate='warn'  # Seri postu reddedilmez, yalnızca uyarılır
+                            ))
+                            series.materialized += 1
+                        except ValueError as e:
+                            # Geçersiz tekrar diğer serilerin üretimini durdurmaz; atlanır
+                            logger.error("❌ Seri #%s tekrarı (%s) oluşturulamadı: %s", series.id, occurrence, e)
+                    series.last_materialized_at = occurrence
+                    occurrence = series.occurrence_after(occurrence)
+
+                series.next_occurrence = occurrence
+                if occurrence is None:
+                    series.status = SeriesStatus.FINISHED
+            self._save_all(series_list)
+
+        if created:
+            logger.info("🔁 %d seri tekrarı posta dönüştürüldü", len(created))
+        return created
@@ -0,0 +1,191 @@
+"""
+staging.py
+==========
+Zamanı yaklaşan postlar için gönderim öncesi hazırlık (pre-flight).
+
+Bir post planlanan zamanından ``lead_seconds`` önce hazırlanır:
+    1. İçerik platform kurallarına göre kontrol edilir (sorun varsa erkenden loglanır)
+    2. Platform kimliği yenilenir (Twitter kullanıcı adı, LinkedIn Person URN);
+       bu istek token'ı doğrular ve havuzdaki bağlantıyı açar
+    3. Medya önceden yüklenir; kimlikler içerik özetiyle önbelleğe alınır
+
+Planlanan zamandan ``prewarm_seconds`` önce bağlantı bir kez daha ısıtılır
+(sunucular boştaki bağlantıları kapatabilir). Zamanlayıcı ``next_wakeup``
+ile tam planlanan saniyede uyanır; o anda yalnızca gönderim çağrısı kalır.
+
+Hazırlık ağ çağrıları yaptığından zamanlayıcı onu gönderimden sonra arka plan
+thread'inde çalıştırır ve en fazla ``STAGING_TIMEOUT`` saniye bekler; yavaş
+bir kimlik/medya isteği zamanı gelmiş postların gönderimini geciktirmez.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+from src.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+STAGING_LEAD_SECONDS = int(os.getenv('STAGING_LEAD_SECONDS', '120'))
+STAGING_PREWARM_SECONDS = int(os.getenv('STAGING_PREWARM_SECONDS', '5'))
+# Zamanlayıcı turunun arka plandaki hazırlığı bekleyeceği en uzun süre (saniye)
+STAGING_TIMEOUT = float(os.getenv('STAGING_TIMEOUT', '10'))
+
+
+class StagedPost:
+    """Hazırlanmış bir postun özeti."""
+
+    __slots__ = ('post_id', 'platform', 'account', 'schedule_time', 'staged_at', 'problem', 'armed')
+
+    def __init__(self, post, problem=None, staged_at=None):
+        self.post_id = post.id
+        self.platform = post.platform
+        self.account = post.account
+        self.schedule_time = post.schedule_time
+        self.staged_at = staged_at or datetime.now()
+        self.problem = problem
+        self.armed = False  # Son ısıtma yapıldı mı?
+
+
+class PreflightStager:
+    """PostScheduler için gönderim öncesi hazırlık durumu."""
+
+    def __init__(self, api, lead_seconds=STAGING_LEAD_SECONDS, prewarm_seconds=STAGING_PREWARM_SECONDS,
+                 timeout=STAGING_TIMEOUT):
+        """
+        Args:
+            api: SocialMediaAPI instance
+            lead_seconds (int): Planlanan zamandan kaç saniye önce hazırlanacak
+            prewarm_seconds (int): Planlanan zamandan kaç saniye önce bağlantı yeniden ısıtılacak
+            timeout (float): run() çağrısının hazırlığı bekleyeceği en uzun süre (saniye)
+        """
+        self.api = api
+        self.lead_seconds = lead_seconds
+        self.prewarm_seconds = prewarm_seconds
+        self.timeout = timeout
+        self.staged = {}
+        # staged hem hazırlık thread'inden hem gönderim thread'lerinden (discard) değişir
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def horizon(self, now=None):
+        """Hazırlık penceresinin bitişi (bu zamana kadar planlananlar hazırlanır)."""
+        return (now or datetime.now()) + timedelta(seconds=self.lead_seconds)
+
+    def stage(self, posts, now=None):
+        """
+        Pencereye girmiş ve henüz hazırlanmamış postları hazırlar; artık bekleyen
+        listede olmayan postları bırakır.
+
+        Args:
+            posts (list): Planlanan zamanı horizon() öncesinde olan pending postlar
+            now (datetime): Şimdiki zaman
+
+        Returns:
+            int: Bu çağrıda hazırlanan post sayısı
+        """
+        now = now or datetime.now()
+        live = set()
+        fresh = []
+        with self._lock:
+            for post in posts:
+                live.add(post.id)
+                staged = self.staged.get(post.id)
+                if staged is None or staged.schedule_time != post.schedule_time:
+                    fresh.append(post)
+
+            for post_id in [pid for pid in self.staged if pid not in live]:
+                del self.staged[post_id]
+
+        if not fresh:
+            return 0
+
+        with tracer.start_trace('preflight', posts=len(fresh)):
+            ready = {}
+            for post in fresh:
+                key = (post.platform, post.account)
+                if key not in ready:
+                    ready[key] = self.api.warm_platform(post.platform, account=post.account)
+                    if not ready[key]:
+                        logger.warning("⚠️ %s/%s ön hazırlığı başarısız (kimlik/bağlantı); gönderim anında denenecek",
+                                       post.platform, post.account or 'default', extra={"platform": post.platform})
+
+                problem = self.api.validate_content(post.platform, post.content, post.media, account=post.account)
+                if problem:
+                    logger.warning("⚠️ Post #%s gönderilemeyecek: %s", post.id, problem,
+                                   extra={"post_id": post.id, "platform": post.platform})
+                elif post.media and ready[key]:
+                    self.api.prepare_media(post.platform, post.media, account=post.account)
+                with self._lock:
+                    self.staged[post.id] = StagedPost(post, problem, staged_at=now)
+
+        logger.info("🧰 %d post gönderime hazırlandı", len(fresh))
+        return len(fresh)
+
+    def arm(self, now=None):
+        """Planlanan zamana prewarm_seconds kalmış postların platform/hesaplarını yeniden ısıtır."""
+        now = now or datetime.now()
+        limit = now + timedelta(seconds=self.prewarm_seconds)
+        keys = set()
+        with self._lock:
+            for staged in self.staged.values():
+                if not staged.armed and staged.schedule_time is not None and staged.schedule_time <= limit:
+                    staged.armed = True
+                    keys.add((staged.platform, staged.account))
+        for platform, account in keys:
+            self.api.warm_platform(platform, min_interval=self.prewarm_seconds, account=account)
+        return keys
+
+    def next_wakeup(self, now=None):
+        """
+        Zamanlayıcının bir sonraki uyanma zamanı: ısıtılmamış postlar için
+        (planlanan zaman - prewarm_seconds), ısıtılmışlar için planlanan zaman.
+
+        Returns:
+            datetime or None: Hazırlanmış gelecek post yoksa None
+        """
+        now = now or datetime.now()
+        wakeups = []
+        with self._lock:
+            staged_posts = list(self.staged.values())
+        for staged in staged_posts:
+            if staged.schedule_time is None or staged.schedule_time <= now:
+                continue
+            if staged.armed:
+                wakeups.append(staged.schedule_time)
+            else:
+                wakeups.append(max(now, staged.schedule_time - timedelta(seconds=self.prewarm_seconds)))
+        return min(wakeups) if wakeups else None
+
+    def discard(self, post_id):
+        """Gönderilen postu hazırlık listesinden çıkarır."""
+        with self._lock:
+            self.staged.pop(post_id, None)
+
+    def run(self, posts, now=None):
+        """
+        stage() + arm() çağrılarını arka plan thread'inde çalıştırır ve en fazla
+        ``timeout`` saniye bekler. Önceki hazırlık hâlâ sürüyorsa yenisi başlatılmaz
+        (takılan istekler birikmez); süre dolsa da hazırlık arka planda tamamlanır.
+
+        Returns:
+            bool: Hazırlık süre dolmadan bitti mi?
+        """
+        if self._worker is not None and self._worker.is_alive():
+            logger.warning("⏱️ Önceki ön hazırlık hâlâ sürüyor, bu tur atlandı")
+        else:
+            self._worker = threading.Thread(target=contextvars.copy_context().run,
+                                            args=(self._run, posts, now), name='Preflight', daemon=True)
+            self._worker.start()
+        self._worker.join(max(0.0, self.timeout))
+        return not self._worker.is_alive()
+
+    def _run(self, posts, now):
+        # Ön hazırlık hatası gönderimi engellememeli
+        try:
+            self.stage(posts, now)
+            self.arm()
+        except Exception as e:
+            logger.error(f"⚠️ Ön hazırlık hatası: {e}")
@@ -0,0 +1,275 @@
+"""
+telemetry.py
+============
+Prometheus metin formatında (text exposition 0.0.4) sayaç, gösterge ve
+histogramlar. Harici bağımlılık yoktur; /metrics uç noktası ``registry.render()``
+çıktısını döndürür.
+
+Sıcak yoldaki maliyet bir sözlük okuması ve kilit altında birkaç toplama
+işleminden ibarettir; metin üretimi yalnızca /metrics çağrıldığında yapılır.
+
+Kullanım:
+    from src.telemetry import API_LATENCY
+    with API_LATENCY.labels('Twitter', 'create_tweet').time():
+        ...
+"""
+
+import bisect
+import threading
+import time
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    """Süre ölçüp histograma yazan context manager."""
+
+    __slots__ = ('_child', '_started')
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._started)
+        return False
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+
+class _HistogramChild:
+    __slots__ = ('upper_bounds', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Metric:
+    """Etiketli metrik ailesi; etiket kombinasyonu başına bir alt seri tutar."""
+
+    TYPE = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyordu")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _label_str(self, key, extra=None):
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._sample_lines(key, child))
+        return lines
+
+    def _sample_lines(self, key, child):
+        return [f"{self.name}{self._label_str(key)} {_format_value(child.value)}"]
+
+
+class Counter(_Metric):
+    TYPE = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    TYPE = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    TYPE = 'histogram'
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _sample_lines(self, key, child):
+        with child._lock:
+            counts = list(child.counts)
+            total, count = child.sum, child.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.upper_bounds + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = self._label_str(key, ('le', _format_value(bound)))
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_str(key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{self._label_str(key)} {count}")
+        return lines
+
+
+class Registry:
+    """Tüm metrikleri tutar ve metin formatına çevirir."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# ----------------------------------------------------------------------
+# Uygulama metrikleri
+# ----------------------------------------------------------------------
+SCHEDULE_LAG = registry.histogram(
+    'autoposting_schedule_to_publish_lag_seconds',
+    'Planlanan zaman ile başarılı gönderim arasındaki gecikme',
+    ('platform',),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+PUBLISH_TOTAL = registry.counter(
+    'autoposting_posts_published_total',
+    'Gönderim denemeleri (sonuç: sent/failed/deferred/expired)',
+    ('platform', 'result')
+)
+DUE_POSTS = registry.gauge(
+    'autoposting_due_posts',
+    'Son zamanlayıcı turunda zamanı gelmiş post sayısı'
+)
+API_LATENCY = registry.histogram(
+    'autoposting_api_request_duration_seconds',
+    'Platform API çağrı süresi',
+    ('platform', 'endpoint'),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+API_RETRIES = registry.counter(
+    'autoposting_api_retries_total',
+    'Platform API tekrar denemeleri',
+    ('platform', 'endpoint')
+)
+API_RATE_LIMITED = registry.counter(
+    'autoposting_api_rate_limited_total',
+    'Platform API 429 (rate limit) yanıtları',
+    ('platform', 'endpoint')
+)
+METRICS_REFRESH = registry.counter(
+    'autoposting_metrics_refresh_total',
+    'Metrik güncelleme sonuçları (updated/empty/skipped/error)',
+    ('platform', 'result')
+)
+TRACKER_PASS = registry.histogram(
+    'autoposting_tracker_pass_duration_seconds',
+    'PerformanceTracker tam tur süresi',
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300, 600)
+)
+STORE_READ = registry.histogram(
+    'autoposting_store_read_duration_seconds',
+    'posts.json okuma + ayrıştırma süresi'
+)
+STORE_WRITE = registry.histogram(
+    'autoposting_store_write_duration_seconds',
+    'posts.json yazma süresi'
+)
+STORE_BYTES_WRITTEN = registry.counter(
+    'autoposting_store_bytes_written_total',
+    'posts.json dosyasına yazılan toplam byte'
+)
@@ -0,0 +1,247 @@
+"""
+tracing.py
+==========
+Post gönderim denemeleri için hafif span ağacı (tracing).
+
+Her gönderim denemesi ``tracer.start_trace`` ile bir kök span açar; aynı
+thread'de çağrılan ``tracer.span`` blokları otomatik olarak o denemenin alt
+span'ı olur. Aktif bir trace yoksa ``tracer.span`` hiçbir şey yapmayan ortak
+bir nesne döndürür, bu yüzden ContentManager gibi paylaşılan kodlarda
+maliyetsizdir.
+
+Deneme bittiğinde tüm span'lar logs/traces.jsonl dosyasına satır başına bir
+kayıt olarak yazılır; dosya boyut sınırını aşınca döndürülür (rotation).
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+TRACE_FILE = os.getenv('TRACE_FILE', os.path.join('logs', 'traces.jsonl'))
+TRACE_MAX_BYTES = int(os.getenv('TRACE_MAX_BYTES', str(10 * 1024 * 1024)))
+TRACE_BACKUP_COUNT = int(os.getenv('TRACE_BACKUP_COUNT', '5'))
+
+_current_span = contextvars.ContextVar('autoposting_current_span', default=None)
+
+
+class _NoopSpan:
+    """Aktif trace yokken döndürülen, hiçbir şey yapmayan span."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Tek bir zamanlanmış işlem."""
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attrs', 'started_at',
+                 '_started', 'duration_ms', 'error', '_token')
+
+    def __init__(self, trace, name, parent_id=None, attrs=None):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs or {}
+        self.duration_ms = None
+        self.error = None
+
+    def set(self, key, value):
+        """Span'a özellik ekler (ör. HTTP durum kodu, deneme sayısı)."""
+        self.attrs[key] = value
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.trace.finish(self)
+        return False
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "post_id": self.trace.post_id,
+            "start": datetime.fromtimestamp(self.started_at).isoformat(timespec='milliseconds'),
+            "duration_ms": self.duration_ms,
+            "attrs": self.attrs,
+            "error": self.error
+        }
+
+
+class _Trace:
+    """Bir gönderim denemesine ait span'ları toplar."""
+
+    __slots__ = ('tracer', 'trace_id', 'post_id', 'spans')
+
+    def __init__(self, tracer, post_id):
+        self.tracer = tracer
+        self.trace_id = uuid.uuid4().hex
+        self.post_id = post_id
+        self.spans = []
+
+    def finish(self, span):
+        self.spans.append(span)
+        if span.parent_id is None:
+            self.tracer._write(self)
+
+
+class Tracer:
+    """Span'ları oluşturur ve döndürülen JSONL dosyasına yazar."""
+
+    def __init__(self, path=TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backup_count=TRACE_BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+
+    def start_trace(self, name, post_id=None, **attrs):
+        """Yeni bir trace'in kök span'ını döndürür (with ile kullanılır)."""
+        return Span(_Trace(self, post_id), name, None, attrs)
+
+    def span(self, name, **attrs):
+        """Aktif span'ın altında yeni span açar; aktif trace yoksa no-op döner."""
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP_SPAN
+        return Span(parent.trace, name, parent.span_id, attrs)
+
+    def record(self, name, started_at, duration_ms, **attrs):
+        """
+        Önceden ölçülmüş bir işlemi aktif span'ın altına tamamlanmış span olarak
+        ekler (ör. turun tüm gönderimlerce paylaşılan bekleyen post taraması).
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return
+        span = Span(parent.trace, name, parent.span_id, attrs)
+        span.started_at = started_at
+        span.duration_ms = duration_ms
+        parent.trace.finish(span)
+
+    def current_span(self):
+        """Aktif span (yoksa no-op span)."""
+        return _current_span.get() or _NOOP_SPAN
+
+    def current_trace_id(self):
+        """Aktif trace kimliği (log kayıtlarını trace ile eşlemek için)."""
+        span = _current_span.get()
+        return span.trace.trace_id if span is not None else None
+
+    # ------------------------------------------------------------------
+    # Yazma ve döndürme
+    # ------------------------------------------------------------------
+    def _write(self, trace):
+        lines = ''.join(
+            json.dumps(span.to_dict(), ensure_ascii=False, default=str) + '\n'
+            for span in trace.spans
+        )
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(lines) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+        except OSError as e:
+            print(f"⚠️ Trace yazılamadı: {e}")
+
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    # ------------------------------------------------------------------
+    # Okuma (dashboard)
+    # ------------------------------------------------------------------
+    def _files(self):
+        """Eskiden yeniye trace dosyaları."""
+        paths = [f"{self.path}.{i}" for i in range(self.backup_count, 0, -1)]
+        paths.append(self.path)
+        return [p for p in paths if os.path.exists(p)]
+
+    def get_traces(self, post_id, limit=20):
+        """
+        Bir postun son denemelerini span ağacı olarak döndürür.
+
+        Returns:
+            list: [{'trace_id', 'start', 'duration_ms', 'error', 'spans': [(derinlik, span_dict), ...]}]
+        """
+        traces = {}
+        for path in self._files():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get('post_id') == post_id:
+                        traces.setdefault(record['trace_id'], []).append(record)
+
+        result = []
+        for trace_id, spans in traces.items():
+            roots = [s for s in spans if s.get('parent_id') is None]
+            if not roots:
+                continue
+            root = roots[0]
+            result.append({
+                "trace_id": trace_id,
+                "start": root['start'],
+                "duration_ms": root['duration_ms'],
+                "error": root.get('error'),
+                "spans": self._flatten(root, spans)
+            })
+
+        result.sort(key=lambda t: t['start'], reverse=True)
+        return result[:limit]
+
+    @staticmethod
+    def _flatten(root, spans):
+        children = {}
+        for span in spans:
+            children.setdefault(span.get('parent_id'), []).append(span)
+        for items in children.values():
+            items.sort(key=lambda s: s['start'])
+
+        rows = []
+        stack = [(0, root)]
+        while stack:
+            depth, span = stack.pop()
+            rows.append((depth, span))
+            for child in reversed(children.get(span['span_id'], [])):
+                stack.append((depth + 1, child))
+        return rows
+
+
+tracer = Tracer()
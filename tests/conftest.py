@@ -0,0 +1,14 @@
+"""Testler proje kök dizininden (app, scheduler, src.*) import edebilsin."""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Gönderim izleri ve hata logları logs/ altına değil geçici dizine yazılsın
+_TMP = tempfile.mkdtemp(prefix='autoposting-test-')
+os.environ.setdefault('TRACE_FILE', os.path.join(_TMP, 'traces.jsonl'))
+os.environ.setdefault('LOG_FILE', os.path.join(_TMP, 'app.log'))
@@ -0,0 +1,53 @@
+"""atomic_write: eşzamanlı yazıcılar geçici dosyada çakışmaz, hata hedefi bozmaz."""
+
+import json
+import os
+import threading
+
+import pytest
+
+from src.atomic_file import atomic_write, atomic_write_json
+
+
+def test_concurrent_writers_never_fail(tmp_path):
+    path = str(tmp_path / 'state.json')
+    errors = []
+
+    def writer(n):
+        for i in range(100):
+            try:
+                atomic_write_json(path, {"writer": n, "i": i})
+            except Exception as e:  # pragma: no cover - başarısızlıkta raporlanır
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)["i"] == 99
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def test_failed_write_keeps_target_and_mode(tmp_path, monkeypatch):
+    path = str(tmp_path / 'state.json')
+    atomic_write(path, b'eski')
+    os.chmod(path, 0o640)
+
+    def broken_fsync(fd):
+        raise OSError("disk dolu")
+
+    monkeypatch.setattr(os, 'fsync', broken_fsync)
+    with pytest.raises(OSError):
+        atomic_write(path, b'yeni')
+    monkeypatch.undo()
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'eski'
+    assert os.listdir(tmp_path) == ['state.json']
+
+    atomic_write(path, b'yeni')
+    assert os.stat(path).st_mode & 0o777 == 0o640
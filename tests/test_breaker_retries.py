@@ -0,0 +1,96 @@
+"""
+Her geçici deneme hesabın devre kesicisine işlenir; devre aynı postun
+tekrar denemeleri sırasında açılırsa kalan denemeler yapılmaz ve post
+CircuitOpenError ile ertelenir.
+"""
+
+import pytest
+
+import src.linkedin_publisher as linkedin_module
+import src.post_publisher as twitter_module
+from api_integration import SocialMediaAPI
+from src.circuit_breaker import CircuitOpenError
+from src.linkedin_publisher import LinkedInPublisher
+from src.post_publisher import PostPublisher
+
+
+class DownTwitterClient:
+    def __init__(self):
+        self.calls = 0
+
+    def create_tweet(self, **kwargs):
+        self.calls += 1
+        raise ConnectionError("bağlantı reddedildi")
+
+
+class UnavailableResponse:
+    status_code = 503
+    text = "Service Unavailable"
+
+
+class DownSession:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        return UnavailableResponse()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(twitter_module.time, 'sleep', calls.append)
+    monkeypatch.setattr(linkedin_module.time, 'sleep', calls.append)
+    return calls
+
+
+def _api(monkeypatch, threshold):
+    monkeypatch.setattr(SocialMediaAPI, 'BREAKER_FAILURE_THRESHOLD', threshold)
+    return SocialMediaAPI(enable_twitter=False, enable_linkedin=False)
+
+
+def test_open_circuit_stops_twitter_retries(monkeypatch, sleeps):
+    monkeypatch.setattr(PostPublisher, 'check_api_access', lambda self: None)
+    publisher = PostPublisher(credentials=dict.fromkeys(
+        ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN', 'TWITTER_ACCESS_SECRET'), 'x'))
+    publisher.twitter_client = DownTwitterClient()
+    api = _api(monkeypatch, threshold=2)
+    api.register_publisher('Twitter', publisher)
+
+    with pytest.raises(CircuitOpenError):
+        api.post_to_platform('Twitter', "Devre testi", post_id=1)
+
+    # 3 deneme yerine devreyi açan 2. denemede durulur
+    assert publisher.twitter_client.calls == 2
+    assert sleeps == [10]
+    assert api.get_breaker_states()['Twitter']['failures'] == 2
+
+
+def test_open_circuit_stops_linkedin_retries(monkeypatch, sleeps):
+    publisher = LinkedInPublisher(access_token='token')
+    publisher.person_urn = 'urn'
+    publisher.identity_checked_at = linkedin_module.time.time()
+    publisher.session = DownSession()
+    api = _api(monkeypatch, threshold=1)
+    api.register_publisher('LinkedIn', publisher)
+
+    with pytest.raises(CircuitOpenError):
+        api.post_to_platform('LinkedIn', "Devre testi", post_id=1)
+
+    assert publisher.session.calls == 1
+    assert sleeps == []
+
+
+def test_each_transient_attempt_counts_once(monkeypatch, sleeps):
+    monkeypatch.setattr(PostPublisher, 'check_api_access', lambda self: None)
+    publisher = PostPublisher(credentials=dict.fromkeys(
+        ('TWITTER_API_KEY', 'TWITTER_API_SECRET', 'TWITTER_ACCESS_TOKEN', 'TWITTER_ACCESS_SECRET'), 'x'))
+    publisher.twitter_client = DownTwitterClient()
+    api = _api(monkeypatch, threshold=5)
+    api.register_publisher('Twitter', publisher)
+
+    assert api.post_to_platform('Twitter', "Devre testi", post_id=1) == (False, None)
+
+    assert publisher.twitter_client.calls == 3
+    assert api.get_breaker_states()['Twitter']['failures'] == 3
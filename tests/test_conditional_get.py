@@ -0,0 +1,37 @@
+"""
+Dashboard bellekteki sürümlere (yetenek önbelleği, son olay, hesaplar) de
+bağlı olduğundan yalnızca ETag ile doğrulanır: dosyalar değişmeden bellek
+sürümü değişirse If-Modified-Since eski sayfayı 304 ile döndürmemeli.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as dashboard
+
+FUTURE = "Fri, 01 Jan 2100 00:00:00 GMT"
+
+
+@pytest.fixture
+def client():
+    return TestClient(dashboard.app)
+
+
+def test_index_ignores_if_modified_since(client, monkeypatch):
+    first = client.get("/")
+    assert first.status_code == 200
+    assert "last-modified" not in first.headers
+    assert client.get("/", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    # Yalnızca bellekteki sürüm değişti (dosyalar aynı)
+    monkeypatch.setattr(dashboard.capability_cache, 'version', dashboard.capability_cache.version + 1)
+    response = client.get("/", headers={"If-Modified-Since": FUTURE})
+    assert response.status_code == 200
+    assert client.get("/", headers={"If-None-Match": first.headers["etag"]}).status_code == 200
+
+
+def test_file_backed_api_keeps_last_modified(client):
+    response = client.get("/api/posts")
+    assert response.status_code == 200
+    assert "last-modified" in response.headers
+    assert client.get("/api/posts", headers={"If-Modified-Since": FUTURE}).status_code == 304
@@ -0,0 +1,17 @@
+"""record_failure deneme geçmişini FAILURE_HISTORY ile sınırlar."""
+
+import pytest
+
+from src import dead_letter
+
+
+@pytest.mark.parametrize('history', [1, 3])
+def test_attempt_history_is_bounded(monkeypatch, history):
+    monkeypatch.setattr(dead_letter, 'FAILURE_HISTORY', history)
+    failure = None
+    for status in range(500, 505):
+        failure = dead_letter.record_failure(failure, {"error_class": "ServerError", "status_code": status})
+
+    assert len(failure["attempts"]) == history
+    assert failure["attempts"][-1]["status_code"] == 504
+    assert failure["status_code"] == 504
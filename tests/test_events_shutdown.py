@@ -0,0 +1,62 @@
+"""
+Sunucu kapanışı açık /events (SSE) akışını beklememeli: istemci bağlıyken
+gelen SIGTERM akışı sonlandırır ve sunucu kısa sürede durur.
+"""
+
+import signal
+import threading
+import time
+
+import pytest
+import requests
+
+import app as dashboard
+from src.events import EventBus
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(dashboard, 'event_bus', EventBus())
+    # Yedek zaman aşımı kapalı: akış kapanmazsa sunucu hiç durmaz ve test başarısız olur
+    server = dashboard.create_server(port=0, log_level="warning", timeout_graceful_shutdown=None)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert thread.is_alive() and time.monotonic() < deadline, "Sunucu başlamadı"
+        time.sleep(0.05)
+    yield server, thread
+    server.should_exit = True
+    thread.join(5)
+
+
+def test_shutdown_ends_open_event_stream(server):
+    server, thread = server
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    response = requests.get(f"http://127.0.0.1:{port}/events", stream=True, timeout=10)
+    lines = response.iter_lines(decode_unicode=True)
+    assert next(lines) == "retry: 3000"
+
+    started = time.monotonic()
+    server.handle_exit(signal.SIGTERM, None)
+
+    remaining = list(lines)  # Akış kapanınca iterasyon biter
+    thread.join(5)
+    assert not thread.is_alive(), "Açık SSE bağlantısı sunucu kapanışını bekletiyor"
+    assert time.monotonic() - started < 5
+    assert all(line.startswith(':') or not line for line in remaining)
+    assert not dashboard.event_bus._subscribers
+
+
+def test_new_subscription_after_close_ends_immediately():
+    bus = EventBus()
+
+    async def scenario():
+        bus.close()
+        subscription = bus.subscribe()
+        assert subscription.closed
+        assert await subscription.get(5) is None
+
+    import asyncio
+    asyncio.run(asyncio.wait_for(scenario(), 2))
@@ -0,0 +1,30 @@
+"""Medya önbelleğini aynı dosyaya eşzamanlı yazan instance'lar birbirini düşürmez."""
+
+import os
+import threading
+
+from src.media import MediaCache
+
+
+def test_concurrent_puts_from_two_caches(tmp_path):
+    path = str(tmp_path / 'media_cache.json')
+    caches = [MediaCache(path), MediaCache(path)]
+    errors = []
+
+    def worker(cache, base):
+        try:
+            for i in range(base, base + 50):
+                cache.put('Twitter', 'hesap', f"özet-{i}", str(i), ttl=3600)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(caches[i % 2], i * 100)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
+    # Son yazan instance'ın tüm kayıtları (her biri 100 kayıt tutar) diskte
+    assert len(MediaCache(path)._load()) == 100
@@ -0,0 +1,68 @@
+"""
+Outbox dağıtıcısı yerel webhook alıcısına (tools/outbox_sink.py) karşı:
+503/429 hataları altında tüm olaylar teslim edilir, tekrar ve sıra ihlali olmaz.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+import src.outbox as outbox_module
+from src.content_manager import ContentManager
+from src.events import EventBus
+from src.outbox import Outbox, OutboxDispatcher
+from tools.outbox_sink import SinkConfig, serve
+
+
+@pytest.fixture
+def sink():
+    server = serve(SinkConfig(latency_ms=2, error_5xx=0.25, error_429=0.1, retry_after=0, seed=7), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_events_are_delivered_once_and_in_order(tmp_path, sink, monkeypatch):
+    monkeypatch.setattr(outbox_module, 'OUTBOX_LINGER', 0.02)
+    monkeypatch.setattr(outbox_module, 'OUTBOX_MAX_BACKOFF', 0.05)
+    cm = ContentManager(db_path=str(tmp_path / 'posts.json'), archive_dir=str(tmp_path / 'archive'),
+                        duplicate_policy='off', events=EventBus(),
+                        outbox=Outbox(enabled=True, thresholds='likes:1,likes:10'))
+    retries = outbox_module.OUTBOX_BATCHES.labels('retry')
+    retries_before = retries.value
+    dispatcher = OutboxDispatcher(cm, url=f"{sink}/events", batch_size=7)
+    thread = threading.Thread(target=dispatcher.start, daemon=True)
+    thread.start()
+
+    expected = 0
+    for i in range(30):
+        post = cm.add_post(f"Outbox postu {i}", "Twitter", datetime.now() + timedelta(minutes=1))
+        if i % 3 == 0:
+            cm.update_post_after_send(post.id, None, status="failed",
+                                      error={"error_class": "ServerError", "status_code": 503})
+            expected += 1
+        else:
+            cm.update_post_after_send(post.id, f"api-{post.id}", status="sent")
+            cm.update_metrics(post.id, {"likes": 5})
+            cm.update_metrics(post.id, {"likes": 20})
+            expected += 3  # post.sent + iki eşik (likes:1, likes:10)
+
+    deadline = time.monotonic() + 30
+    while cm.get_outbox() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert dispatcher.drain(5)
+    thread.join(5)
+
+    stats = requests.get(f"{sink}/_sink/stats", timeout=5).json()
+    assert cm.get_outbox() == []
+    assert stats["events"] == expected
+    assert stats["duplicates"] == 0
+    assert stats["out_of_order"] == 0
+    assert stats["by_type"] == {"post.sent": 20, "post.failed": 10, "post.engagement": 40}
+    # Hata enjeksiyonu gerçekten tekrar denemeye yol açmış olmalı
+    assert retries.value > retries_before
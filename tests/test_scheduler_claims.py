@@ -0,0 +1,101 @@
+"""
+Sahiplenilmiş gönderim beklenmedik hatayla kesilirse post tekrar
+gönderilmez (platforma ulaşmış olabilir); dead-letter kuyruğuna alınır.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.common import FakeLinkedInPublisher, FakeTwitterPublisher
+from scheduler import PostScheduler
+from src.content_manager import ContentManager
+from src.events import EventBus
+from src.models import PostStatus
+from src.scheduler_state import SchedulerState
+from src.series import SeriesStore
+
+
+class CountingPublisher(FakeTwitterPublisher):
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def post_to_twitter(self, content, post_id=None, media=None, retry_gate=None):
+        self.sent.append(post_id)
+        return super().post_to_twitter(content, post_id, media)
+
+
+@pytest.fixture
+def setup(tmp_path):
+    cm = ContentManager(db_path=str(tmp_path / 'posts.json'), archive_dir=str(tmp_path / 'archive'),
+                        duplicate_policy='off', events=EventBus())
+    publisher = CountingPublisher()
+    state = SchedulerState(str(tmp_path / 'state.json'))
+    scheduler = PostScheduler(cm, publisher, FakeLinkedInPublisher(), series_store=SeriesStore(str(tmp_path / 's.json')),
+                              state=state)
+    post = cm.add_post("Sahiplenme testi", "Twitter", datetime.now() - timedelta(seconds=5))
+    return cm, publisher, state, scheduler, post
+
+
+def _fail_after_publish(cm, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("kayıt hatası")
+    monkeypatch.setattr(cm, 'update_post_after_send', broken)
+
+
+def test_error_after_publish_moves_post_to_dead_letter(setup, monkeypatch):
+    cm, publisher, state, scheduler, post = setup
+    _fail_after_publish(cm, monkeypatch)
+
+    scheduler._check_and_send_posts()
+    scheduler._check_and_send_posts()
+
+    assert publisher.sent == [post.id]
+    stored = cm.get_all_posts()[0]
+    assert stored.status == PostStatus.FAILED
+    assert stored.failure["error_class"] == "PublishInterrupted"
+    assert state.claims() == []
+
+
+def test_claim_is_kept_when_dead_letter_write_fails(setup, monkeypatch):
+    cm, publisher, state, scheduler, post = setup
+    _fail_after_publish(cm, monkeypatch)
+
+    def broken(*args, **kwargs):
+        raise OSError("disk dolu")
+    monkeypatch.setattr(cm, 'fail_posts', broken)
+
+    scheduler._check_and_send_posts()
+    scheduler._check_and_send_posts()
+
+    assert publisher.sent == [post.id]
+    assert cm.get_all_posts()[0].status == PostStatus.PENDING
+    assert state.claims() == [post.id]
+
+
+def test_concurrent_claims_on_shared_state_file(tmp_path):
+    # Aynı dosyayı yazan iki instance (ör. dashboard ve zamanlayıcı süreci) ve
+    # birden çok gönderim thread'i: sabit .tmp adı ENOENT ile yazım kaybettirirdi
+    path = str(tmp_path / 'state.json')
+    states = [SchedulerState(path), SchedulerState(path)]
+    errors = []
+
+    def worker(state, base):
+        try:
+            for post_id in range(base, base + 50):
+                state.claim(post_id)
+                state.release(post_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(states[i % 2], i * 100)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
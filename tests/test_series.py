@@ -0,0 +1,65 @@
+"""
+Seri tekrarları son üretilen tekrardan başlatılan kuralla hesaplanır;
+sonuç her seferinde dtstart'tan çözülen kuralla aynı olmalıdır.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.series import Series, parse_rule
+
+START = datetime(2024, 1, 31, 9, 30)
+
+RULES = [
+    "FREQ=DAILY",
+    "FREQ=HOURLY;INTERVAL=5",
+    "FREQ=DAILY;COUNT=40",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,FR",
+    "FREQ=MONTHLY",
+    "FREQ=MONTHLY;BYDAY=MO,TU;BYSETPOS=-1;COUNT=12",
+    "FREQ=YEARLY;UNTIL=20300101T000000",
+]
+
+
+def _materialize(series, steps):
+    """Zamanlayıcının yaptığı gibi tekrarları sırayla üretir."""
+    occurrence = series.occurrence_after(series.dtstart, inclusive=True)
+    produced = []
+    while occurrence is not None and len(produced) < steps:
+        produced.append(occurrence)
+        series.last_materialized_at = occurrence
+        occurrence = series.occurrence_after(occurrence)
+    return produced
+
+
+@pytest.mark.parametrize('rule', RULES)
+def test_anchored_rule_matches_full_rule(rule):
+    series = Series(1, "içerik", "Twitter", rule, START)
+    expected = list(parse_rule(rule, START)[:60])
+
+    assert _materialize(series, 60) == expected
+    # Üretimden sonra dashboard önizlemesi ve kaçırılan tekrar atlaması da aynı sonucu verir
+    if len(expected) == 60:
+        series.next_occurrence = series.occurrence_after(expected[-1])
+        full = parse_rule(rule, START)
+        assert series.upcoming(3) == [series.next_occurrence] + list(full.xafter(series.next_occurrence, count=2))
+        later = expected[-1] + timedelta(days=400)
+        assert series.occurrence_after(later, inclusive=True) == full.after(later, inc=True)
+
+
+def test_rule_restarts_from_last_materialized_occurrence():
+    series = Series(1, "içerik", "Twitter", "FREQ=HOURLY", START)
+    produced = _materialize(series, 500)
+
+    # Kural artık dtstart'tan değil son üretilen tekrardan başlar
+    assert series.rrule._dtstart == produced[-1]
+    assert series.occurrence_after(produced[-1]) == produced[-1] + timedelta(hours=1)
+
+
+def test_count_is_not_exceeded_after_restart():
+    series = Series(1, "içerik", "Twitter", "FREQ=DAILY;COUNT=10", START)
+    produced = _materialize(series, 20)
+
+    assert len(produced) == 10
+    assert series.occurrence_after(produced[-1]) is None
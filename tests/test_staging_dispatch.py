@@ -0,0 +1,52 @@
+"""
+Zamanı gelmiş postlar ön hazırlıktan önce gönderilir; takılan hazırlık
+(ör. yanıt vermeyen kimlik isteği) turu en fazla hazırlık süre sınırı kadar tutar.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import FakeLinkedInPublisher, FakeTwitterPublisher
+from scheduler import PostScheduler
+from src.content_manager import ContentManager
+from src.events import EventBus
+from src.models import PostStatus
+from src.scheduler_state import SchedulerState
+from src.series import SeriesStore
+
+
+class HangingIdentityPublisher(FakeTwitterPublisher):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def refresh_identity(self):
+        self.release.wait(5)
+        return super().refresh_identity()
+
+
+def test_slow_staging_does_not_delay_due_posts(tmp_path):
+    cm = ContentManager(db_path=str(tmp_path / 'posts.json'), archive_dir=str(tmp_path / 'archive'),
+                        duplicate_policy='off', events=EventBus())
+    publisher = HangingIdentityPublisher()
+    scheduler = PostScheduler(cm, publisher, FakeLinkedInPublisher(), series_store=SeriesStore(str(tmp_path / 's.json')),
+                              state=SchedulerState(str(tmp_path / 'state.json')))
+    scheduler.stager.timeout = 0.2
+    due = cm.add_post("Zamanı geldi", "Twitter", datetime.now() - timedelta(seconds=5))
+    upcoming = cm.add_post("Birazdan", "Twitter", datetime.now() + timedelta(seconds=60))
+
+    started = time.perf_counter()
+    scheduler._check_and_send_posts()
+    elapsed = time.perf_counter() - started
+
+    statuses = {post.id: post.status for post in cm.get_all_posts()}
+    assert statuses[due.id] == PostStatus.SENT
+    assert statuses[upcoming.id] == PostStatus.PENDING
+    assert elapsed < 2
+
+    # Takılan hazırlık sürerken yeni tur beklemeden geçer, ikinci hazırlık başlatılmaz
+    scheduler._check_and_send_posts()
+    publisher.release.set()
+    scheduler.stager._worker.join(5)
+    assert upcoming.id in scheduler.stager.staged
@@ -0,0 +1,55 @@
+"""posts.json yazımı: eşzamanlı yazıcılar geçici dosyada çakışmaz, hata çağırana iletilir."""
+
+import os
+import threading
+
+import pytest
+
+from src.content_manager import ContentManager
+from src.events import EventBus
+
+
+def _manager(tmp_path, events=None):
+    return ContentManager(db_path=str(tmp_path / 'posts.json'), archive_dir=str(tmp_path / 'archive'),
+                          duplicate_policy='off', events=events)
+
+
+def test_concurrent_writers_do_not_clobber_temp_files(tmp_path, capsys):
+    managers = [_manager(tmp_path), _manager(tmp_path)]
+    errors = []
+
+    def writer(cm, name):
+        for i in range(60):
+            try:
+                cm.add_post(f"{name} {i}", "Twitter", "2099-01-01 10:00")
+            except Exception as e:  # pragma: no cover - başarısızlıkta raporlanır
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(cm, f"cm{n}")) for n, cm in enumerate(managers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert "Kaydetme hatası" not in capsys.readouterr().out
+    assert managers[0].get_all_posts()
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
+
+
+def test_failed_save_propagates_and_publishes_nothing(tmp_path, monkeypatch):
+    bus = EventBus()
+    cm = _manager(tmp_path, events=bus)
+    cm.add_post("ilk", "Twitter", "2099-01-01 10:00")
+    published = bus.last_id
+
+    def fail(records):
+        raise OSError("disk dolu")
+
+    monkeypatch.setattr(cm.serializer, 'dumps', fail)
+    with pytest.raises(OSError):
+        cm.add_post("ikinci", "Twitter", "2099-01-01 11:00")
+
+    assert bus.last_id == published
+    assert [p.content for p in cm.get_all_posts()] == ["ilk"]
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
@@ -0,0 +1,7 @@
+"""
+tools package
+=============
+Geliştirme ve yük testi araçları. Proje kök dizininden çalıştırın:
+
+    python -m tools.platform_emulator
+"""
@@ -0,0 +1,179 @@
+"""
+outbox_sink.py
+==============
+Outbox olaylarını karşılayan yerel webhook alıcısı. Dağıtıcının toplu
+gönderimini, tekrar denemelerini ve post bazında sırayı gerçek bir dış
+sisteme bağlanmadan denemek için kullanılır.
+
+Alıcı her olayı ``id``'si ile kaydeder; tekrar gelenleri (en az bir kez
+teslimat) ve aynı postun olaylarının ``seq`` sırasına aykırı gelişini sayar.
+
+Uç noktalar:
+    POST /events             {"events": [...]} - dağıtıcının gönderdiği batch
+    GET  /_sink/stats        Batch/olay/tekrar/sıra ihlali sayaçları
+    GET  /_sink/events       Alınan olaylar (?post_id= ile filtrelenir)
+
+Kullanım:
+    python -m tools.outbox_sink --port 8950 --latency-ms 20 --error-5xx 0.1
+
+Uygulamayı alıcıya yönlendirmek için .env:
+    OUTBOX_URL=http://127.0.0.1:8950/events
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class SinkConfig:
+    """Gecikme ve hata enjeksiyonu ayarları."""
+
+    def __init__(self, latency_ms=0, error_5xx=0.0, error_429=0.0, retry_after=1, seed=None, verbose=False):
+        self.latency_ms = latency_ms
+        self.error_5xx = error_5xx
+        self.error_429 = error_429
+        self.retry_after = retry_after  # 429 yanıtındaki Retry-After (saniye)
+        self.random = random.Random(seed)
+        self.verbose = verbose
+
+
+class SinkState:
+    """Alınan olaylar ve doğrulama sayaçları."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.events = {}  # olay id -> olay
+        self.last_seq = {}  # post_id -> son alınan seq
+        self.stats = {"batches": 0, "events": 0, "duplicates": 0, "out_of_order": 0,
+                      "rejected_batches": 0, "by_type": {}}
+
+    def receive(self, events):
+        with self.lock:
+            self.stats["batches"] += 1
+            for event in events:
+                if event.get("id") in self.events:
+                    self.stats["duplicates"] += 1
+                    continue
+                self.events[event.get("id")] = event
+                self.stats["events"] += 1
+                by_type = self.stats["by_type"]
+                by_type[event.get("type")] = by_type.get(event.get("type"), 0) + 1
+                post_id, seq = event.get("post_id"), event.get("seq", 0)
+                if seq < self.last_seq.get(post_id, 0):
+                    self.stats["out_of_order"] += 1
+                self.last_seq[post_id] = max(seq, self.last_seq.get(post_id, 0))
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.stats))
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    """Outbox batch'lerini karşılayan HTTP handler."""
+
+    server_version = "OutboxSink/1.0"
+    state = None  # serve() tarafından atanır
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/_sink/stats':
+            self._send_json(200, self.state.snapshot())
+            return
+        if url.path == '/_sink/events':
+            post_id = parse_qs(url.query).get('post_id', [None])[0]
+            with self.state.lock:
+                events = [e for e in self.state.events.values()
+                          if post_id is None or str(e.get("post_id")) == post_id]
+            self._send_json(200, {"events": events})
+            return
+        self._send_json(404, {"error": "Not Found"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/events':
+            self._send_json(404, {"error": "Not Found"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+            events = body["events"]
+        except (ValueError, KeyError, TypeError):
+            with self.state.lock:
+                self.state.stats["rejected_batches"] += 1
+            self._send_json(400, {"error": "Gövde {\"events\": [...]} olmalı"})
+            return
+
+        config = self.state.config
+        if config.latency_ms:
+            time.sleep(config.latency_ms / 1000)
+        roll = config.random.random()
+        if roll < config.error_429:
+            self._send_json(429, {"error": "Too Many Requests"}, {"Retry-After": str(config.retry_after)})
+            return
+        if roll < config.error_429 + config.error_5xx:
+            self._send_json(503, {"error": "Service Unavailable"})
+            return
+
+        self.state.receive(events)
+        if config.verbose:
+            for event in events:
+                print(f"📥 #{event.get('post_id')} {event.get('type')} {json.dumps(event.get('data'), ensure_ascii=False)}")
+        self._send_json(200, {"received": len(events)})
+
+
+def serve(config, host='127.0.0.1', port=8950):
+    """Alıcı sunucusunu oluşturur (çağıran serve_forever ile başlatır)."""
+    handler = type('BoundSinkHandler', (SinkHandler,), {'state': SinkState(config)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outbox webhook alıcısı")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8950)
+    parser.add_argument('--latency-ms', type=float, default=0, help="Yanıt gecikmesi")
+    parser.add_argument('--error-5xx', type=float, default=0.0, help="Rastgele 503 olasılığı (0-1)")
+    parser.add_argument('--error-429', type=float, default=0.0, help="Rastgele 429 olasılığı (0-1)")
+    parser.add_argument('--retry-after', type=int, default=1, help="429 yanıtındaki Retry-After (saniye)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true', help="Her olayı konsola yaz")
+    args = parser.parse_args()
+
+    config = SinkConfig(
+        latency_ms=args.latency_ms,
+        error_5xx=args.error_5xx,
+        error_429=args.error_429,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        verbose=args.verbose
+    )
+    server = serve(config, args.host, args.port)
+    print(f"📥 Outbox alıcısı çalışıyor: http://{args.host}:{args.port}/events")
+    print(f"   İstatistikler: http://{args.host}:{args.port}/_sink/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Alıcı durduruldu")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+platform_emulator.py
+====================
+Twitter v2 ve LinkedIn API'lerinin uygulamanın kullandığı alt kümesini taklit
+eden yerel sunucu. Gerçek API kotası harcamadan PostScheduler ve
+PerformanceTracker'ı yük altında denemek için kullanılır.
+
+Desteklenen uç noktalar:
+    Twitter:  POST /2/tweets, GET /2/users/me, GET /2/tweets/:id, GET /2/tweets?ids=,
+              POST /1.1/media/upload.json (INIT/APPEND/FINALIZE)
+    LinkedIn: GET /v2/userinfo, POST /v2/ugcPosts, POST /v2/assets?action=registerUpload,
+              PUT /_emulator/upload/:asset (registerUpload'ın döndürdüğü adres)
+
+Kullanım:
+    python -m tools.platform_emulator --port 8900 --latency-ms 80 --error-429 0.02 --error-5xx 0.01
+
+Uygulamayı emülatöre yönlendirmek için .env:
+    TWITTER_API_BASE_URL=http://127.0.0.1:8900
+    LINKEDIN_API_BASE_URL=http://127.0.0.1:8900
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class EmulatorConfig:
+    """Gecikme, hata enjeksiyonu ve rate limit ayarları."""
+
+    def __init__(self, latency_ms=50, jitter_ms=20, error_429=0.0, error_5xx=0.0,
+                 rate_limit=300, rate_window=900, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.rate_limit = rate_limit  # Pencere başına uç nokta limiti (0 = sınırsız)
+        self.rate_window = rate_window  # Saniye
+        self.random = random.Random(seed)
+
+
+class EmulatorState:
+    """Oluşturulan postlar, rate limit pencereleri ve istek sayaçları."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.tweet_ids = itertools.count(1900000000000000001)
+        self.share_ids = itertools.count(7000000000000000001)
+        self.tweets = {}
+        self.shares = {}
+        self.media_ids = itertools.count(1500000000000000001)
+        self.media = {}  # media_id -> {'total', 'received', 'finalized'}
+        self.asset_ids = itertools.count(1)
+        self.assets = {}  # asset URN -> yüklenen byte (None = bekleniyor)
+        self.windows = {}
+        self.stats = {}
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def take_rate_limit(self, bucket):
+        """
+        Sabit pencere rate limit'i uygular.
+
+        Returns:
+            tuple: (izin verildi mi, limit, kalan, sıfırlanma zamanı epoch)
+        """
+        limit = self.config.rate_limit
+        now = time.time()
+        with self.lock:
+            window_start, used = self.windows.get(bucket, (now, 0))
+            if now - window_start >= self.config.rate_window:
+                window_start, used = now, 0
+            allowed = not limit or used < limit
+            if allowed:
+                used += 1
+            self.windows[bucket] = (window_start, used)
+        reset = int(window_start + self.config.rate_window)
+        return allowed, limit, max(0, limit - used), reset
+
+    def create_tweet(self, text):
+        with self.lock:
+            tweet_id = str(next(self.tweet_ids))
+            self.tweets[tweet_id] = {
+                "text": text,
+                "metrics": {"retweet_count": 0, "reply_count": 0, "like_count": 0,
+                            "quote_count": 0, "impression_count": 0}
+            }
+        return tweet_id
+
+    def read_tweet(self, tweet_id):
+        """Tweet'i döndürür; her okumada metrikler rastgele artar."""
+        rng = self.config.random
+        with self.lock:
+            tweet = self.tweets.get(tweet_id)
+            if tweet is None:
+                return None
+            metrics = tweet["metrics"]
+            metrics["impression_count"] += rng.randint(0, 200)
+            metrics["like_count"] += rng.randint(0, 10)
+            metrics["retweet_count"] += rng.randint(0, 3)
+            metrics["reply_count"] += rng.randint(0, 2)
+            return {
+                "id": tweet_id,
+                "text": tweet["text"],
+                "edit_history_tweet_ids": [tweet_id],
+                "public_metrics": dict(metrics)
+            }
+
+    def init_media(self, total_bytes):
+        with self.lock:
+            media_id = str(next(self.media_ids))
+            self.media[media_id] = {"total": total_bytes, "received": 0, "finalized": False}
+        return media_id
+
+    def append_media(self, media_id, size):
+        with self.lock:
+            media = self.media.get(media_id)
+            if media is None:
+                return False
+            media["received"] += size
+            return True
+
+    def finalize_media(self, media_id):
+        with self.lock:
+            media = self.media.get(media_id)
+            if media is None or media["received"] != media["total"]:
+                return None
+            media["finalized"] = True
+            return media["total"]
+
+    def register_asset(self):
+        with self.lock:
+            asset_id = next(self.asset_ids)
+            self.assets[f"urn:li:digitalmediaAsset:EMU{asset_id}"] = None
+        return f"EMU{asset_id}"
+
+    def create_share(self, payload):
+        with self.lock:
+            share_urn = f"urn:li:share:{next(self.share_ids)}"
+            self.shares[share_urn] = payload
+        return share_urn
+
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+    """Twitter ve LinkedIn isteklerini yönlendiren HTTP handler."""
+
+    server_version = "PlatformEmulator/1.0"
+    state = None  # serve() tarafından atanır
+
+    def log_message(self, format, *args):
+        # Yük testinde konsolu boğmamak için sessiz
+        pass
+
+    # ------------------------------------------------------------------
+    # Yardımcılar
+    # ------------------------------------------------------------------
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            return {}
+
+    def _simulate(self, platform, bucket):
+        """
+        Gecikme, rate limit ve hata enjeksiyonunu uygular.
+
+        Returns:
+            dict or None: Yanıta eklenecek başlıklar; hata yanıtı gönderildiyse None
+        """
+        config = self.state.config
+        delay = config.latency_ms + config.random.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        allowed, limit, remaining, reset = self.state.take_rate_limit(f"{platform}:{bucket}")
+        headers = {}
+        if platform == 'twitter' and limit:
+            headers = {
+                'x-rate-limit-limit': str(limit),
+                'x-rate-limit-remaining': str(remaining),
+                'x-rate-limit-reset': str(reset)
+            }
+
+        roll = config.random.random()
+        if not allowed or roll < config.error_429:
+            self.state.count(f"{platform}:429")
+            if platform == 'linkedin':
+                headers['Retry-After'] = str(max(1, reset - int(time.time())))
+            self._send_json(429, {"title": "Too Many Requests", "status": 429}, headers)
+            return None
+
+        if roll < config.error_429 + config.error_5xx:
+            status = config.random.choice([500, 503])
+            self.state.count(f"{platform}:{status}")
+            self._send_json(status, {"title": "Service Unavailable", "status": status}, headers)
+            return None
+
+        return headers
+
+    # ------------------------------------------------------------------
+    # Yönlendirme
+    # ------------------------------------------------------------------
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        path = url.path.rstrip('/')
+
+        if path == '/_emulator/stats':
+            with self.state.lock:
+                stats = dict(self.state.stats)
+            self._send_json(200, {"stats": stats, "tweets": len(self.state.tweets),
+                                  "shares": len(self.state.shares), "media": len(self.state.media),
+                                  "assets": len(self.state.assets)})
+            return
+
+        if path == '/2/users/me':
+            self.state.count('twitter:get_me')
+            headers = self._simulate('twitter', 'users/me')
+            if headers is not None:
+                self._send_json(200, {"data": {"id": "1", "name": "Emulator", "username": "emulator"}}, headers)
+            return
+
+        if path == '/2/tweets':
+            self.state.count('twitter:get_tweets')
+            headers = self._simulate('twitter', 'tweets/lookup')
+            if headers is not None:
+                ids = ','.join(query.get('ids', [''])).split(',')
+                data = [t for t in (self.state.read_tweet(i) for i in ids if i) if t]
+                self._send_json(200, {"data": data}, headers)
+            return
+
+        if path.startswith('/2/tweets/'):
+            self.state.count('twitter:get_tweet')
+            headers = self._simulate('twitter', 'tweets/lookup')
+            if headers is not None:
+                tweet = self.state.read_tweet(path.rsplit('/', 1)[-1])
+                if tweet is None:
+                    self._send_json(200, {"errors": [{"title": "Not Found Error"}]}, headers)
+                else:
+                    self._send_json(200, {"data": tweet}, headers)
+            return
+
+        if path == '/v2/userinfo':
+            self.state.count('linkedin:userinfo')
+            headers = self._simulate('linkedin', 'userinfo')
+            if headers is not None:
+                self._send_json(200, {"sub": "emulator-person", "name": "Emulator"}, headers)
+            return
+
+        self._send_json(404, {"title": "Not Found", "path": path})
+
+    def _drain_body(self):
+        """İstek gövdesini parça parça okuyup byte sayısını döndürür (belleğe toplamaz)."""
+        remaining = int(self.headers.get('Content-Length') or 0)
+        total = 0
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            total += len(chunk)
+            remaining -= len(chunk)
+        return total
+
+    def _media_upload(self):
+        """Twitter v1.1 chunked upload: INIT/FINALIZE form, APPEND multipart."""
+        headers = self._simulate('twitter', 'media/upload')
+        if headers is None:
+            return
+        content_type = self.headers.get('Content-Type', '')
+        length = int(self.headers.get('Content-Length') or 0)
+
+        if content_type.startswith('multipart/form-data'):
+            self.state.count('twitter:media_append')
+            raw = self.rfile.read(length)
+            match = re.search(rb'name="media_id"\r\n\r\n(\d+)', raw)
+            part = re.search(rb'name="media"[^\r]*\r\n(?:[^\r]+\r\n)*\r\n', raw)
+            boundary = content_type.split('boundary=')[-1].encode()
+            if not match or not part:
+                self._send_json(400, {"errors": [{"message": "media_id/media eksik"}]}, headers)
+                return
+            end = raw.index(b'\r\n--' + boundary, part.end())
+            if not self.state.append_media(match.group(1).decode(), end - part.end()):
+                self._send_json(400, {"errors": [{"message": "Bilinmeyen media_id"}]}, headers)
+                return
+            self.send_response(204)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+        command = form.get('command')
+        if command == 'INIT':
+            self.state.count('twitter:media_init')
+            media_id = self.state.init_media(int(form.get('total_bytes', 0)))
+            self._send_json(202, {"media_id": int(media_id), "media_id_string": media_id,
+                                  "expires_after_secs": 86400}, headers)
+        elif command == 'FINALIZE':
+            self.state.count('twitter:media_finalize')
+            media_id = form.get('media_id', '')
+            size = self.state.finalize_media(media_id)
+            if size is None:
+                self._send_json(400, {"errors": [{"message": "Eksik veya bilinmeyen medya"}]}, headers)
+            else:
+                self._send_json(201, {"media_id": int(media_id), "media_id_string": media_id,
+                                      "size": size, "expires_after_secs": 86400}, headers)
+        else:
+            self._send_json(400, {"errors": [{"message": f"Bilinmeyen komut: {command}"}]}, headers)
+
+    def do_PUT(self):
+        path = urlsplit(self.path).path.rstrip('/')
+        if path.startswith('/_emulator/upload/'):
+            self.state.count('linkedin:media_upload')
+            headers = self._simulate('linkedin', 'media/upload')
+            if headers is None:
+                return
+            asset = f"urn:li:digitalmediaAsset:{path.rsplit('/', 1)[-1]}"
+            size = self._drain_body()
+            with self.state.lock:
+                known = asset in self.state.assets
+                if known:
+                    self.state.assets[asset] = size
+            if not known:
+                self._send_json(404, {"title": "Unknown upload"}, headers)
+            else:
+                self._send_json(201, {}, headers)
+            return
+        self._send_json(404, {"title": "Not Found", "path": path})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        if path == '/1.1/media/upload.json':
+            self._media_upload()
+            return
+        body = self._read_json()
+
+        if path == '/2/tweets':
+            self.state.count('twitter:create_tweet')
+            headers = self._simulate('twitter', 'tweets/create')
+            if headers is None:
+                return
+            text = body.get('text') or ''
+            if len(text) > 280:
+                self._send_json(400, {"title": "Invalid Request", "detail": "Tweet text too long"}, headers)
+                return
+            media_ids = (body.get('media') or {}).get('media_ids') or []
+            with self.state.lock:
+                unknown = [m for m in media_ids if not self.state.media.get(str(m), {}).get('finalized')]
+            if unknown:
+                self._send_json(400, {"title": "Invalid Request",
+                                      "detail": f"Unknown media ids: {unknown}"}, headers)
+                return
+            tweet_id = self.state.create_tweet(text)
+            self._send_json(201, {"data": {"id": tweet_id, "text": text,
+                                           "edit_history_tweet_ids": [tweet_id]}}, headers)
+            return
+
+        if path == '/v2/assets' and parse_qs(url.query).get('action') == ['registerUpload']:
+            self.state.count('linkedin:registerUpload')
+            headers = self._simulate('linkedin', 'assets')
+            if headers is None:
+                return
+            asset_id = self.state.register_asset()
+            upload_url = f"http://{self.headers.get('Host')}/_emulator/upload/{asset_id}"
+            self._send_json(200, {"value": {
+                "asset": f"urn:li:digitalmediaAsset:{asset_id}",
+                "uploadMechanism": {
+                    "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                        "uploadUrl": upload_url, "headers": {}
+                    }
+                }
+            }}, headers)
+            return
+
+        if path == '/v2/ugcPosts':
+            self.state.count('linkedin:ugcPosts')
+            headers = self._simulate('linkedin', 'ugcPosts')
+            if headers is None:
+                return
+            share = body.get('specificContent', {}).get('com.linkedin.ugc.ShareContent', {})
+            with self.state.lock:
+                missing = [m.get('media') for m in share.get('media', [])
+                           if self.state.assets.get(m.get('media')) is None]
+            if missing:
+                self._send_json(400, {"title": "Invalid Request", "detail": f"Assets not uploaded: {missing}"},
+                                headers)
+                return
+            share_urn = self.state.create_share(body)
+            headers['X-RestLi-Id'] = share_urn
+            self._send_json(201, {"id": share_urn}, headers)
+            return
+
+        self._send_json(404, {"title": "Not Found", "path": path})
+
+
+def serve(config, host='127.0.0.1', port=8900):
+    """Emülatör sunucusunu oluşturur (çağıran serve_forever ile başlatır)."""
+    handler = type('BoundEmulatorHandler', (EmulatorHandler,), {'state': EmulatorState(config)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Twitter/LinkedIn API emülatörü")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=50, help="Ortalama yanıt gecikmesi")
+    parser.add_argument('--jitter-ms', type=float, default=20, help="Gecikme sapması (±)")
+    parser.add_argument('--error-429', type=float, default=0.0, help="Rastgele 429 olasılığı (0-1)")
+    parser.add_argument('--error-5xx', type=float, default=0.0, help="Rastgele 500/503 olasılığı (0-1)")
+    parser.add_argument('--rate-limit', type=int, default=300, help="Pencere başına uç nokta limiti (0 = sınırsız)")
+    parser.add_argument('--rate-window', type=int, default=900, help="Rate limit penceresi (saniye)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    config = EmulatorConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_429=args.error_429,
+        error_5xx=args.error_5xx,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        seed=args.seed
+    )
+    server = serve(config, args.host, args.port)
+    print(f"🧪 Platform emülatörü çalışıyor: http://{args.host}:{args.port}")
+    print(f"   İstatistikler: http://{args.host}:{args.port}/_emulator/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Emülatör durduruldu")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()